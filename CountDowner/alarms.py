@@ -0,0 +1,205 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class SoundCache:
+    """LRU cache of loaded (decoded) alarm sounds, keyed by path and mtime.
+
+    Many timers usually share the same alarm file, so each file is loaded
+    once and reused until it is evicted or changes on disk.
+    """
+    def __init__(self, loader, capacity=8, can_evict=None):
+        self.loader = loader
+        self.capacity = capacity
+        self.can_evict = can_evict      # Optional check so a sound that is playing isn't dropped
+        self._sounds = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sounds)
+
+    def get(self, path):
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            key = (path, None)
+
+        sound = self._sounds.get(key)
+        if sound is not None:
+            self.hits += 1
+            self._sounds.move_to_end(key)
+            return sound
+
+        self.misses += 1
+        sound = self.loader(path)
+        self._sounds[key] = sound
+        self._evict()
+        return sound
+
+    def _evict(self):
+        for key in list(self._sounds):
+            if len(self._sounds) <= self.capacity:
+                break
+            sound = self._sounds[key]
+            if self.can_evict is not None and not self.can_evict(sound):
+                continue
+            del self._sounds[key]
+            if hasattr(sound, "deleteLater"):
+                sound.deleteLater()
+
+
+class ThreadedBackend:
+    """Plays alarms with a blocking function (playsound) on worker threads.
+
+    The queue is bounded: when it is full the request is dropped instead of
+    piling up. The number of worker threads caps how many alarms overlap.
+    """
+    def __init__(self, play_fn=None, max_voices=2, max_queue=16):
+        self.play_fn = play_fn
+        self.max_voices = max_voices
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._workers = []
+
+    def submit(self, path):
+        self._start_workers()
+        try:
+            self.queue.put_nowait(path)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _start_workers(self):
+        if self._workers:
+            return
+        if self.play_fn is None:
+            from playsound import playsound
+            self.play_fn = playsound
+        for i in range(self.max_voices):
+            worker = threading.Thread(target=self._run, name=f"alarm-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _run(self):
+        while True:
+            path = self.queue.get()
+            try:
+                self.play_fn(path)
+            except Exception as error:
+                print(f"Could not play alarm {path}: {error}")
+            finally:
+                self.queue.task_done()
+
+
+class QtBackend:
+    """Plays alarms asynchronously through QtMultimedia on the GUI thread.
+
+    WAV files are loaded into a QSoundEffect (decoded once, held in memory);
+    anything else goes through a QMediaPlayer, which only opens the file up
+    front and still decodes it as it plays. Both keep playing without
+    blocking the event loop, and the objects live in a SoundCache so a file
+    isn't opened (or a WAV decoded) again for every alarm.
+    """
+    def __init__(self, max_voices=2, max_queue=16, cache_size=8):
+        from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer, QSoundEffect
+        self._QAudioOutput = QAudioOutput
+        self._QMediaPlayer = QMediaPlayer
+        self._QSoundEffect = QSoundEffect
+        self.max_voices = max_voices
+        self.pending = deque(maxlen=max_queue)
+        self.dropped = 0
+        self.cache = SoundCache(self._load, capacity=cache_size,
+                                can_evict=lambda sound: not self._is_playing(sound))
+
+    def submit(self, path):
+        if self._voices() >= self.max_voices:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+                return False
+            self.pending.append(path)
+            return True
+        sound = self.cache.get(path)
+        if self._is_playing(sound):
+            # This file is already ringing - let the current playback cover it
+            return True
+        sound.play()
+        return True
+
+    def _load(self, path):
+        from PyQt6.QtCore import QUrl
+        if path.lower().endswith(".wav"):
+            sound = self._QSoundEffect()
+            sound.setSource(QUrl.fromLocalFile(path))
+            sound.playingChanged.connect(self._play_pending)
+        else:
+            sound = self._QMediaPlayer()
+            sound.setAudioOutput(self._QAudioOutput(sound))
+            sound.setSource(QUrl.fromLocalFile(path))
+            sound.playbackStateChanged.connect(self._play_pending)
+        return sound
+
+    def _is_playing(self, sound):
+        if isinstance(sound, self._QSoundEffect):
+            return sound.isPlaying()
+        return sound.playbackState() == self._QMediaPlayer.PlaybackState.PlayingState
+
+    def _voices(self):
+        return sum(1 for sound in self.cache._sounds.values() if self._is_playing(sound))
+
+    def _play_pending(self, *args):
+        while self.pending and self._voices() < self.max_voices:
+            self.submit(self.pending.popleft())
+
+
+class AlarmPlayer:
+    """Front door for alarm playback; never blocks the caller.
+
+    Requests for the same file within `coalesce_window` seconds are merged
+    into one playback, so a batch of timers finishing together rings once.
+    Only the last `max_paths` files played are remembered for that.
+    """
+    def __init__(self, backend, coalesce_window=1.0, clock=time.monotonic, max_paths=32):
+        self.backend = backend
+        self.coalesce_window = coalesce_window
+        self.clock = clock
+        self.max_paths = max_paths
+        self.coalesced = 0
+        self._last_played = OrderedDict()   # path -> when it last played, oldest first
+
+    def play(self, path):
+        now = self.clock()
+        last = self._last_played.get(path)
+        if last is not None and now - last < self.coalesce_window:
+            self.coalesced += 1
+            return False
+        self._last_played[path] = now
+        self._last_played.move_to_end(path)
+        self._forget(now)
+        return self.backend.submit(path)
+
+    def _forget(self, now):
+        # Anything played longer ago than the window can't be merged with anymore
+        while self._last_played:
+            path, last = next(iter(self._last_played.items()))
+            if now - last < self.coalesce_window and len(self._last_played) <= self.max_paths:
+                break
+            self._last_played.popitem(last=False)
+
+
+_alarm_player = None
+
+def alarm_player():
+    """Returns the shared AlarmPlayer, using QtMultimedia when it is available."""
+    global _alarm_player
+    if _alarm_player is None:
+        try:
+            backend = QtBackend()
+        except ImportError:
+            backend = ThreadedBackend()
+        _alarm_player = AlarmPlayer(backend)
+    return _alarm_player
@@ -0,0 +1,157 @@
+"""Load test for the overlay server (broadcast.py) with local fake clients.
+
+The server runs here on a Qt event loop, with TIMERS timers published and one
+started or stopped every CHURN_MS. A second process opens CLIENTS /events
+streams with asyncio, parses every event and measures how long it took to
+arrive (server clock in the event vs. receive time - same machine). Prints
+one JSON object with the server's CPU use and the clients' latency and
+bandwidth.
+
+Run from the CountDowner folder:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_broadcast.py --clients 500 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+async def fake_client(port, stats, stop_at):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    stats['connected'] += 1
+    try:
+        while True:
+            timeout = stop_at - time.time()
+            if timeout <= 0:
+                break
+            try:
+                block = await asyncio.wait_for(reader.readuntil(b"\n\n"), timeout)
+            except asyncio.TimeoutError:
+                break
+            stats['bytes'] += len(block)
+            for line in block.split(b"\n"):
+                if line.startswith(b"data: "):
+                    data = json.loads(line[6:])
+                    stats['events'] += 1
+                    stats['latency'].append(time.time() - data['now'])
+    except (asyncio.IncompleteReadError, ConnectionError):
+        stats['disconnected'] += 1
+    finally:
+        writer.close()
+
+
+async def run_clients(port, count, seconds):
+    stats = {'connected': 0, 'disconnected': 0, 'events': 0, 'bytes': 0, 'latency': []}
+    stop_at = time.time() + seconds
+    # Connect in small waves so the listen backlog isn't overrun
+    tasks = []
+    for i in range(count):
+        tasks.append(asyncio.create_task(fake_client(port, stats, stop_at)))
+        if i % 50 == 49:
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    latency = sorted(stats.pop('latency')) or [0.0]
+    stats['latency_ms'] = {
+        'median': round(statistics.median(latency) * 1000, 2),
+        'p99': round(latency[min(len(latency) - 1, int(len(latency) * 0.99))] * 1000, 2),
+        'max': round(latency[-1] * 1000, 2),
+    }
+    stats['bytes_per_client_per_s'] = round(stats['bytes'] / max(1, count) / seconds, 1)
+    return stats
+
+
+def serve(args):
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from broadcast import BroadcastServer
+
+    app = QApplication.instance() or QApplication([])
+    server = BroadcastServer(port=0)
+    if not server.listen():
+        sys.exit("could not listen")
+
+    def timer_info(key):
+        return {'id': key, 'name': f"Timer {key}", 'state': 'running',
+                'deadline': time.time() + 600, 'total': 600}
+
+    for key in range(args.timers):
+        server.publish(key, timer_info(key))
+    server.flush()
+
+    # The clients get a head start to connect before the churn starts
+    clients = subprocess.Popen([sys.executable, __file__, "--client-port", str(server.port),
+                                "--clients", str(args.clients), "--seconds", str(args.seconds + 2)],
+                               stdout=subprocess.PIPE, text=True)
+    changes = [0]
+    measured = {}
+
+    def churn():
+        # Alternately stop the oldest timer and start a new one
+        key = args.timers + changes[0] // 2
+        if changes[0] % 2:
+            server.remove(key - args.timers)
+        else:
+            server.publish(key, timer_info(key))
+        changes[0] += 1
+
+    churner = QTimer()
+    churner.setInterval(args.churn_ms)
+    churner.timeout.connect(churn)
+
+    def begin():
+        measured['cpu'] = time.process_time()
+        measured['wall'] = time.perf_counter()
+        churner.start()
+        QTimer.singleShot(int(args.seconds * 1000), end)
+
+    def end():
+        churner.stop()
+        measured['cpu'] = time.process_time() - measured['cpu']
+        measured['wall'] = time.perf_counter() - measured['wall']
+        poll.start(50)
+
+    poll = QTimer()
+    poll.timeout.connect(lambda: clients.poll() is not None and app.quit())
+    QTimer.singleShot(2000, begin)
+    app.exec()
+
+    client_stats = json.loads(clients.stdout.read() or "{}")
+    print(json.dumps({
+        'clients': args.clients,
+        'timers': args.timers,
+        'changes': changes[0],
+        'server_cpu_percent': round(measured['cpu'] / measured['wall'] * 100, 1),
+        'server_messages': server.messages,
+        'server_bytes_sent': server.bytes_sent,
+        'server_dropped': server.dropped,
+        'subscribers_at_end': len(server.subscribers),
+        'client': client_stats,
+    }, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the overlay server with local fake clients.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--timers", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--churn-ms", type=int, default=500, help="how often a timer starts or stops")
+    parser.add_argument("--client-port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.client_port:
+        print(json.dumps(asyncio.run(run_clients(args.client_port, args.clients, args.seconds))))
+    else:
+        serve(args)
+
+
+if __name__ == "__main__":
+    main()
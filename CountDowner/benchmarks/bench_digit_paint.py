@@ -0,0 +1,102 @@
+"""Per-tick cost of the countdown digits: QLabel.setText vs DigitDisplay (glyph atlas, dirty cells).
+
+Each tick updates the h/m/s widgets the way ActiveTimerWindow.render does and
+then lets Qt lay out and paint, over a scaled background like a real timer.
+
+Run from the CountDowner folder:  QT_QPA_PLATFORM=offscreen python benchmarks/bench_digit_paint.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QColor, QFont, QPixmap
+from PyQt6.QtWidgets import QApplication, QLabel, QWidget
+
+from digits import DigitDisplay
+
+
+TICKS = 600
+SIZE = (700, 600)
+
+
+def make_window():
+    window = QWidget()
+    window.setFixedSize(*SIZE)
+    background = QLabel(window)
+    background.setGeometry(0, 0, *SIZE)
+    background.setScaledContents(True)
+    pixmap = QPixmap(1920, 1080)
+    pixmap.fill(QColor("navy"))
+    background.setPixmap(pixmap)
+    background.lower()
+    return window
+
+
+def place(widgets, font):
+    for i, widget in enumerate(widgets):
+        widget.setFont(font)
+        widget.resize(150, 90)
+        widget.move(50 + i * 200, 100)
+
+
+def run_labels(app, font):
+    window = make_window()
+    labels = [QLabel("00", window) for _ in range(3)]
+    for label in labels:
+        label.setStyleSheet("color: white;")
+    place(labels, font)
+    window.show()
+    app.processEvents()
+
+    start = time.perf_counter_ns()
+    for tick in range(TICKS, 0, -1):
+        h, m, s = tick // 3600, (tick % 3600) // 60, tick % 60
+        labels[0].setText(f"{h:02}")
+        labels[1].setText(f"{m:02}")
+        labels[2].setText(f"{s:02}")
+        app.processEvents()
+    elapsed = time.perf_counter_ns() - start
+    window.close()
+    return elapsed / TICKS
+
+
+def run_digits(app, font):
+    window = make_window()
+    displays = [DigitDisplay(0, "white", window) for _ in range(3)]
+    place(displays, font)
+    window.show()
+    app.processEvents()
+    for display in displays:
+        display.paint_ns = display.paints = 0
+
+    start = time.perf_counter_ns()
+    for tick in range(TICKS, 0, -1):
+        h, m, s = tick // 3600, (tick % 3600) // 60, tick % 60
+        displays[0].setValue(h)
+        displays[1].setValue(m)
+        displays[2].setValue(s)
+        app.processEvents()
+    elapsed = time.perf_counter_ns() - start
+    window.close()
+    paint_ns = sum(display.paint_ns for display in displays)
+    paints = sum(display.paints for display in displays)
+    return elapsed / TICKS, paint_ns / max(1, paints)
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    font = QFont()
+    font.setPointSize(54)
+
+    label_ns = run_labels(app, font)
+    digit_ns, paint_ns = run_digits(app, font)
+    print(f"ticks: {TICKS}")
+    print(f"QLabel.setText        {label_ns / 1000:8.1f} us/tick")
+    print(f"DigitDisplay.setValue {digit_ns / 1000:8.1f} us/tick  ({paint_ns / 1000:.1f} us per paintEvent)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Memory per preset for a 100k library: the old 18-key dict vs the Preset record.
+
+The old dict held a QFont per digit, a QSize and six tuples. Memory is measured
+as the process RSS growth (which includes the C++ side of the Qt objects) and
+with tracemalloc (Python objects only). Also times Preset.from_widgets /
+apply_to against a real Creator's spin boxes.
+
+Run from the CountDowner folder:  QT_QPA_PLATFORM=offscreen python benchmarks/bench_preset_memory.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication, QSpinBox
+
+from presets import GEOMETRY, Preset
+
+
+COUNT = 100_000
+FONTS = ["DejaVu Sans", "DejaVu Serif", "Monospace", "Sans Serif"]
+COLORS = ["white", "black", "#ff0000", "#00ff00"]
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def old_dict(i):
+    # What savecurrent / save_as_new used to build (and load_all used to return)
+    font = QFont(FONTS[i % len(FONTS)], 20 + i % 30)
+    return {
+        'name': f"Timer {i}", 'h': i % 24, 'm': i % 60, 's': i % 60,
+        'pos_h': (50, 100), 'pos_m': (200, 100), 'pos_s': (350, 100),
+        'h_font': QFont(font), 'm_font': QFont(font), 's_font': QFont(font),
+        'size_h': (120, 60), 'size_m': (120, 60), 'size_s': (120, 60),
+        'h_color': COLORS[i % 4], 'm_color': COLORS[i % 4], 's_color': COLORS[i % 4],
+        'background': None, 'size': QSize(900, 800), 'id': i,
+    }
+
+
+def new_preset(i):
+    spec = (FONTS[i % len(FONTS)], float(20 + i % 30), 400, False)
+    # Every preset gets its own geometry, as it would after being dragged around
+    geometry = GEOMETRY.pack(50 + i % 100, 100, 120, 60, 200, 100, 120, 60, 350, 100, 120, 60, 900, 800)
+    return Preset(f"Timer {i}", i % 24, i % 60, i % 60, fonts=(spec, spec, spec),
+                  colors=(COLORS[i % 4],) * 3, geometry=geometry, id=i)
+
+
+def measure(build):
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    items = [build(i) for i in range(COUNT)]
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    rss_after = rss_bytes()
+    rss = (rss_after - rss_before) / COUNT if rss_before is not None else float('nan')
+    return items, traced / COUNT, rss
+
+
+def bench_widgets(rounds=2000):
+    boxes = [QSpinBox() for _ in range(3)]
+    for box in boxes:
+        box.setMaximum(999)
+        box.current_color = "white"
+        box.setColor = lambda color, box=box: setattr(box, 'current_color', color)
+    preset = new_preset(7)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        preset.apply_to(boxes)
+    apply_us = (time.perf_counter() - start) / rounds * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        Preset.from_widgets("Tea", boxes, None, QSize(900, 800))
+    read_us = (time.perf_counter() - start) / rounds * 1e6
+    return apply_us, read_us
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+
+    print(f"{COUNT:,} presets        traced B/preset   RSS B/preset")
+    old, traced, rss = measure(old_dict)
+    print(f"  old 18-key dict   {traced:15.0f}   {rss:12.0f}")
+    del old
+    new, traced, rss = measure(new_preset)
+    print(f"  Preset record     {traced:15.0f}   {rss:12.0f}")
+
+    text = new[0].to_json()
+    start = time.perf_counter()
+    for _ in range(COUNT // 10):
+        Preset.from_json(text)
+    print(f"  from_json: {(time.perf_counter() - start) / (COUNT // 10) * 1e6:.1f} us per preset")
+
+    apply_us, read_us = bench_widgets()
+    print(f"  apply_to: {apply_us:.1f} us   from_widgets: {read_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark for PresetRegistry: per-operation cost should not grow with library size.
+
+Run from the CountDowner folder:  python benchmarks/bench_preset_registry.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from presets import PresetRegistry
+
+
+SIZES = (1_000, 10_000, 100_000)
+OPERATIONS = 20_000
+
+
+def make_registry(size):
+    return PresetRegistry({'id': i, 'name': f"Timer {i}"} for i in range(size))
+
+
+def per_op_ns(fn, count=OPERATIONS):
+    start = time.perf_counter_ns()
+    fn(count)
+    return (time.perf_counter_ns() - start) / count
+
+
+def bench(size):
+    registry = make_registry(size)
+    step = max(1, size // OPERATIONS)
+
+    def lookup(count):
+        for i in range(count):
+            registry.find(f"Timer {(i * step) % size}")
+
+    def upsert(count):
+        # Re-save existing presets under new ids, as save_timer does
+        for i in range(count):
+            registry.upsert({'id': size + i, 'name': f"Timer {(i * step) % size}"})
+
+    def delete(count):
+        ids = [preset['id'] for preset in registry][:count]
+        start = time.perf_counter_ns()
+        for preset_id in ids:
+            registry.remove(preset_id)
+        return (time.perf_counter_ns() - start) / len(ids)
+
+    return {'size': size, 'lookup_ns': per_op_ns(lookup), 'upsert_ns': per_op_ns(upsert),
+            'delete_ns': delete(OPERATIONS)}
+
+
+def main():
+    print(f"{'presets':>10} {'lookup ns':>12} {'upsert ns':>12} {'delete ns':>12}")
+    for size in SIZES:
+        r = bench(size)
+        print(f"{r['size']:>10} {r['lookup_ns']:>12.0f} {r['upsert_ns']:>12.0f} {r['delete_ns']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
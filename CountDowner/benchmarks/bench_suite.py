@@ -0,0 +1,469 @@
+"""The whole app under load, headless: timers, presets, windows, backgrounds and start-up.
+
+Every scenario runs in a fresh Python process with its own empty app data
+folder, so one can't warm the caches (or fill the database) for the next,
+and memory numbers are for that scenario alone:
+
+    timers       N running ActiveTimerWindows: CPU, wake-ups, tick lateness, RSS
+    presets      MainWindow.load_presets, save_timer and delete_timer with N saved presets
+    creator      building the Creator window, and the editor for a saved preset;
+                 dragging and resizing a digit with a 1000 Hz mouse (frame_stats)
+    backgrounds  timer windows with a large static image, and with an animated GIF
+    cold_start   `countdowner.py --profile-startup`, empty and with N saved presets
+
+The results are one JSON document (with the commit, Python and Qt versions)
+so runs from different commits can be compared:
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py -o before.json
+    ... change something ...
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py -o after.json --compare before.json
+
+Run from the CountDowner folder. The GIF background needs Pillow to make
+its test image; without it that part is reported as skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HERE)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SCENARIOS = ('timers', 'presets', 'creator', 'backgrounds', 'cold_start')
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def timings(samples):
+    """Summary of a list of durations in seconds, in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+def run_loop(app, seconds):
+    from PyQt6.QtCore import QTimer
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+
+
+def settle(app, rounds=3):
+    for _ in range(rounds):
+        app.processEvents()
+
+
+def make_preset(name, i=0, background=None):
+    from presets import Preset
+    return Preset(name, 1 + i % 3, i % 60, i % 60, background=background)
+
+
+def seed_presets(count):
+    # Straight into the database in one transaction, like an import
+    import countdowner
+    from presets import PresetStore
+    store = PresetStore(countdowner.preset_db_path())
+    store.replace_many([([], make_preset(f"Timer {i}", i)) for i in range(count)])
+    store.close()
+
+
+def app_and_module():
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    app.setApplicationName("CountDowner")
+    import countdowner
+    return app, countdowner
+
+
+def bench_timers(args):
+    app, countdowner = app_and_module()
+    from telemetry import TickLatency
+    scheduler = countdowner.tick_scheduler()
+    latency = TickLatency()
+    scheduler.observer = latency
+    settle(app)
+
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    windows = [countdowner.run_preset(make_preset(f"Timer {i}", i)) for i in range(args.timers)]
+    settle(app)
+    started = time.perf_counter() - start
+    rss_running = rss_bytes()
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    wakeups = scheduler.total_wakeups
+    run_loop(app, args.seconds)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    wakeups = scheduler.total_wakeups - wakeups
+
+    start = time.perf_counter()
+    for window in windows:
+        window.stop()
+    settle(app)
+    stopped = time.perf_counter() - start
+
+    ticks = latency.all.to_dict()
+    ticks.pop('buckets')
+    return {
+        'timers': args.timers,
+        'seconds': round(wall, 3),
+        'start_all_ms': round(started * 1000, 1),
+        'stop_all_ms': round(stopped * 1000, 1),
+        'cpu_percent': round(cpu / wall * 100, 2),
+        'wakeups_per_second': round(wakeups / wall, 2),
+        'ticks_per_second': round(ticks['count'] / wall, 1),
+        'tick_lateness': ticks,
+        'rss_per_timer_bytes': (rss_running - rss_before) // max(1, args.timers) if rss_before else None,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+
+
+def bench_presets(args):
+    app, countdowner = app_and_module()
+    seed_presets(args.presets)
+    window = countdowner.MainWindow()
+    window.show()
+    settle(app)
+
+    start = time.perf_counter()
+    window.load_presets()
+    settle(app)
+    loaded = time.perf_counter() - start
+
+    def timed(action, count):
+        samples = []
+        for i in range(count):
+            start = time.perf_counter()
+            action(i)
+            app.processEvents()
+            samples.append(time.perf_counter() - start)
+        return timings(samples)
+
+    operations = args.operations
+    results = {
+        'presets': args.presets,
+        'load_presets_ms': round(loaded * 1000, 2),
+        'save_new': timed(lambda i: window.save_timer(make_preset(f"New {i}", i)), operations),
+        # Same name as a saved preset, which it replaces
+        'save_replace': timed(lambda i: window.save_timer(make_preset(f"Timer {i * 7}", i)), operations),
+        'delete': timed(lambda i: window.delete_timer(window.preset_model.index(0)), operations),
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+    window.store.close()
+    return results
+
+
+def drag(app, box, resize, seconds, rate=1000):
+    """Drags (or resizes) a MovableSpinBox with `rate` mouse moves a second; returns its frame_stats()."""
+    from PyQt6.QtCore import QEvent, QPointF, Qt
+    from PyQt6.QtGui import QMouseEvent
+    box.frame_costs.clear()
+    box.frame_intervals.clear()
+    # The bottom-right corner resizes, anywhere else moves
+    local = QPointF(box.width() - 2, box.height() - 2) if resize else QPointF(box.width() / 2, box.height() / 2)
+    origin = QPointF(box.mapToGlobal(local.toPoint()))
+    left = Qt.MouseButton.LeftButton
+
+    def send(kind, offset, button):
+        app.sendEvent(box, QMouseEvent(kind, local + offset, origin + offset, button, left,
+                                       Qt.KeyboardModifier.NoModifier))
+
+    send(QEvent.Type.MouseButtonPress, QPointF(), left)
+    moves = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        moves += 1
+        offset = QPointF(200 * elapsed / seconds, 100 * elapsed / seconds)
+        send(QEvent.Type.MouseMove, offset, Qt.MouseButton.NoButton)
+        app.processEvents()
+        time.sleep(max(0.0, start + moves / rate - time.perf_counter()))
+    send(QEvent.Type.MouseButtonRelease, offset, left)
+    stats = box.frame_stats()
+    return {'mouse_moves': moves, 'mouse_hz': round(moves / seconds),
+            **{key: round(value, 3) for key, value in stats.items()}}
+
+
+def bench_creator(args):
+    app, countdowner = app_and_module()
+    seed_presets(100)
+    window = countdowner.MainWindow()
+    window.show()
+    window.load_presets()
+    settle(app)
+
+    def built(make, count):
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            make()
+            window.w.show()
+            settle(app, 1)
+            samples.append(time.perf_counter() - start)
+            window.w.close()
+            settle(app, 1)
+        return {'first_ms': round(samples[0] * 1000, 2), **timings(samples[1:])}
+
+    results = {
+        'creator': built(window.open_creator, args.operations),
+        'editor': built(lambda: window.load_timer(window.preset_model.index(0)), args.operations),
+    }
+
+    # Editing should keep up with the screen (60 fps) however fast the mouse reports
+    window.open_creator()
+    window.w.show()
+    settle(app)
+    seconds = min(args.seconds, 2)
+    results['drag_move'] = drag(app, window.w.hour_input, False, seconds)
+    results['drag_resize'] = drag(app, window.w.min_input, True, seconds)
+    window.w.close()
+    return results
+
+
+def make_backgrounds(folder):
+    from PyQt6.QtGui import QColor, QImage, QLinearGradient, QPainter
+    still = os.path.join(folder, "background.png")
+    image = QImage(3840, 2160, QImage.Format.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, 3840, 2160)
+    gradient.setColorAt(0, QColor("navy"))
+    gradient.setColorAt(1, QColor("darkorange"))
+    painter.fillRect(image.rect(), gradient)
+    painter.setPen(QColor("white"))
+    for x in range(0, 3840, 40):
+        painter.drawLine(x, 0, 3840 - x, 2160)
+    painter.end()
+    image.save(still)
+
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        return still, None
+    animated = os.path.join(folder, "background.gif")
+    frames = []
+    for i in range(24):
+        frame = Image.new("RGB", (900, 800), (20, 20, 60))
+        ImageDraw.Draw(frame).ellipse((i * 30, 300, i * 30 + 200, 500), fill=(255, 140, 0))
+        frames.append(frame)
+    frames[0].save(animated, save_all=True, append_images=frames[1:], duration=40, loop=0)
+    return still, animated
+
+
+def bench_backgrounds(args):
+    app, countdowner = app_and_module()
+    from images import gif_engine, pixmap_cache
+    folder = tempfile.mkdtemp(prefix="countdowner-bench-")
+    still, animated = make_backgrounds(folder)
+    results = {}
+
+    def open_window(path, name):
+        start = time.perf_counter()
+        window = countdowner.run_preset(make_preset(name, background=path))
+        settle(app, 1)
+        return window, time.perf_counter() - start
+
+    rss_before = rss_bytes()
+    first, cold = open_window(still, "Still 0")
+    second, warm = open_window(still, "Still 1")
+    results['static'] = {
+        'image': "3840x2160 PNG",
+        'first_window_ms': round(cold * 1000, 2),
+        'cached_window_ms': round(warm * 1000, 2),
+        'cache_bytes': pixmap_cache().stats()['bytes'],
+        'rss_growth_bytes': rss_bytes() - rss_before if rss_before else None,
+    }
+    first.stop()
+    second.stop()
+
+    if animated is None:
+        results['gif'] = {'skipped': "needs Pillow to make the test GIF"}
+    else:
+        rss_before = rss_bytes()
+        windows = []
+        window, opened = open_window(animated, "Gif 0")
+        windows.append(window)
+        start = time.perf_counter()
+        engine = gif_engine()
+        while not any(animation.frames for animation in engine.animations.values()):
+            app.processEvents()
+            time.sleep(0.001)
+            if time.perf_counter() - start > 10:
+                break
+        decoded = time.perf_counter() - start
+        for i in range(1, args.gif_windows):
+            windows.append(open_window(animated, f"Gif {i}")[0])
+
+        animation = next(iter(engine.animations.values()))
+        shown = animation.frames_shown
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        run_loop(app, args.seconds)
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+        results['gif'] = {
+            'image': "900x800, 24 frames at 40 ms",
+            'windows': args.gif_windows,
+            'first_window_ms': round(opened * 1000, 2),
+            'decoded_ms': round(decoded * 1000, 2),
+            'cpu_percent': round(cpu / wall * 100, 2),
+            'frames_per_second': round((animation.frames_shown - shown) / wall, 1),
+            'frames_dropped': animation.frames_dropped,
+            # The engine keeps fewer frames of a GIF too big for its per-GIF budget
+            'frames_kept': len(animation.frames),
+            'engine_bytes': engine.used_bytes(),
+            'rss_growth_bytes': rss_bytes() - rss_before if rss_before else None,
+        }
+        for window in windows:
+            window.stop()
+
+    shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+
+def bench_cold_start(args):
+    def launch():
+        output = subprocess.run([sys.executable, os.path.join(HERE, "countdowner.py"), "--profile-startup"],
+                                capture_output=True, text=True, timeout=60).stdout
+        # The report is the JSON object at the end of the output
+        return json.loads(output[output.index("{"):])
+
+    def profile(runs):
+        reports = [launch() for _ in range(runs)]
+        return {stage: round(statistics.median(report[stage] for report in reports), 2)
+                for stage in reports[0]}
+
+    results = {'empty': profile(args.runs)}
+    app_and_module()
+    seed_presets(args.presets)
+    results[f"presets_{args.presets}"] = profile(args.runs)
+    return results
+
+
+def run_scenario(name, args):
+    """Runs one scenario in a child process with its own app data folder; returns its results."""
+    home = tempfile.mkdtemp(prefix="countdowner-bench-home-")
+    env = dict(os.environ, HOME=home, XDG_DATA_HOME=os.path.join(home, "data"),
+               XDG_CONFIG_HOME=os.path.join(home, "config"), XDG_RUNTIME_DIR=home, TMPDIR=home,
+               APPDATA=home, LOCALAPPDATA=home)
+    result_path = os.path.join(home, "result.json")
+    command = [sys.executable, os.path.abspath(__file__), "--scenario", name, "--result", result_path,
+               "--timers", str(args.timers), "--presets", str(args.presets), "--seconds", str(args.seconds),
+               "--operations", str(args.operations), "--runs", str(args.runs), "--gif-windows", str(args.gif_windows)]
+    start = time.perf_counter()
+    child = subprocess.run(command, env=env, cwd=HERE, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    try:
+        if child.returncode != 0:
+            return {'error': child.stderr.strip().splitlines()[-1:] or [f"exit code {child.returncode}"]}
+        with open(result_path) as f:
+            results = json.load(f)
+        results['scenario_seconds'] = round(elapsed, 2)
+        return results
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+    return {
+        'commit': commit,
+        'when': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'qpa': os.environ.get("QT_QPA_PLATFORM"),
+    }
+
+
+def flatten(results, prefix=""):
+    for key, value in results.items():
+        if isinstance(value, dict):
+            yield from flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield f"{prefix}{key}", value
+
+
+def compare(before, after):
+    """Prints every number that is in both runs, with the change."""
+    old = dict(flatten(before['results']))
+    print(f"{'':52} {'before':>12} {'after':>12} {'change':>8}")
+    for key, value in flatten(after['results']):
+        if key not in old:
+            continue
+        change = f"{(value - old[key]) / old[key] * 100:+.1f}%" if old[key] else ""
+        print(f"{key:52} {old[key]:12.10g} {value:12.10g} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the whole app; prints JSON.")
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), metavar="SCENARIO",
+                        help=f"run just these ({', '.join(SCENARIOS)})")
+    parser.add_argument("-o", "--output", help="write the results here as well as printing them")
+    parser.add_argument("--compare", metavar="FILE", help="an earlier run's results to compare against")
+    parser.add_argument("--timers", type=int, default=100, help="running timer windows (default 100)")
+    parser.add_argument("--presets", type=int, default=10_000, help="saved presets (default 10000)")
+    parser.add_argument("--seconds", type=float, default=5, help="how long to let timers and GIFs run (default 5)")
+    parser.add_argument("--operations", type=int, default=50, help="saves, deletes and windows to time (default 50)")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to take the median of (default 5)")
+    parser.add_argument("--gif-windows", type=int, default=10, help="windows sharing the GIF background (default 10)")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        results = globals()[f"bench_{args.scenario}"](args)
+        with open(args.result, "w") as f:
+            json.dump(results, f)
+        return
+
+    report = {'environment': environment(), 'results': {}}
+    for name in args.only:
+        print(f"{name}...", file=sys.stderr)
+        report['results'][name] = run_scenario(name, args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
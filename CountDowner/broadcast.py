@@ -0,0 +1,250 @@
+import json
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtNetwork import QHostAddress, QTcpServer
+
+
+# A small local web server for stream overlays and hallway displays:
+#   GET /          an overlay page (add ?name=Tea to show just that timer)
+#   GET /timers    the running timers as JSON
+#   GET /events    a Server-Sent Events stream of the same, pushed on change
+#   GET /stats     tick latency and stall numbers, when the app runs with --instrument
+#
+# No CORS headers are sent: the overlay page (and OBS browser sources showing it)
+# fetch from the same origin, and other web pages the user visits must not be
+# able to read /stats (stack samples, file paths) or the timer names.
+#
+# Only deadlines are sent, never the ticking seconds: the page counts down on
+# its own, so a client hears from us when a timer starts, stops or finishes
+# (plus a keep-alive comment every 30 s) and nothing else. Each event carries
+# the server's clock so the page can correct for a browser clock that is off.
+#
+# event: snapshot    data: {"now": 1760.0, "timers": [{"id", "name", "state", "deadline", "total"}]}
+# event: update      data: {"now": 1760.0, "timers": [...changed...], "removed": [ids]}
+
+MAX_REQUEST = 8192              # Bytes of request headers we are prepared to read
+MAX_BACKLOG = 256 * 1024        # A subscriber this far behind is dropped (it will reconnect)
+KEEPALIVE_MS = 30000
+
+
+class BroadcastServer(QObject):
+    """Serves the running timers over HTTP and SSE from the GUI thread's event loop.
+
+    `publish(key, info)` records a timer's new state and `remove(key)` forgets
+    it. Changes made in the same event-loop pass go out as one update, so
+    restoring or stopping a hundred timers at once is one message per client.
+    """
+    def __init__(self, port=8765, host="127.0.0.1", parent=None):
+        super().__init__(parent)
+        self.port = port
+        self.host = host
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self._on_connection)
+        self.timers = {}            # key -> info dict, as last published
+        self.sockets = set()        # every open connection (which also keeps its Python wrapper alive)
+        self.subscribers = set()    # the ones with an open /events stream
+        self._changed = {}
+        self._removed = set()
+        self.stats = None           # Returns the /stats report, or None when there is none
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+        self._keepalive = QTimer(self)
+        self._keepalive.setInterval(KEEPALIVE_MS)
+        self._keepalive.timeout.connect(lambda: self._send_all(b": keepalive\n\n"))
+
+        self.requests = 0
+        self.messages = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+
+    def listen(self):
+        address = QHostAddress("127.0.0.1" if self.host == "localhost" else self.host)
+        if not self.server.listen(address, self.port):
+            return False
+        self.port = self.server.serverPort()
+        self._keepalive.start()
+        return True
+
+    def close(self):
+        self._keepalive.stop()
+        self.server.close()
+        for sock in list(self.subscribers):
+            sock.disconnectFromHost()
+
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def publish(self, key, info):
+        self.timers[key] = info
+        self._changed[key] = info
+        self._removed.discard(key)
+        self._schedule_flush()
+
+    def remove(self, key):
+        if self.timers.pop(key, None) is None:
+            return
+        self._changed.pop(key, None)
+        self._removed.add(key)
+        self._schedule_flush()
+
+    def snapshot(self):
+        return {'now': time.time(), 'timers': list(self.timers.values())}
+
+    def flush(self):
+        """Sends the changes since the last flush to every subscriber as one event."""
+        if not self._changed and not self._removed:
+            return
+        update = {'now': time.time(), 'timers': list(self._changed.values()), 'removed': sorted(self._removed)}
+        self._changed = {}
+        self._removed = set()
+        if self.subscribers:
+            self._send_all(_event("update", update))
+
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _send_all(self, data):
+        # The event is encoded once and the same bytes are queued on every socket
+        for sock in list(self.subscribers):
+            self._send(sock, data)
+        self.messages += 1
+
+    def _send(self, sock, data):
+        if sock.bytesToWrite() > MAX_BACKLOG:
+            self.dropped += 1
+            self._drop(sock)
+            return
+        sock.write(data)
+        self.bytes_sent += len(data)
+
+    def _drop(self, sock):
+        self.subscribers.discard(sock)
+        sock.abort()
+
+    def _on_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            sock.request = b""
+            self.sockets.add(sock)
+            sock.readyRead.connect(lambda sock=sock: self._read(sock))
+            sock.disconnected.connect(lambda sock=sock: self._disconnected(sock))
+            # The request may have arrived before we connected to readyRead
+            if sock.bytesAvailable():
+                self._read(sock)
+
+    def _disconnected(self, sock):
+        self.sockets.discard(sock)
+        self.subscribers.discard(sock)
+        sock.deleteLater()
+
+    def _read(self, sock):
+        if sock in self.subscribers:
+            sock.readAll()          # Nothing more is expected on an event stream
+            return
+        sock.request += bytes(sock.readAll())
+        if b"\r\n\r\n" not in sock.request:
+            if len(sock.request) > MAX_REQUEST:
+                self._reply(sock, "431 Request Header Fields Too Large", "text/plain", b"request too large\n")
+            return
+        self.requests += 1
+        method, _, rest = sock.request.partition(b" ")
+        target = rest.split(b" ", 1)[0].decode("latin-1")
+        path = target.partition("?")[0]     # The overlay page reads ?name= itself
+        if method != b"GET":
+            self._reply(sock, "405 Method Not Allowed", "text/plain", b"only GET\n")
+        elif path == "/events":
+            self._subscribe(sock)
+        elif path == "/stats":
+            report = self.stats() if self.stats is not None else None
+            if report is None:
+                self._reply(sock, "404 Not Found", "text/plain", b"instrumentation is off\n")
+            else:
+                self._reply(sock, "200 OK", "application/json", json.dumps(report).encode())
+        elif path == "/timers":
+            self._reply(sock, "200 OK", "application/json", json.dumps(self.snapshot()).encode())
+        elif path in ("/", "/index.html"):
+            self._reply(sock, "200 OK", "text/html; charset=utf-8", OVERLAY_PAGE.encode())
+        else:
+            self._reply(sock, "404 Not Found", "text/plain", b"not found\n")
+
+    def _reply(self, sock, status, content_type, body):
+        head = (f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                f"Cache-Control: no-store\r\nConnection: close\r\n\r\n")
+        sock.write(head.encode() + body)
+        self.bytes_sent += len(head) + len(body)
+        sock.disconnectFromHost()   # Closes once everything has been written
+
+    def _subscribe(self, sock):
+        head = (b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-store\r\n"
+                b"Connection: keep-alive\r\n\r\n"
+                b"retry: 2000\n\n")
+        sock.write(head)
+        self.subscribers.add(sock)
+        # Changes still waiting for the next flush are in the snapshot too; repeating them is harmless
+        self._send(sock, _event("snapshot", self.snapshot()))
+
+
+def _event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+OVERLAY_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>CountDowner</title>
+<style>
+  body { margin: 0; background: transparent; color: white; font: bold 64px sans-serif;
+         text-shadow: 0 0 6px black; }
+  .timer { padding: 8px 16px; }
+  .name { font-size: 24px; }
+  .finished .time { color: #ff5050; }
+</style></head>
+<body><div id="timers"></div>
+<script>
+const only = new URLSearchParams(location.search).get("name");
+const timers = new Map();
+let offset = 0;     // server clock - browser clock, in seconds
+
+function apply(data, replace) {
+  offset = data.now - Date.now() / 1000;
+  if (replace) timers.clear();
+  for (const id of data.removed || []) timers.delete(id);
+  for (const t of data.timers) timers.set(t.id, t);
+  build();
+}
+
+function build() {
+  const root = document.getElementById("timers");
+  root.textContent = "";
+  for (const t of timers.values()) {
+    if (only && t.name !== only) continue;
+    const div = document.createElement("div");
+    div.className = "timer " + t.state;
+    div.dataset.id = t.id;
+    div.innerHTML = '<div class="name"></div><div class="time"></div>';
+    div.firstChild.textContent = t.name;
+    root.appendChild(div);
+  }
+  render();
+}
+
+function pad(n) { return String(n).padStart(2, "0"); }
+
+function render() {
+  const now = Date.now() / 1000 + offset;
+  for (const div of document.querySelectorAll(".timer")) {
+    const t = timers.get(Number(div.dataset.id));
+    const left = Math.max(0, Math.ceil(t.deadline - now - 0.001));
+    div.lastChild.textContent = pad(Math.floor(left / 3600)) + ":" + pad(Math.floor(left % 3600 / 60)) + ":" + pad(left % 60);
+  }
+}
+
+const events = new EventSource("/events");
+events.addEventListener("snapshot", e => apply(JSON.parse(e.data), true));
+events.addEventListener("update", e => apply(JSON.parse(e.data), false));
+setInterval(render, 200);
+</script></body></html>
+"""
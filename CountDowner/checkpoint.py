@@ -0,0 +1,89 @@
+import json
+import os
+import time
+
+
+class Checkpoint:
+    """Keeps the running timers on disk so they survive a crash or restart.
+
+    Each timer is saved with its wall-clock deadline, not its remaining time,
+    so nothing changes while it counts down: the file is only written when a
+    timer starts, stops or finishes. Changes are batched too. The first one
+    calls `arm(delay_ms)`, and whoever owns the real timer calls `flush()`
+    when it fires. Starting a hundred timers at once therefore costs one
+    write, and there is at most one write per `delay` seconds.
+
+    `arm(None)` means nothing is waiting to be written.
+    """
+    version = 1
+
+    def __init__(self, path, arm, delay=0.25, clock=time.time):
+        self.path = path
+        self.arm = arm
+        self.delay = delay
+        self.clock = clock
+        self._entries = {}          # key -> entry dict
+        self._dirty = False
+        self.writes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self, key, name, remaining, preset=None, alarm=None):
+        """Records a running timer; `remaining` is in seconds from now."""
+        self._entries[key] = {
+            'name': name,
+            'deadline': self.clock() + remaining,
+            'alarm': alarm,
+            'preset': preset,
+        }
+        self._changed()
+
+    def discard(self, key):
+        if self._entries.pop(key, None) is not None:
+            self._changed()
+
+    def flush(self):
+        """Writes the checkpoint now if anything has changed since the last write."""
+        self.arm(None)
+        if not self._dirty:
+            return False
+        self._dirty = False
+        data = {'version': self.version, 'saved_at': self.clock(), 'timers': list(self._entries.values())}
+        # Write a new file and swap it in, so a crash mid-write leaves the old checkpoint intact
+        partial = self.path + ".tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, self.path)
+        self.writes += 1
+        return True
+
+    def load(self):
+        """The timers saved last time, each with `remaining` (seconds, negative when overdue) added.
+
+        A missing or unreadable checkpoint is treated as empty.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            timers = data['timers']
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return []
+
+        now = self.clock()
+        entries = []
+        for entry in timers:
+            if isinstance(entry, dict) and 'name' in entry and 'deadline' in entry:
+                entry['remaining'] = entry['deadline'] - now
+                entries.append(entry)
+        return entries
+
+    def _changed(self):
+        if not self._dirty:
+            self._dirty = True
+            self.arm(int(self.delay * 1000))
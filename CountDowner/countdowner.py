@@ -1,7 +1,245 @@
-from PyQt6.QtCore import QTimer, QSize, Qt
-from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QLabel, QVBoxLayout, QListWidget, QSpinBox, QWidget, QSystemTrayIcon, QMenu, QToolBar, QFontComboBox, QInputDialog, QFileDialog, QColorDialog
-from PyQt6.QtGui import QAction, QPixmap, QMovie
-from playsound import playsound
+import time
+_process_started = time.perf_counter()     # For --profile-startup; taken before the Qt imports
+
+import sys
+
+import instance
+_command_line = None    # (commands, other_args), parsed once and handed on to main()
+if __name__ == "__main__" and "--profile-startup" not in sys.argv:
+    # If a CountDowner is already running, give it this command line and quit before Qt is loaded
+    _command_line = instance.parse_commands(sys.argv[1:])
+    exit_code = instance.handoff(_command_line[0])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+import argparse
+import json
+import os
+from collections import deque
+
+from PyQt6 import sip
+from PyQt6.QtCore import QTimer, QSize, Qt, QEvent, QObject, QStandardPaths, QAbstractListModel, QModelIndex, QStringListModel, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QMainWindow, QPushButton, QLabel, QVBoxLayout, QListView, QSpinBox, QWidget, QMenu, QComboBox, QInputDialog, QFileDialog, QColorDialog, QMessageBox, QProgressDialog
+from PyQt6.QtGui import QAction, QFont, QFontDatabase
+from digits import DigitDisplay
+from presets import Preset
+from styles import apply_text_color, restore_text_color
+from tray import tray_manager
+from timer_core import TickScheduler, TimerEngine
+
+
+_tick_scheduler = None
+
+def tick_scheduler():
+    """Returns the one scheduler that wakes every running ActiveTimerWindow."""
+    global _tick_scheduler
+    if _tick_scheduler is None:
+        # A single precise single-shot timer, re-armed for whichever countdown is due next
+        driver = QTimer()
+        driver.setSingleShot(True)
+        driver.setTimerType(Qt.TimerType.PreciseTimer)
+
+        def arm(delay_ms):
+            if delay_ms is None:
+                driver.stop()
+            else:
+                driver.start(delay_ms)
+
+        _tick_scheduler = TickScheduler(arm)
+        _tick_scheduler.driver = driver
+        driver.timeout.connect(_tick_scheduler.run_due)
+    return _tick_scheduler
+
+
+def play_alarm(path):
+    # Hand the alarm to the audio subsystem so the GUI thread keeps running
+    from alarms import alarm_player
+    alarm_player().play(path)
+
+
+_timer_engine = None
+
+def timer_engine():
+    """Returns the engine that runs every timer; the windows are only views of it."""
+    global _timer_engine
+    if _timer_engine is None:
+        _timer_engine = TimerEngine(tick_scheduler(), alarm=play_alarm)
+    return _timer_engine
+
+
+_timer_checkpoint = None
+
+def timer_checkpoint():
+    """Returns the checkpoint that keeps the running timers on disk (see checkpoint.py)."""
+    global _timer_checkpoint
+    if _timer_checkpoint is None:
+        from checkpoint import Checkpoint
+        driver = QTimer()
+        driver.setSingleShot(True)
+
+        def arm(delay_ms):
+            if delay_ms is None:
+                driver.stop()
+            elif not driver.isActive():
+                driver.start(delay_ms)
+
+        _timer_checkpoint = Checkpoint(checkpoint_path(), arm)
+        _timer_checkpoint.driver = driver
+        driver.timeout.connect(_timer_checkpoint.flush)
+    return _timer_checkpoint
+
+
+def checkpoint_path():
+    """Where the running timers are checkpointed (the per-user app data folder)."""
+    folder = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, "running-timers.json")
+
+
+_broadcast_server = None
+
+def start_broadcast(port, host="127.0.0.1"):
+    """Starts the overlay server (see broadcast.py) and publishes the timers already running."""
+    global _broadcast_server
+    from broadcast import BroadcastServer
+    server = BroadcastServer(port, host)
+    if not server.listen():
+        print(f"Could not serve overlays on {host}:{port}: {server.server.errorString()}")
+        return None
+    _broadcast_server = server
+    server.stats = instrumentation_report
+    for window in tray_manager().windows():
+        publish_timer(window)
+    print(f"Serving timer overlays at {server.url()}")
+    return server
+
+
+def publish_timer(window):
+    # Overlays get the deadline once per change and count down by themselves
+    if _broadcast_server is not None:
+        _broadcast_server.publish(id(window.timer), {
+            'id': id(window.timer),
+            'name': window.name,
+            'state': window.timer.state,
+            'deadline': time.time() + window.countdown.remaining(),
+            'total': window.countdown.total_seconds,
+        })
+
+
+def unpublish_timer(window):
+    if _broadcast_server is not None:
+        _broadcast_server.remove(id(window.timer))
+
+
+_instruments = None
+
+def start_instrumentation(stall_ms=100):
+    """Turns on --instrument: tick latency histograms and the stall watchdog (see telemetry.py)."""
+    global _instruments
+    from telemetry import StallWatchdog, TickLatency
+    latency = TickLatency()
+    tick_scheduler().observer = latency
+    watchdog = StallWatchdog(threshold=stall_ms / 1000)
+    # The watchdog's thread expects a beat from the GUI thread every period
+    heartbeat = QTimer()
+    heartbeat.setTimerType(Qt.TimerType.PreciseTimer)
+    heartbeat.timeout.connect(watchdog.beat)
+    heartbeat.start(int(watchdog.period * 1000))
+    watchdog.start()
+    _instruments = {'since': time.time(), 'latency': latency, 'watchdog': watchdog, 'heartbeat': heartbeat}
+
+
+def instrumentation_report():
+    """Everything --instrument has measured so far, or None when it is off."""
+    if _instruments is None:
+        return None
+    return {
+        'since': _instruments['since'],
+        'now': time.time(),
+        'scheduler': tick_scheduler().stats(),
+        'ticks': _instruments['latency'].report(),
+        'stalls': _instruments['watchdog'].report(),
+    }
+
+
+def write_instrumentation(path):
+    report = instrumentation_report()
+    if report is not None:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def preset_db_path():
+    """Where the saved presets live (the per-user app data folder)."""
+    folder = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, "presets.db")
+
+
+_font_family_model = None
+
+def font_family_model():
+    """One list of the installed font families, shared by every font picker."""
+    global _font_family_model
+    if _font_family_model is None:
+        _font_family_model = QStringListModel(QFontDatabase.families())
+    return _font_family_model
+
+
+class WindowPool:
+    """Keeps closed windows around so the next one reuses their widgets instead of building new ones."""
+    def __init__(self, create, reuse, max_idle=4):
+        self.create = create
+        self.reuse = reuse
+        self.max_idle = max_idle
+        self.idle = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        while self.idle:
+            window = self.idle.pop()
+            if not sip.isdeleted(window):
+                self.reuse(window, *args)
+                self.reused += 1
+                return window
+        self.created += 1
+        return self.create(*args)
+
+    def release(self, window):
+        if any(window is idle for idle in self.idle):
+            return
+        if len(self.idle) < self.max_idle:
+            self.idle.append(window)
+        else:
+            window.deleteLater()
+
+
+class FontComboBox(QComboBox):
+    """Drop-in for QFontComboBox that shares one font family model instead of enumerating the fonts each time."""
+    currentFontChanged = pyqtSignal(QFont)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModel(font_family_model())
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        # Don't measure every family name to work out the width
+        self.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.setMinimumContentsLength(14)
+        self.setCurrentFont(QApplication.font())
+        self.currentIndexChanged.connect(self._emit_current_font)
+
+    def currentFont(self):
+        return QFont(self.currentText())
+
+    def setCurrentFont(self, font):
+        index = self.findText(font.family())
+        self.setCurrentIndex(max(0, index))
+
+    def _emit_current_font(self, index):
+        if index >= 0:
+            self.currentFontChanged.emit(self.currentFont())
 
 
 # First class defines the drag and drop functionality
@@ -18,31 +256,51 @@ class MovableSpinBox(QSpinBox):
         self.drag_start_pos = None
         self.initial_geometry = None
         self.current_color = "white"
+
+        # Drag updates are coalesced: mouse moves only record the latest position,
+        # and the geometry is applied at most once per frame
+        self.pending_drag_pos = None
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.frame_timer.setInterval(16)
+        self.frame_timer.timeout.connect(self.apply_drag)
+
+        # The font only follows the size once the resize has settled
+        self.font_timer = QTimer(self)
+        self.font_timer.setSingleShot(True)
+        self.font_timer.setInterval(150)
+        self.font_timer.timeout.connect(self.update_font_size)
+
+        # Frame-time instrumentation for drag editing (see frame_stats)
+        self.frame_costs = deque(maxlen=240)       # ms spent applying each frame
+        self.frame_intervals = deque(maxlen=240)   # ms between applied frames
+        self.last_frame_at = None
     
     def open_color_menu(self):
         """Open the color picker menu for this widget"""
         color = QColorDialog.getColor()
 
         if color.isValid():
-            self.current_color = color.name()
             print(color.name())
-            self.setStyleSheet(f"""
-            QSpinBox {{
-                color: {self.current_color};
-                background-color: rgba(255, 255, 255, 150); 
-                border: 1px solid #888;
-                border-radius: 5px;
-                padding: 0px;
-            }}
-            QSpinBox QLineEdit {{
-            background: transparent;
-            padding: 0px;
-            margin: 0px;
-            }}
-            QSpinBox::up-button, QSpinBox::down-button {{
-                width: 0px; 
-            }}
-        """)
+            self.set_color(color.name())
+
+    def setColor(self, color):
+        # Same name as DigitDisplay.setColor, so a Preset can be applied to either
+        self.set_color(color)
+
+    def set_color(self, color):
+        """Sets the digit colour (shared palette + the app-wide spin box style, no CSS parsing)."""
+        self.current_color = color
+        apply_text_color(self, color)
+
+    def event(self, event):
+        handled = super().event(event)
+        # A box coloured before it was first shown loses its palette when it is polished
+        # (the line edit is polished after the box itself, so Show is the first safe point)
+        if event.type() in (QEvent.Type.Show, QEvent.Type.StyleChange) and self.property("colored") is True:
+            restore_text_color(self, self.current_color)
+        return handled
 
     def _get_edge(self, pos):
         """Returns which edge the mouse is over."""
@@ -79,138 +337,230 @@ class MovableSpinBox(QSpinBox):
             elif edge == "bottom": self.setCursor(Qt.CursorShape.SizeVerCursor)
             else: self.setCursor(Qt.CursorShape.ArrowCursor)
 
+        # 2. Resizing / Moving - just remember where the mouse is, apply_drag does the work
+        if self.is_resizing or self.is_moving:
+            self.pending_drag_pos = event.globalPosition().toPoint()
+            if not self.frame_timer.isActive():
+                self.frame_timer.start()
+            
+        super().mouseMoveEvent(event)
+
+    def apply_drag(self):
+        """Applies the latest drag position - called at most once per frame."""
+        if self.pending_drag_pos is None:
+            return
+        start = time.perf_counter()
+        diff = self.pending_drag_pos - self.drag_start_pos
+        self.pending_drag_pos = None
+
         # 2. Handle Resizing
         if self.is_resizing:
-            diff = event.globalPosition().toPoint() - self.drag_start_pos
             new_width = max(500, self.initial_geometry.width() + diff.x())
             new_height = max(40, self.initial_geometry.height() + diff.y())
             self.resize(new_width, new_height)
-            self.update_font_size() # Sync font with new size
+            self.font_timer.start() # Sync font with new size once it settles
 
         # 3. Handle Moving
         elif self.is_moving:
-            diff = event.globalPosition().toPoint() - self.drag_start_pos
             self.move(self.initial_geometry.topLeft() + diff)
-            
-        super().mouseMoveEvent(event)
+
+        now = time.perf_counter()
+        self.frame_costs.append((now - start) * 1000)
+        if self.last_frame_at is not None:
+            self.frame_intervals.append((now - self.last_frame_at) * 1000)
+        self.last_frame_at = now
 
     def mouseReleaseEvent(self, event):
+        # Apply the final position before the drag ends
+        self.frame_timer.stop()
+        self.apply_drag()
+        if self.is_resizing:
+            self.font_timer.stop()
+            self.update_font_size()
         self.is_resizing = False
         self.is_moving = False
+        self.last_frame_at = None
         self.setCursor(Qt.CursorShape.ArrowCursor)
         super().mouseReleaseEvent(event)
 
+    def frame_stats(self):
+        """Frame timings (ms) for recent drags: cost of applying a frame, and frame rate."""
+        costs = list(self.frame_costs)
+        intervals = list(self.frame_intervals)
+        return {
+            'frames': len(costs),
+            'avg_cost_ms': sum(costs) / len(costs) if costs else 0.0,
+            'max_cost_ms': max(costs, default=0.0),
+            'fps': 1000 * len(intervals) / sum(intervals) if intervals else 0.0,
+        }
+
     def update_font_size(self):
         """Scales the font size based on the current height of the widget."""
-        new_font = self.font()
         # Roughly 60% of the widget height works well for digits
-        new_font.setPointSize(int(self.height() * 0.6))
+        point_size = max(1, int(self.height() * 0.6))
+        if point_size == self.font().pointSize():
+            return
+        new_font = self.font()
+        new_font.setPointSize(point_size)
         self.setFont(new_font)
 
 
 class ActiveTimerWindow(QWidget):
     """The replica window that runs in the background."""
-    def __init__(self, h, m, s, positions, h_font, m_font, s_font, h_color, m_color, s_color, alarm, bg_path, size, name, sizes):
+    def __init__(self, preset, alarm=None, remaining=None):
         super().__init__()
-        self.name = name
-        self.setWindowTitle(name)
-        self.setFixedSize(QSize(size.width(), size.height()))
-        self.alarm = alarm
-        self.bg_path = bg_path
-        print(self.bg_path)
-
-        # 1. Setup UI based on Creator's values
-        self.hour_label = QLabel(f"{h:02}", self)
-        self.min_label = QLabel(f"{m:02}", self)
-        self.sec_label = QLabel(f"{s:02}", self)
-
-        # Set Font
-        self.hour_label.setFont(h_font)
-        self.min_label.setFont(m_font)
-        self.sec_label.setFont(s_font)
 
-        # Set Sizes for Labels
-        self.hour_label.resize(sizes['size_h'][0], sizes['size_h'][1])
-        self.min_label.resize(sizes['size_m'][0], sizes['size_m'][1])
-        self.sec_label.resize(sizes['size_s'][0], sizes['size_s'][1])
-
-        # Set Color
-        self.hour_label.setStyleSheet(f"color: {h_color};")
-        self.min_label.setStyleSheet(f"color: {m_color};")
-        self.sec_label.setStyleSheet(f"color: {s_color};")
+        # 1. Setup UI - built once; start() fills it in, so a stopped window can be reused
+        # The digits are drawn from a cached glyph atlas, repainting only the ones that change
+        self.hour_label = DigitDisplay(parent=self)
+        self.min_label = DigitDisplay(parent=self)
+        self.sec_label = DigitDisplay(parent=self)
 
         # Set Background
         self.bg_label = QLabel(self)
-        self.bg_label.setGeometry(0, 0, size.width(), size.height())
         self.bg_label.setScaledContents(True) 
         self.bg_label.lower() 
 
-        if not self.bg_path == None:
-            if self.bg_path.lower().endswith(".gif"):
-                # Handle Animated GIF
-                movie = QMovie(self.bg_path)
-                self.bg_label.setMovie(movie)
-                movie.start()
-            else:
-                # Handle Static Image
-                pixmap = QPixmap(self.bg_path)
-                self.bg_label.setPixmap(pixmap)
-        
-        # Position them where the user had them (using 'positions' dict)
-        self.hour_label.move(positions['h'][0], positions['h'][1])
-        self.min_label.move(positions['m'][0], positions['m'][1])
-        self.sec_label.move(positions['s'][0], positions['s'][1])
+        self.start(preset, alarm, remaining)
 
-        # 2. Setup the Countdown Logic
-        self.remaining_seconds = h * 3600 + m * 60 + s
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.tick)
-        self.timer.start(1000)
+    def start(self, preset, alarm=None, remaining=None):
+        """Sets the window up from a Preset and starts the countdown.
 
-        # 3. Setup System Tray Icon
-        self.tray_icon = QSystemTrayIcon(self)
-        # Note: You'll need a real .png or .ico file for this to show up clearly
-        self.tray_icon.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_ComputerIcon))
-        
-        # Create a menu for the tray icon
-        tray_menu = QMenu()
-        show_action = QAction("Show Timer", self)
-        quit_action = QAction("Stop Timer", self)
-        
-        show_action.triggered.connect(self.show)
-        quit_action.triggered.connect(self.close)
-        
-        tray_menu.addAction(show_action)
-        tray_menu.addAction(quit_action)
-        
-        self.tray_icon.setContextMenu(tray_menu)
-        self.tray_icon.show()
-
-    def tick(self):
-        # The timer counts down with this function
-        if self.remaining_seconds > 0:
-            self.remaining_seconds -= 1
-            h = self.remaining_seconds // 3600
-            m = (self.remaining_seconds % 3600) // 60
-            s = self.remaining_seconds % 60
-            self.hour_label.setText(f"{h:02}")
-            self.min_label.setText(f"{m:02}")
-            self.sec_label.setText(f"{s:02}")
-            self.tray_icon.setToolTip(f"Timer: {h:02}:{m:02}:{s:02}")
+        `remaining` (seconds) overrides the preset's own time, for a timer
+        picked up from the checkpoint part way through.
+        """
+        self.name = preset.name
+        self.setWindowTitle(preset.name)
+        width, height = preset.size()
+        self.setFixedSize(QSize(width, height))
+        self.alarm = alarm
+        self.bg_path = preset.background
+        print(self.bg_path)
+
+        # Values, colours, fonts, sizes and positions of the labels, where the user had them
+        preset.apply_to((self.hour_label, self.min_label, self.sec_label))
+
+        # Set Background
+        self.bg_label.setGeometry(0, 0, width, height)
+        # The image code (like audio and presets) is only imported once it is needed,
+        # so none of it is paid for before the main window is on screen
+        from images import clear_background, show_background
+        if not self.bg_path == None:
+            show_background(self.bg_label, self.bg_path)
         else:
-            self.timer.stop()
-            self.tray_icon.showMessage("Timer Done", "Your countdown has finished!", QSystemTrayIcon.MessageIcon.Information)
-            if not self.alarm == None:
-                playsound(self.alarm)
+            clear_background(self.bg_label)
+
+        # 2. Start the countdown in the shared engine, which also rings the alarm.
+        # It keeps an absolute deadline and is woken on each second boundary
+        # together with every other running timer; this window just shows it.
+        total_seconds = preset.total_seconds() if remaining is None else max(0, remaining)
+        self.timer = timer_engine().start(preset.name, total_seconds, alarm, on_tick=self.tick, on_finish=self.finish)
+        self.countdown = self.timer.countdown
+        self.remaining_seconds = self.countdown.remaining_seconds()
+        self.render_pending = False     # True when ticks happened while nothing was on screen
+
+        # Saved with its deadline, so it can be picked up again if the app goes away
+        timer_checkpoint().save(id(self.timer), preset.name, self.countdown.remaining(), preset.to_record(), alarm)
+        publish_timer(self)
+
+        # 3. List this timer in the shared system tray icon
+        tray_manager().add(self)
+
+    def tick(self, now):
+        # Called by the engine on each second boundary
+        self.show_time(now)
+        tray_manager().timer_ticked(self, now)
+
+    def finish(self, now):
+        # Called by the engine when the countdown reaches zero (it rings the alarm itself)
+        timer_checkpoint().discard(id(self.timer))
+        publish_timer(self)
+        self.show_time(now)
+        tray_manager().timer_finished(self, now)
+
+    def show_time(self, now):
+        # The countdown state always advances, but hidden windows skip the widget work
+        from images import is_on_screen
+        self.remaining_seconds = self.countdown.remaining_seconds(now)
+        if is_on_screen(self, check_exposed=True):
+            self.render(now)
+        else:
+            self.render_pending = True
+
+    def render(self, now=None):
+        """Brings the labels up to date with the countdown in one go."""
+        h, m, s = self.countdown.hms(now)
+        self.hour_label.setValue(h)
+        self.min_label.setValue(m)
+        self.sec_label.setValue(s)
+        self.render_pending = False
+
+    def catch_up(self):
+        from images import is_on_screen
+        if self.render_pending and is_on_screen(self, check_exposed=True):
+            self.render()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Watch the native window too, so a window that was covered catches up when it is uncovered
+        handle = self.windowHandle()
+        if handle is not None and not getattr(self, "watching_expose", False):
+            handle.installEventFilter(self)
+            self.watching_expose = True
+        self.catch_up()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.catch_up()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Expose:
+            # Expose arrives before the paint, so the refreshed digits are what gets drawn
+            self.catch_up()
+        return super().eventFilter(obj, event)
+
+    def stop(self):
+        """Stops the countdown for good and takes it out of the tray."""
+        timer_engine().stop(self.timer)
+        timer_checkpoint().discard(id(self.timer))
+        unpublish_timer(self)
+        tray_manager().remove(self)
+        self.close()
+        timer_windows.release(self)
+
+
+# Stopped timer windows are kept here and reused by the next "Run Timer"
+timer_windows = WindowPool(ActiveTimerWindow, ActiveTimerWindow.start)
+
+
+def run_preset(preset, alarm=None, remaining=None):
+    """Starts (and shows) a timer window straight from a Preset."""
+    window = timer_windows.acquire(preset, alarm, remaining)
+    window.show()
+    return window
+
+
+def restore_timers():
+    """Restarts the timers that were still running when the app last went away.
+
+    Timers whose deadline passed while the app was closed start at zero, so
+    they finish (and ring their alarms) on the scheduler's next pass.
+    """
+    restored = []
+    for entry in timer_checkpoint().load():
+        try:
+            preset = Preset.from_record(entry['preset']) if entry.get('preset') else Preset(entry['name'])
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Could not restore timer {entry['name']!r}: {e}")
+            continue
+        restored.append(run_preset(preset, entry.get('alarm'), remaining=entry['remaining']))
+    return restored
 
 
 class CreatorEditWindow(QMainWindow): # This will be the window where users can create their timers
-    def __init__(self, parent_main_window, name, preset_data=None):
+    def __init__(self, parent_main_window, name, preset=None):
         super().__init__()
-        self.main_window = parent_main_window
-        self.name = name
-        self.alarm = None
-        self.setWindowTitle(name)
         self.setMinimumSize(QSize(900, 800))
 
         self.canvas = QWidget()
@@ -226,6 +576,12 @@ class CreatorEditWindow(QMainWindow): # This will be the window where users can
 
         self.bg_label.lower()
 
+        # While the window is being resized the old pixmap is stretched; a correctly sized one is loaded after
+        self.bg_refresh = QTimer(self)
+        self.bg_refresh.setSingleShot(True)
+        self.bg_refresh.setInterval(150)
+        self.bg_refresh.timeout.connect(self.refresh_background)
+
         layout = QVBoxLayout()
 
         self.label = QLabel(self)
@@ -260,6 +616,7 @@ class CreatorEditWindow(QMainWindow): # This will be the window where users can
         self.hour_input.raise_()
         self.min_input.raise_()
         self.sec_input.raise_()
+        self.inputs = (self.hour_input, self.min_input, self.sec_input)
 
         for widget in [self.hour_input, self.min_input, self.sec_input]:
             widget.setMinimumSize(60, 40)
@@ -267,47 +624,54 @@ class CreatorEditWindow(QMainWindow): # This will be the window where users can
 
 
         # Setting Fonts
-        self.hour_font = QFontComboBox(self.canvas)
+        self.hour_font = FontComboBox(self.canvas)
         self.hour_font.move(50, 180)
-        self.minute_font = QFontComboBox(self.canvas)
+        self.minute_font = FontComboBox(self.canvas)
         self.minute_font.move(200, 180)
-        self.second_font = QFontComboBox(self.canvas)
+        self.second_font = FontComboBox(self.canvas)
         self.second_font.move(350, 180)
 
         self.hour_font.currentFontChanged.connect(self.change_font)
         self.minute_font.currentFontChanged.connect(self.change_font)
         self.second_font.currentFontChanged.connect(self.change_font)
 
+        self.open_preset(parent_main_window, name, preset)
+
+    def open_preset(self, parent_main_window, name, preset=None):
+        """Fills the editor for a preset; also used when a closed editor is reused."""
+        self.main_window = parent_main_window
+        self.name = name
+        self.alarm = None
+        self.setWindowTitle(name)
+
+        # Start from the default font pickers without applying them to the inputs
+        for picker in [self.hour_font, self.minute_font, self.second_font]:
+            picker.blockSignals(True)
+            picker.setCurrentFont(QApplication.font())
+            picker.blockSignals(False)
+
+        from images import clear_background, show_background
+        self.bg_path = None
+        clear_background(self.bg_label)
+
         # If we opened this from a preset, fill the values
-        if preset_data:
-            self.hour_input.setValue(preset_data['h'])
-            self.min_input.setValue(preset_data['m'])
-            self.sec_input.setValue(preset_data['s'])
-            self.hour_input.move(*preset_data['pos_h'])
-            self.min_input.move(*preset_data['pos_m'])
-            self.sec_input.move(*preset_data['pos_s'])
-            self.hour_input.setFont(preset_data['h_font'])
-            self.min_input.setFont(preset_data['m_font'])
-            self.sec_input.setFont(preset_data['s_font'])
-            self.hour_input.current_color = preset_data['h_color']
-            self.min_input.current_color = preset_data['m_color']
-            self.sec_input.current_color = preset_data['s_color']
-            self.bg_label.setGeometry(0, 0, preset_data['size'].width(), preset_data['size'].height())
-
-            if not preset_data['background'] == None:
-                self.bg_path = preset_data['background']
-                if preset_data['background'].lower().endswith(".gif"):
-                    movie = QMovie(preset_data['background'])
-                    self.bg_label.setMovie(movie)
-                    movie.start()
-                else:
-                    pixmap = QPixmap(preset_data['background'])
-                    self.bg_label.setPixmap(pixmap)
+        if preset:
+            preset.apply_to(self.inputs)
+            self.bg_label.setGeometry(0, 0, *preset.size())
+
+            if not preset.background == None:
+                self.bg_path = preset.background
+                show_background(self.bg_label, self.bg_path)
         else:
             self.hour_input.move(50, 100)
             self.min_input.move(200, 100)
             self.sec_input.move(350, 100)
 
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        # Keep the closed editor for the next preset that gets opened
+        editor_windows.release(self)
+
     def open_alarm_sound(self):
         # The function returns a tuple (file_path, filter). We need the path.
         file_path, _ = QFileDialog.getOpenFileName(
@@ -325,22 +689,18 @@ class CreatorEditWindow(QMainWindow): # This will be the window where users can
         path, _ = QFileDialog.getOpenFileName(self, "Select Background", "", file_filter)
         
         if path:
+            from images import show_background
             self.bg_path = path
-            if path.lower().endswith(".gif"):
-                # Handle Animated GIF
-                movie = QMovie(path)
-                self.bg_label.setMovie(movie)
-                movie.start()
-                self.hour_input.raise_()
-                self.min_input.raise_()
-                self.sec_input.raise_()
-            else:
-                # Handle Static Image
-                pixmap = QPixmap(path)
-                self.bg_label.setPixmap(pixmap)
-                self.hour_input.raise_()
-                self.min_input.raise_()
-                self.sec_input.raise_()
+            show_background(self.bg_label, path)
+            self.hour_input.raise_()
+            self.min_input.raise_()
+            self.sec_input.raise_()
+
+    def refresh_background(self):
+        # Fetch a background pre-scaled to the new size once resizing has settled
+        if self.bg_path:
+            from images import show_background
+            show_background(self.bg_label, self.bg_path)
 
     # Make sure background resizes if the window resizes
     def resizeEvent(self, event):
@@ -349,6 +709,7 @@ class CreatorEditWindow(QMainWindow): # This will be the window where users can
         
         # Ensure the background covers the entire window area
         self.bg_label.setGeometry(0, 0, self.new_size.width(), self.new_size.height())
+        self.bg_refresh.start()
         
         # Keep the numbers on top after the background move
         self.hour_input.raise_()
@@ -375,40 +736,21 @@ class CreatorEditWindow(QMainWindow): # This will be the window where users can
         self.sec_input.setFont(s_font)
     
     def savecurrent(self):
-        data = {
-            'name': self.name,
-            'h': self.hour_input.value(),
-            'm': self.min_input.value(),
-            's': self.sec_input.value(),
-            'pos_h': (self.hour_input.x(), self.hour_input.y()),
-            'pos_m': (self.min_input.x(), self.min_input.y()),
-            'pos_s': (self.sec_input.x(), self.sec_input.y()),
-            'h_font': self.hour_input.font(),
-            'm_font': self.min_input.font(),
-            's_font': self.sec_input.font(),
-            'size_h': (self.hour_input.width(), self.hour_input.height()), # Save the size!
-            'size_m': (self.min_input.width(), self.min_input.height()),
-            'size_s': (self.sec_input.width(), self.sec_input.height()),
-            'h_color': self.hour_input.current_color,
-            'm_color': self.min_input.current_color,
-            's_color': self.sec_input.current_color,
-            'background': self.bg_path,
-            'size': self.new_size
-        }
+        preset = Preset.from_widgets(self.name, self.inputs, self.bg_path, self.new_size)
 
         # Save to Main Window
-        self.main_window.save_timer(data)
+        self.main_window.save_timer(preset)
         self.close()
 
     def run_timer(self):
-        self.active_timer = ActiveTimerWindow(self.hour_input.value(), self.min_input.value(), self.sec_input.value(), 
-                                            {'h': (self.hour_input.x(), self.hour_input.y()), 'm': (self.min_input.x(), self.min_input.y()), 's': (self.sec_input.x(), self.sec_input.y())},  
-                                            self.hour_input.font(), self.min_input.font(), self.sec_input.font(), self.hour_input.current_color, self.min_input.current_color, self.sec_input.current_color, 
-                                            self.alarm, self.bg_path, self.new_size, self.name,
-                                            {'size_h': (self.hour_input.width(), self.hour_input.height()), 'size_m': (self.min_input.width(), self.min_input.height()), 'size_s': (self.sec_input.width(), self.sec_input.height())})
+        self.active_timer = timer_windows.acquire(Preset.from_widgets(self.name, self.inputs, self.bg_path, self.new_size), self.alarm)
         self.active_timer.show()
 
 
+# Closed editors are kept here and reused by MainWindow.load_timer
+editor_windows = WindowPool(CreatorEditWindow, CreatorEditWindow.open_preset)
+
+
 class CreatorWindow(QMainWindow): # This will be the window where users can create their timers
     def __init__(self, parent_main_window, preset_data=None):
         super().__init__()
@@ -431,6 +773,12 @@ class CreatorWindow(QMainWindow): # This will be the window where users can crea
 
         self.bg_label.lower()
 
+        # While the window is being resized the old pixmap is stretched; a correctly sized one is loaded after
+        self.bg_refresh = QTimer(self)
+        self.bg_refresh.setSingleShot(True)
+        self.bg_refresh.setInterval(150)
+        self.bg_refresh.timeout.connect(self.refresh_background)
+
         layout = QVBoxLayout()
 
         self.label = QLabel(self)
@@ -468,13 +816,14 @@ class CreatorWindow(QMainWindow): # This will be the window where users can crea
         self.hour_input.raise_()
         self.min_input.raise_()
         self.sec_input.raise_()
+        self.inputs = (self.hour_input, self.min_input, self.sec_input)
 
         # Setting Fonts
-        self.hour_font = QFontComboBox(self.canvas)
+        self.hour_font = FontComboBox(self.canvas)
         self.hour_font.move(50, 180)
-        self.minute_font = QFontComboBox(self.canvas)
+        self.minute_font = FontComboBox(self.canvas)
         self.minute_font.move(200, 180)
-        self.second_font = QFontComboBox(self.canvas)
+        self.second_font = FontComboBox(self.canvas)
         self.second_font.move(350, 180)
 
         self.hour_font.currentFontChanged.connect(self.change_font)
@@ -498,22 +847,18 @@ class CreatorWindow(QMainWindow): # This will be the window where users can crea
         path, _ = QFileDialog.getOpenFileName(self, "Select Background", "", file_filter)
         
         if path:
+            from images import show_background
             self.bg_path = path
-            if path.lower().endswith(".gif"):
-                # Handle Animated GIF
-                movie = QMovie(path)
-                self.bg_label.setMovie(movie)
-                movie.start()
-                self.hour_input.raise_()
-                self.min_input.raise_()
-                self.sec_input.raise_()
-            else:
-                # Handle Static Image
-                pixmap = QPixmap(path)
-                self.bg_label.setPixmap(pixmap)
-                self.hour_input.raise_()
-                self.min_input.raise_()
-                self.sec_input.raise_()
+            show_background(self.bg_label, path)
+            self.hour_input.raise_()
+            self.min_input.raise_()
+            self.sec_input.raise_()
+
+    def refresh_background(self):
+        # Fetch a background pre-scaled to the new size once resizing has settled
+        if self.bg_path:
+            from images import show_background
+            show_background(self.bg_label, self.bg_path)
 
     # Make sure background resizes if the window resizes
     def resizeEvent(self, event):
@@ -522,6 +867,7 @@ class CreatorWindow(QMainWindow): # This will be the window where users can crea
         
         # Ensure the background covers the entire window area
         self.bg_label.setGeometry(0, 0, self.new_size.width(), self.new_size.height())
+        self.bg_refresh.start()
         
         # Keep the numbers on top after the background move
         self.hour_input.raise_()
@@ -558,40 +904,162 @@ class CreatorWindow(QMainWindow): # This will be the window where users can crea
             self.name = f"{self.hour_input.value()}:{self.min_input.value()}:{self.sec_input.value()}"
 
 
-        data = {
-            'name': self.name,
-            'h': self.hour_input.value(),
-            'm': self.min_input.value(),
-            's': self.sec_input.value(),
-            'pos_h': (self.hour_input.x(), self.hour_input.y()),
-            'pos_m': (self.min_input.x(), self.min_input.y()),
-            'pos_s': (self.sec_input.x(), self.sec_input.y()),
-            'h_font': self.hour_input.font(),
-            'm_font': self.min_input.font(),
-            's_font': self.sec_input.font(),
-            'size_h': (self.hour_input.width(), self.hour_input.height()), # Save the size!
-            'size_m': (self.min_input.width(), self.min_input.height()),
-            'size_s': (self.sec_input.width(), self.sec_input.height()),
-            'h_color': self.hour_input.current_color,
-            'm_color': self.min_input.current_color,
-            's_color': self.sec_input.current_color,
-            'background': self.bg_path,
-            'size': self.new_size
-        }
+        preset = Preset.from_widgets(self.name, self.inputs, self.bg_path, self.new_size)
 
         # Save to Main Window
-        self.main_window.add_saved_timer(data)
+        self.main_window.add_saved_timer(preset)
         self.close()
 
     def run_timer(self):
-        self.active_timer = ActiveTimerWindow(self.hour_input.value(), self.min_input.value(), self.sec_input.value(), 
-                                            {'h': (self.hour_input.x(), self.hour_input.y()), 'm': (self.min_input.x(), self.min_input.y()), 's': (self.sec_input.x(), self.sec_input.y())},  
-                                            self.hour_input.font(), self.min_input.font(), self.sec_input.font(), self.hour_input.current_color, self.min_input.current_color, self.sec_input.current_color, 
-                                            self.alarm, self.bg_path, self.new_size, "My Timer",
-                                            {'size_h': (self.hour_input.width(), self.hour_input.height()), 'size_m': (self.min_input.width(), self.min_input.height()), 'size_s': (self.sec_input.width(), self.sec_input.height())})
+        self.active_timer = timer_windows.acquire(Preset.from_widgets("My Timer", self.inputs, self.bg_path, self.new_size), self.alarm)
         self.active_timer.show()
     
 
+class PresetListModel(QAbstractListModel):
+    """Lazy list model over the preset registry.
+
+    Rows are handed to the view in batches as it scrolls (canFetchMore /
+    fetchMore), and nothing is allocated per row apart from the preset id.
+    """
+    batch_size = 500
+
+    def __init__(self, registry, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.ids = [data['id'] for data in registry]
+        self.loaded = 0     # How many rows the view has been told about so far
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.loaded < len(self.ids)
+
+    def fetchMore(self, parent):
+        count = min(self.batch_size, len(self.ids) - self.loaded)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        preset_id = self.ids[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.registry.get(preset_id)['name']
+        if role == Qt.ItemDataRole.UserRole:
+            return preset_id
+        return None
+
+    def append(self, preset_id):
+        if self.loaded < len(self.ids):
+            # The view hasn't reached the end yet; it will fetch this row when it does
+            self.ids.append(preset_id)
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded)
+        self.ids.append(preset_id)
+        self.loaded += 1
+        self.endInsertRows()
+
+    def extend(self, preset_ids):
+        """Appends many rows; the view only hears about them as it scrolls down to them.
+
+        Only a short list gets a batch straight away. Handing every batch of
+        a big import to the view makes it lay out all the rows again each time.
+        """
+        self.ids.extend(preset_ids)
+        if self.loaded < self.batch_size:
+            self.fetchMore(QModelIndex())
+
+    def remove_many(self, preset_ids):
+        """Removes many rows in one pass (a single model reset) instead of one search each."""
+        doomed = set(preset_ids)
+        if not doomed:
+            return
+        self.beginResetModel()
+        self.loaded = sum(1 for preset_id in self.ids[:self.loaded] if preset_id not in doomed)
+        self.ids = [preset_id for preset_id in self.ids if preset_id not in doomed]
+        self.endResetModel()
+
+    def remove(self, preset_id):
+        try:
+            row = self.ids.index(preset_id)
+        except ValueError:
+            return
+        if row >= self.loaded:
+            del self.ids[row]
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.ids[row]
+        self.loaded -= 1
+        self.endRemoveRows()
+
+
+class SlicedJob(QObject):
+    """Runs a long job on the GUI thread in short slices, with a progress dialog.
+
+    `steps` is a generator that does a little work per step and yields its
+    progress (0.0 - 1.0). Between slices of `budget_ms` the event loop runs,
+    so the window keeps repainting and Cancel works.
+    """
+    finished = pyqtSignal(bool)     # False if it was cancelled or failed
+
+    def __init__(self, steps, label, parent, budget_ms=25):
+        super().__init__(parent)
+        self.steps = steps
+        self.budget = budget_ms / 1000
+        self.dialog = QProgressDialog(label, "Cancel", 0, 1000, parent)
+        # Not modal: a modal progress dialog runs the event loop inside every setValue()
+        self.dialog.setWindowModality(Qt.WindowModality.NonModal)
+        self.dialog.setMinimumDuration(300)
+        self.dialog.setAutoClose(False)
+        self.dialog.setAutoReset(False)
+        self.dialog.canceled.connect(self.cancel)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_slice)
+        self.done = False
+
+    def start(self):
+        self.timer.start(0)
+        return self
+
+    def run_slice(self):
+        deadline = time.perf_counter() + self.budget
+        progress = None
+        try:
+            while time.perf_counter() < deadline:
+                progress = next(self.steps)
+        except StopIteration:
+            self._finish(True)
+            return
+        except Exception as error:
+            self._finish(False)
+            QMessageBox.warning(self.parent(), "CountDowner", str(error))
+            return
+        if progress is not None:
+            self.dialog.setValue(int(progress * 1000))
+        self.timer.start(0)
+
+    def cancel(self):
+        if not self.done:
+            self.steps.close()
+            self._finish(False)
+
+    def _finish(self, ok):
+        self.done = True
+        self.timer.stop()
+        self.dialog.canceled.disconnect(self.cancel)
+        self.dialog.close()
+        self.finished.emit(ok)
+
+
+LIBRARY_FILTER = "Timer Libraries (*.json *.jsonl *.xml);;JSON (*.json);;JSON Lines (*.jsonl);;XML (*.xml)"
+ALARM_FILTER = "Sounds (*.mp3 *.wav);;All Files (*.*)"
+
+
 class MainWindow(QMainWindow):  #QMainWindow is the parent class
     def __init__(self):
         super().__init__()
@@ -605,88 +1073,401 @@ class MainWindow(QMainWindow):  #QMainWindow is the parent class
         layout.addWidget(self.label)
 
         # 1. Setup the List Widget with Context Menu Policy
-        self.timer_list = QListWidget()
+        # Every row has the same height, so the view never has to measure them all
+        self.timer_list = QListView()
+        self.timer_list.setUniformItemSizes(True)
         self.timer_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.timer_list.customContextMenuRequested.connect(self.show_context_menu)
         
-        self.timer_list.itemDoubleClicked.connect(self.load_timer)
+        self.timer_list.doubleClicked.connect(self.load_timer)
         layout.addWidget(self.timer_list)
 
         self.addButton = QPushButton("Create New Timer")
         self.addButton.clicked.connect(self.open_creator)
         layout.addWidget(self.addButton)
 
+        self.importButton = QPushButton("Import Timers...")
+        self.importButton.clicked.connect(lambda: self.import_presets())
+        layout.addWidget(self.importButton)
+        self.exportButton = QPushButton("Export Timers...")
+        self.exportButton.clicked.connect(lambda: self.export_presets())
+        layout.addWidget(self.exportButton)
+        self.job = None
+
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
 
         self.w = None
-        self.saved_presets = []
+
+        # The presets are loaded by load_presets() once the window is showing
+        self.store = None
+        self.saved_presets = None
+        self.preset_model = None
+        self.schedules = None
+
+    def load_presets(self):
+        """Loads the presets saved on disk from last time."""
+        from presets import PresetRegistry, PresetStore
+        # Only ids and names are read up front; a full preset is loaded when it is opened.
+        # List rows carry the preset id, so the UI rows and the data can't get out of step.
+        self.store = PresetStore(preset_db_path())
+        self.saved_presets = PresetRegistry(self.store.load_index())
+        self.preset_model = PresetListModel(self.saved_presets, self)
+        self.timer_list.setModel(self.preset_model)
+        self.load_schedules()
+
+    def load_schedules(self):
+        """Indexes the saved schedules; one timer then wakes for whichever fires next."""
+        from schedules import Schedule, ScheduleIndex
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.schedule_timer.timeout.connect(self.run_schedules)
+
+        def arm(delay_ms):
+            if delay_ms is None:
+                self.schedule_timer.stop()
+            else:
+                self.schedule_timer.start(delay_ms)
+
+        self.schedules = ScheduleIndex(arm, self.fire_schedule, self.expire_schedule)
+        loaded = []
+        for schedule_id, name, rule, alarm, created, last_fired in self.store.load_schedules():
+            try:
+                loaded.append(Schedule(schedule_id, name, rule, alarm, created, last_fired))
+            except ValueError as e:
+                print(f"Skipping schedule {rule!r} for {name}: {e}")
+        self.schedules.add_many(loaded)
+
+    def run_schedules(self):
+        fired = self.schedules.run_due()
+        if fired:
+            self.store.mark_fired([(schedule.id, schedule.last_fired) for schedule in fired])
+
+    def fire_schedule(self, schedule, now):
+        # The preset is looked up when the schedule fires, so it runs as last saved
+        preset = self.store.find(schedule.name)
+        if preset is None:
+            print(f"Schedule {schedule.rule_text!r}: no timer called {schedule.name} any more")
+            return
+        run_preset(preset, schedule.alarm)
+
+    def expire_schedule(self, schedule):
+        # A one-off that has rung (or was missed) is done with; it shouldn't pile up in the database
+        self.store.delete_schedules([schedule.id])
+
+    def add_schedule(self, name, rule, alarm=None):
+        """Makes the preset called `name` start itself by `rule` (see schedules.py); raises ValueError for a bad rule."""
+        from schedules import Schedule
+        if self.saved_presets.find(name) is None:
+            raise ValueError(f"there is no saved timer called {name!r}")
+        created = time.time()
+        schedule = Schedule(None, name, rule, alarm, created)
+        if schedule.rule.next_after(created) is None:
+            raise ValueError(f"{rule!r} has already passed")
+        schedule.id = self.store.add_schedule(name, rule, alarm, created)
+        self.schedules.add(schedule)
+        return schedule
+
+    def clear_schedules(self, name):
+        doomed = [schedule.id for schedule in self.schedules.named(name)]
+        self.store.delete_schedules(doomed)
+        for schedule_id in doomed:
+            self.schedules.remove(schedule_id)
+        return len(doomed)
+
+    def schedule_timer_dialog(self, index):
+        from schedules import RULE_HELP, parse_rule
+        name = index.data(Qt.ItemDataRole.DisplayRole)
+        rule, ok = QInputDialog.getText(self, f"Schedule {name}", f"Start {name} automatically:\n({RULE_HELP})")
+        if not ok or not rule.strip():
+            return
+        try:
+            parse_rule(rule)
+        except ValueError as e:
+            QMessageBox.warning(self, "Schedule", str(e))
+            return
+        # Presets don't keep an alarm (it is picked when a timer is run), so ask for one here
+        alarm, _ = QFileDialog.getOpenFileName(self, f"Alarm Sound for {name} (Cancel for none)", "", ALARM_FILTER)
+        try:
+            self.add_schedule(name, rule, alarm or None)
+        except ValueError as e:
+            QMessageBox.warning(self, "Schedule", str(e))
+
+    def run_command(self, command):
+        """Carries out one command sent by another `countdowner` invocation (see instance.py)."""
+        action = command.get('cmd')
+        if action == 'run':
+            name = command['name']
+            saved = self.saved_presets.find(name)
+            preset = self.store.get(saved['id']) if saved is not None else None
+            if preset is None:
+                # Laid out like a fresh Creator window
+                preset = Preset(name)
+            for key in ('h', 'm', 's'):
+                if command.get(key) is not None:
+                    setattr(preset, key, int(command[key]))
+            timer = run_preset(preset)
+            return {'name': timer.name, 'remaining': timer.countdown.remaining_seconds()}
+        if action == 'stop':
+            stopped = [timer for timer in tray_manager().windows() if timer.name == command['name']]
+            for timer in stopped:
+                timer.stop()
+            return {'stopped': len(stopped)}
+        if action == 'show':
+            self.showNormal()
+            self.raise_()
+            self.activateWindow()
+            return None
+        if action == 'list':
+            return [{'name': timer.name, 'remaining': timer.countdown.remaining_seconds()}
+                    for timer in tray_manager().windows()]
+        if action == 'schedule':
+            schedule = self.add_schedule(command['name'], command['rule'], command.get('alarm'))
+            return {'name': schedule.name, 'rule': schedule.rule_text, 'next': schedule.next_fire}
+        if action == 'stats':
+            report = instrumentation_report()
+            if report is None:
+                raise ValueError("instrumentation is off (start CountDowner with --instrument)")
+            return report
+        raise ValueError(f"unknown command {action!r}")
 
     def show_context_menu(self, position):
         """Triggered when the user right-clicks the list."""
-        item = self.timer_list.itemAt(position)
+        index = self.timer_list.indexAt(position)
         
-        if item:
+        if index.isValid():
             menu = QMenu()
             delete_action = QAction("Delete Timer", self)
             
-            # Using a lambda to pass the specific item to the delete function
-            delete_action.triggered.connect(lambda: self.delete_timer(item))
+            # Using a lambda to pass the specific row to the delete function
+            delete_action.triggered.connect(lambda: self.delete_timer(index))
             
             menu.addAction(delete_action)
+
+            schedule_action = QAction("Schedule...", self)
+            schedule_action.triggered.connect(lambda: self.schedule_timer_dialog(index))
+            menu.addAction(schedule_action)
+            scheduled = len(self.schedules.named(index.data(Qt.ItemDataRole.DisplayRole)))
+            if scheduled:
+                clear_action = QAction(f"Clear Schedules ({scheduled})", self)
+                clear_action.triggered.connect(lambda: self.clear_schedules(index.data(Qt.ItemDataRole.DisplayRole)))
+                menu.addAction(clear_action)
             # Display the menu at the cursor's position
             menu.exec(self.timer_list.mapToGlobal(position))
 
-    def delete_timer(self, item):
-        """Removes the timer from the UI and the data list."""
-        # Find which row was clicked
-        row = self.timer_list.row(item)
-        
-        # Remove from the QListWidget UI
-        self.timer_list.takeItem(row)
-        
-        # Remove from our saved_presets data list
-        if 0 <= row < len(self.saved_presets):
-            self.saved_presets.pop(row)
-            
-        print(f"Deleted timer at row {row}")
-
-    def add_saved_timer(self, data):
-        self.saved_presets.append(data)
-        display_text = f"{data['name']}"
-        self.timer_list.addItem(display_text)
-
-    def save_timer(self, data):
-        display_text = f"{data['name']}"
-        for i in range(self.timer_list.count()):
-            item = self.timer_list.item(i)
-            if(item.text() == display_text):
-                row = self.timer_list.row(item)
-                self.timer_list.takeItem(row)
-                if 0 <= row < len(self.saved_presets):
-                    self.saved_presets.pop(row)
-        self.saved_presets.append(data)
-        self.timer_list.addItem(display_text)
-
+    def delete_timer(self, index):
+        """Removes the timer from the UI, the data and the store."""
+        preset_id = index.data(Qt.ItemDataRole.UserRole)
+        removed = self.saved_presets.remove(preset_id)
+        self.store.delete(preset_id)
+        self.preset_model.remove(preset_id)
+        if not self.saved_presets.ids_named(removed['name']):
+            # Nothing left for its schedules to start
+            self.clear_schedules(removed['name'])
+        print(f"Deleted timer {removed['name']}")
+
+    def add_saved_timer(self, preset):
+        self.store.add(preset)
+        self.saved_presets.add({'id': preset.id, 'name': preset.name})
+        self.preset_model.append(preset.id)
+
+    def save_timer(self, preset):
+        # Any preset with the same name is replaced by the edited one
+        replaced_ids = self.saved_presets.ids_named(preset.name)
+        self.store.replace(replaced_ids, preset)
+        self.saved_presets.upsert({'id': preset.id, 'name': preset.name})
+        for preset_id in replaced_ids:
+            self.preset_model.remove(preset_id)
+        self.preset_model.append(preset.id)
+
+    def import_presets(self, path=None):
+        """Adds the presets from a shared library file, a batch at a time."""
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Import Timers", "", LIBRARY_FILTER)
+            if not path:
+                return None
+        from library import PresetReader
+        reader = PresetReader(path)
+        job = self._run_job(self._import_steps(reader), f"Importing {os.path.basename(path)}...")
+        job.finished.connect(lambda ok: reader.close())
+        return job
+
+    def _import_steps(self, reader, batch_size=500):
+        # One step per preset read, so a slice can stop anywhere; they are saved 500 at a time
+        batch = []
+        for preset in reader:
+            batch.append(preset)
+            if len(batch) >= batch_size:
+                self._add_imported(batch)
+                batch = []
+            yield reader.progress()
+        self._add_imported(batch)
+        print(f"Imported {reader.count} timers from {reader.path}")
+
+    def _add_imported(self, batch):
+        # Like save_timer, an imported preset replaces any saved one with the same name
+        latest = {}
+        for preset in batch:
+            latest.pop(preset.name, None)
+            latest[preset.name] = preset
+        replacements = [(self.saved_presets.ids_named(preset.name), preset) for preset in latest.values()]
+        self.store.replace_many(replacements)
+        replaced_ids = []
+        for old_ids, preset in replacements:
+            self.saved_presets.upsert({'id': preset.id, 'name': preset.name})
+            replaced_ids += old_ids
+        self.preset_model.remove_many(replaced_ids)
+        self.preset_model.extend([preset.id for _, preset in replacements])
+
+    def export_presets(self, path=None):
+        """Writes every saved preset to a library file others can import."""
+        if path is None:
+            path, _ = QFileDialog.getSaveFileName(self, "Export Timers", "timers.json", LIBRARY_FILTER)
+            if not path:
+                return None
+        from library import export_presets
+        steps = export_presets(path, self.store.iter_rows(), len(self.saved_presets))
+        return self._run_job(steps, f"Exporting to {os.path.basename(path)}...")
+
+    def _run_job(self, steps, label):
+        # The window keeps repainting during the job, but the list can't be edited under it
+        self.centralWidget().setEnabled(False)
+        self.job = SlicedJob(steps, label, self)
+        self.job.finished.connect(lambda ok: self.centralWidget().setEnabled(True))
+        return self.job.start()
 
     def open_creator(self):
         self.w = CreatorWindow(self)
         self.w.show()
 
-    def load_timer(self, item):
-        row = self.timer_list.row(item)
-        if 0 <= row < len(self.saved_presets):
-            preset_data = self.saved_presets[row]
-            self.w = CreatorEditWindow(self, item.text(), preset_data)
+    def load_timer(self, index):
+        preset = self.store.get(index.data(Qt.ItemDataRole.UserRole))
+        if preset is not None:
+            self.w = editor_windows.acquire(self, preset.name, preset)
             self.w.show()
 
-        
-
 
-app = QApplication([]) # window variable goes after this
+class StartupProfile(QObject):
+    """Records how long each stage of startup takes, for --profile-startup.
 
-window = MainWindow()
-window.show() #crucial
-
-app.exec()  # window variable goes before this
+    Times are milliseconds since the interpreter started running this script.
+    The first paint is taken from the main window's first Paint event.
+    """
+    def __init__(self, started=_process_started):
+        super().__init__()
+        self.started = started
+        self.marks = {}
+        self.painted = False
+
+    def mark(self, stage):
+        self.marks[stage] = round((time.perf_counter() - self.started) * 1000, 2)
+
+    def watch(self, window):
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and not self.painted:
+            self.painted = True
+            self.mark("first_paint")
+            obj.removeEventFilter(self)
+        return False
+
+    def report(self):
+        report = dict(self.marks)
+        report["modules"] = len(sys.modules)
+        return report
+
+    def write(self):
+        text = json.dumps(self.report(), indent=2)
+        # A windowed (frozen) build has no console to print to
+        if sys.stdout is not None:
+            print(text)
+        else:
+            folder = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, "startup-profile.json"), "w") as f:
+                f.write(text)
+
+    def finish(self, app, attempts=50):
+        """Writes the report and quits once the window has painted (giving up after ~0.5 s)."""
+        if not self.painted and attempts > 0:
+            QTimer.singleShot(10, lambda: self.finish(app, attempts - 1))
+            return
+        self.write()
+        app.quit()
+
+
+def main(argv=None, command_line=None):
+    parser = argparse.ArgumentParser(prog="countdowner")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long startup took (imports, first paint, presets) and quit")
+    parser.add_argument("--broadcast", type=int, nargs="?", const=8765, metavar="PORT",
+                        help="serve the running timers to browser overlays on PORT (default 8765)")
+    parser.add_argument("--broadcast-host", default="127.0.0.1",
+                        help="address to serve overlays on (0.0.0.0 for other machines on the network)")
+    parser.add_argument("--instrument", nargs="?", const="", metavar="FILE",
+                        help="measure how late timer ticks run and log GUI stalls; "
+                             "`countdowner stats` shows the numbers, and FILE gets them as JSON on exit")
+    parser.add_argument("--stall-ms", type=int, default=100,
+                        help="with --instrument, log the GUI thread when it is stuck this long (default 100)")
+    # `countdowner run ...` etc. when no instance was running to take them
+    # (already parsed by the handoff when there is one: stdin can't be read twice)
+    if command_line is None:
+        command_line = instance.parse_commands(sys.argv[1:] if argv is None else argv)
+    commands, rest = command_line
+    # Anything we don't know about is left for Qt (-platform, -style, ...)
+    args, qt_args = parser.parse_known_args(rest)
+
+    profile = StartupProfile() if args.profile_startup else None
+    if profile:
+        profile.mark("imports")
+
+    app = QApplication([sys.argv[0]] + qt_args) # window variable goes after this
+    app.setApplicationName("CountDowner")
+    if profile:
+        profile.mark("qapplication")
+
+    window = MainWindow()
+    if profile:
+        profile.mark("main_window")
+        profile.watch(window)
+    window.show() #crucial
+    # Get the (empty) window painted before the saved presets are read
+    app.processEvents()
+
+    def load_presets():
+        if not profile:
+            # Before any timer starts, so every tick is counted
+            if args.instrument is not None:
+                start_instrumentation(args.stall_ms)
+                if args.instrument:
+                    app.aboutToQuit.connect(lambda: write_instrumentation(args.instrument))
+            if args.broadcast is not None:
+                start_broadcast(args.broadcast, args.broadcast_host)
+            # Timers that were running last time come back before anything else can start one
+            restore_timers()
+            app.aboutToQuit.connect(timer_checkpoint().flush)
+        window.load_presets()
+        if profile:
+            profile.mark("presets_loaded")
+            profile.finish(app)
+            return
+
+        # From now on later launches hand their command lines to this instance
+        window.instance_server = instance.InstanceServer(window.run_command)
+        if not window.instance_server.listen():
+            print(f"Could not listen on {window.instance_server.name}; other launches will start their own instance")
+        for command in commands:
+            reply = window.instance_server.execute(command)
+            if not reply['ok']:
+                print(f"countdowner: {reply['error']}", file=sys.stderr)
+
+    QTimer.singleShot(0, load_presets)
+
+    return app.exec()  # window variable goes before this
+
+
+if __name__ == "__main__":
+    sys.exit(main(command_line=_command_line))
@@ -0,0 +1,123 @@
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QColor, QFontMetricsF, QPainter, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+
+class GlyphAtlas:
+    """The digits 0-9 pre-rendered side by side into one pixmap, in fixed-width cells."""
+    def __init__(self, font, color, dpr=1.0):
+        metrics = QFontMetricsF(font)
+        self.cell_width = max(metrics.horizontalAdvance(str(digit)) for digit in range(10))
+        self.cell_height = metrics.height()
+
+        self.pixmap = QPixmap(int(self.cell_width * 10 * dpr) + 1, int(self.cell_height * dpr) + 1)
+        self.pixmap.setDevicePixelRatio(dpr)
+        self.pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        for digit in range(10):
+            cell = QRectF(digit * self.cell_width, 0, self.cell_width, self.cell_height)
+            painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, str(digit))
+        painter.end()
+
+    def source(self, digit):
+        return QRectF(digit * self.cell_width, 0, self.cell_width, self.cell_height)
+
+
+_atlases = OrderedDict()
+ATLAS_CACHE_SIZE = 64
+
+def glyph_atlas(font, color, dpr=1.0):
+    """Returns the shared atlas for this font / colour / pixel ratio, building it on first use."""
+    key = (font.key(), color, dpr)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(font, color, dpr)
+        _atlases[key] = atlas
+        if len(_atlases) > ATLAS_CACHE_SIZE:
+            _atlases.popitem(last=False)
+    else:
+        _atlases.move_to_end(key)
+    return atlas
+
+
+class DigitDisplay(QWidget):
+    """Shows a zero-padded number by copying digit cells out of a cached glyph atlas.
+
+    setValue() only invalidates the cells whose digit actually changed, so a
+    tick that moves the seconds from 41 to 40 repaints one small cell instead
+    of the whole label. Time spent painting is kept in paint_ns / paints.
+    """
+    def __init__(self, value=0, color="white", parent=None):
+        super().__init__(parent)
+        self.color = color
+        self.digits = f"{value:02}"
+        self.atlas = None
+        self.paint_ns = 0
+        self.paints = 0
+
+    def setValue(self, value):
+        text = f"{value:02}"
+        if text == self.digits:
+            return
+        old = self.digits
+        self.digits = text
+        if len(old) != len(text):
+            self.update()
+            return
+        for i, (before, after) in enumerate(zip(old, text)):
+            if before != after:
+                self.update(self.cell_rect(i))
+
+    def value(self):
+        return int(self.digits)
+
+    def text(self):
+        return self.digits
+
+    def setColor(self, color):
+        if color != self.color:
+            self.color = color
+            self.atlas = None
+            self.update()
+
+    def changeEvent(self, event):
+        # A new font (or screen) means a different atlas
+        self.atlas = None
+        super().changeEvent(event)
+
+    def current_atlas(self):
+        if self.atlas is None:
+            self.atlas = glyph_atlas(self.font(), self.color, self.devicePixelRatioF())
+        return self.atlas
+
+    def cell_rect(self, index):
+        atlas = self.current_atlas()
+        top = (self.height() - atlas.cell_height) / 2
+        return QRectF(index * atlas.cell_width, top, atlas.cell_width, atlas.cell_height).toAlignedRect()
+
+    def paintEvent(self, event):
+        start = time.perf_counter_ns()
+        atlas = self.current_atlas()
+        dirty = event.rect()
+        painter = QPainter(self)
+        top = (self.height() - atlas.cell_height) / 2
+        for i, char in enumerate(self.digits):
+            target = QRectF(i * atlas.cell_width, top, atlas.cell_width, atlas.cell_height)
+            if dirty.intersects(target.toAlignedRect()):
+                painter.drawPixmap(target, atlas.pixmap, self._pixmap_source(atlas, int(char)))
+        painter.end()
+        self.paint_ns += time.perf_counter_ns() - start
+        self.paints += 1
+
+    def _pixmap_source(self, atlas, digit):
+        # drawPixmap's source rect is in device pixels
+        dpr = atlas.pixmap.devicePixelRatio()
+        source = atlas.source(digit)
+        return QRectF(source.x() * dpr, source.y() * dpr, source.width() * dpr, source.height() * dpr)
@@ -0,0 +1,384 @@
+import bisect
+import math
+import os
+import time
+from collections import OrderedDict
+
+from PyQt6 import sip
+from PyQt6.QtCore import QEvent, QObject, QRunnable, QSize, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+
+
+def is_on_screen(widget, check_exposed=False):
+    """False for widgets that are hidden, in a minimized window or (optionally) fully covered."""
+    if not widget.isVisible() or widget.window().isMinimized():
+        return False
+    if check_exposed:
+        handle = widget.window().windowHandle()
+        return handle is None or handle.isExposed()
+    return True
+
+
+class PixmapCache:
+    """Shared cache of background pixmaps, pre-scaled to the size they are shown at.
+
+    Entries are keyed by (path, mtime, width, height), so every window showing
+    the same image at the same size shares one pixmap, and an image edited on
+    disk is picked up again. Images are decoded straight to the target size
+    with QImageReader, so the full-resolution original is never kept around.
+    Least recently used entries are evicted once `budget_bytes` is exceeded.
+    """
+    def __init__(self, budget_bytes=128 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._pixmaps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    def get(self, path, size):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        key = (path, mtime, size.width(), size.height())
+
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        pixmap = self._load(path, size)
+        self._pixmaps[key] = pixmap
+        self.used_bytes += self._cost(pixmap)
+        self._evict()
+        return pixmap
+
+    def stats(self):
+        return {
+            'entries': len(self._pixmaps),
+            'bytes': self.used_bytes,
+            'budget_bytes': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def clear(self):
+        self._pixmaps.clear()
+        self.used_bytes = 0
+
+    def _load(self, path, size):
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        if size.width() > 0 and size.height() > 0:
+            reader.setScaledSize(size)
+        image = reader.read()
+        if image.isNull():
+            print(f"Could not load background {path}: {reader.errorString()}")
+            return QPixmap()
+        return QPixmap.fromImage(image)
+
+    def _cost(self, pixmap):
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth()) // 8
+
+    def _evict(self):
+        # Always keep the entry just added, even if it is bigger than the whole budget
+        while self.used_bytes > self.budget_bytes and len(self._pixmaps) > 1:
+            key, pixmap = self._pixmaps.popitem(last=False)
+            self.used_bytes -= self._cost(pixmap)
+            self.evictions += 1
+
+
+_pixmap_cache = None
+
+def pixmap_cache():
+    """Returns the application-wide PixmapCache."""
+    global _pixmap_cache
+    if _pixmap_cache is None:
+        _pixmap_cache = PixmapCache()
+    return _pixmap_cache
+
+
+class _GifDecodeSignals(QObject):
+    decoded = pyqtSignal(object, object, object)     # key, images, delays
+
+
+class _GifDecodeJob(QRunnable):
+    """Decodes every frame of a GIF at the target size, off the GUI thread.
+
+    If the frames would not fit in `max_bytes`, they are first decoded
+    smaller (down to `min_scale` of the size; the label scales them back up
+    when it paints), and only if that is not enough are frames left out -
+    just enough of them, spread evenly, with each dropped frame's delay
+    added to the one before it. So a GIF a little over the cap keeps every
+    frame, and a long one plays at a lower frame rate instead of blowing it.
+    """
+    def __init__(self, key, path, size, max_bytes, signals, min_scale=0.5):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.size = size
+        self.max_bytes = max_bytes
+        self.signals = signals
+        self.min_scale = min_scale
+
+    def run(self):
+        reader = QImageReader(self.path)
+        count = reader.imageCount()         # 0 if the reader can't tell up front
+        size = self.size
+        if count > 0 and count * _frame_bytes(size) > self.max_bytes:
+            scale = max(self.min_scale, math.sqrt(self.max_bytes / (count * _frame_bytes(size))))
+            size = QSize(max(1, int(size.width() * scale)), max(1, int(size.height() * scale)))
+        if size.width() > 0 and size.height() > 0:
+            reader.setScaledSize(size)
+        max_frames = max(1, self.max_bytes // _frame_bytes(size))
+        # Frame i is kept when it starts a new one of max_frames equal slices of the GIF
+        thin = count > max_frames
+
+        images, delays = [], []
+        stride = 1
+        index = 0
+        while reader.canRead():
+            image = reader.read()
+            if image.isNull():
+                break
+            # Same rule browsers use: tiny delays mean "as fast as reasonable", not 0 ms
+            delay = reader.nextImageDelay()
+            delay = 100 if delay <= 10 else delay
+            if thin:
+                keep = index == 0 or index * max_frames // count != (index - 1) * max_frames // count
+            else:
+                keep = index % stride == 0
+            if keep or not images:
+                images.append(image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied))
+                delays.append(delay)
+            else:
+                delays[-1] += delay
+            index += 1
+
+            if len(images) > max_frames:
+                # Only when the frame count wasn't known: halve what we have and carry on
+                images = images[::2]
+                delays = [sum(delays[i:i + 2]) for i in range(0, len(delays), 2)]
+                stride *= 2
+
+        self.signals.decoded.emit(self.key, images, delays)
+
+
+def _frame_bytes(size):
+    return max(1, size.width() * size.height() * 4)
+
+
+class GifAnimation(QObject):
+    """One decoded GIF at one size, shared by every label that shows it.
+
+    It only runs while at least one of its labels is visible. Each step shows
+    the frame that belongs to the current time, so when the GUI thread falls
+    behind frames are skipped rather than the animation slowing down.
+    """
+    def __init__(self, key, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.frames = []
+        self.offsets = []           # Start time of each frame within one loop (ms)
+        self.cycle_ms = 0
+        self.labels = {}            # id(label) -> label
+        self.current = -1
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.started_at = time.monotonic()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.advance)
+
+    def cost(self):
+        return sum(frame.width() * frame.height() * 4 for frame in self.frames)
+
+    def set_frames(self, images, delays):
+        self.frames = [QPixmap.fromImage(image) for image in images]
+        self.offsets = []
+        total = 0
+        for delay in delays:
+            self.offsets.append(total)
+            total += delay
+        self.cycle_ms = total
+        self.current = -1
+        self.update_running()
+
+    def add(self, label):
+        self.labels[id(label)] = label
+        if self.current >= 0:
+            label.setPixmap(self.frames[self.current])
+        self.update_running()
+
+    def remove(self, label_id):
+        self.labels.pop(label_id, None)
+        self.update_running()
+
+    def visible_labels(self):
+        return [label for label in self.labels.values() if is_on_screen(label)]
+
+    def update_running(self):
+        if not self.frames:
+            return
+        if self.visible_labels():
+            if not self.timer.isActive():
+                self.advance()
+        else:
+            self.timer.stop()
+
+    def advance(self):
+        visible = self.visible_labels()
+        if not visible:
+            return
+
+        elapsed = (time.monotonic() - self.started_at) * 1000
+        if self.cycle_ms > 0:
+            elapsed %= self.cycle_ms
+        frame = max(0, bisect.bisect_right(self.offsets, elapsed) - 1)
+
+        if frame != self.current:
+            if self.current >= 0:
+                self.frames_dropped += (frame - self.current - 1) % len(self.frames)
+            self.current = frame
+            self.frames_shown += 1
+            for label in visible:
+                label.setPixmap(self.frames[frame])
+
+        if len(self.frames) > 1:
+            next_offset = self.offsets[frame + 1] if frame + 1 < len(self.offsets) else self.cycle_ms
+            self.timer.start(max(1, int(next_offset - elapsed)))
+
+
+class GifEngine(QObject):
+    """Decodes each animated GIF background once and shares it between windows.
+
+    Decoding happens on a small thread pool at the size the GIF is shown at.
+    Decoded frames count against `budget_bytes`; GIFs that no window is using
+    any more are dropped (least recently used first) when it is exceeded, and a
+    single GIF never gets more than `per_gif_bytes` (see _GifDecodeJob).
+    Animations pause while none of their labels are visible.
+    """
+    def __init__(self, budget_bytes=96 * 1024 * 1024, per_gif_bytes=32 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.budget_bytes = budget_bytes
+        self.per_gif_bytes = per_gif_bytes
+        self.animations = OrderedDict()     # key -> GifAnimation
+        self.label_keys = {}                # id(label) -> key
+        self.watched = set()                # ids of labels carrying our event filter
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self.signals = _GifDecodeSignals(self)
+        self.signals.decoded.connect(self._on_decoded)
+
+    def attach(self, label, path):
+        """Plays the GIF at `path` on `label`, sized to the label."""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        key = (path, mtime, label.width(), label.height())
+
+        label_id = id(label)
+        if self.label_keys.get(label_id) == key:
+            return
+        self.detach(label)
+        if label_id not in self.watched:
+            self.watched.add(label_id)
+            label.installEventFilter(self)
+            label.destroyed.connect(lambda obj=None, label_id=label_id: self._forget(label_id, destroyed=True))
+
+        animation = self.animations.get(key)
+        if animation is None:
+            animation = GifAnimation(key, self)
+            self.animations[key] = animation
+            self.pool.start(_GifDecodeJob(key, path, label.size(), self.per_gif_bytes, self.signals))
+        self.animations.move_to_end(key)
+        self.label_keys[label_id] = key
+        animation.add(label)
+
+    def detach(self, label):
+        self._forget(id(label))
+
+    def stats(self):
+        return {
+            'gifs': len(self.animations),
+            'labels': len(self.label_keys),
+            'bytes': self.used_bytes(),
+            'budget_bytes': self.budget_bytes,
+            'frames_dropped': sum(a.frames_dropped for a in self.animations.values()),
+        }
+
+    def used_bytes(self):
+        return sum(animation.cost() for animation in self.animations.values())
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.Show, QEvent.Type.Hide):
+            key = self.label_keys.get(id(obj))
+            animation = self.animations.get(key)
+            if animation is not None:
+                # Hidden (or minimized) labels pause their GIF; showing one resumes it
+                QTimer.singleShot(0, animation.update_running)
+        return False
+
+    def _forget(self, label_id, destroyed=False):
+        if destroyed:
+            self.watched.discard(label_id)
+        key = self.label_keys.pop(label_id, None)
+        animation = self.animations.get(key)
+        # At shutdown the animations may already be gone by the time their labels are
+        if animation is not None and not sip.isdeleted(animation):
+            animation.remove(label_id)
+
+    def _on_decoded(self, key, images, delays):
+        animation = self.animations.get(key)
+        if animation is None:
+            return
+        animation.set_frames(images, delays)
+        self._evict()
+
+    def _evict(self):
+        used = self.used_bytes()
+        for key in list(self.animations):
+            if used <= self.budget_bytes:
+                break
+            animation = self.animations[key]
+            if animation.labels:
+                continue
+            used -= animation.cost()
+            del self.animations[key]
+            animation.timer.stop()
+            animation.deleteLater()
+
+
+_gif_engine = None
+
+def gif_engine():
+    """Returns the application-wide GifEngine."""
+    global _gif_engine
+    if _gif_engine is None:
+        _gif_engine = GifEngine()
+    return _gif_engine
+
+
+def show_background(label, path):
+    """Shows the image or animated GIF at `path` on `label`, sized to the label."""
+    if path.lower().endswith(".gif"):
+        # Handle Animated GIF - decoded once, off the GUI thread, and shared
+        gif_engine().attach(label, path)
+    else:
+        # Handle Static Image - already scaled to the label, so painting never rescales it
+        gif_engine().detach(label)
+        label.setPixmap(pixmap_cache().get(path, label.size()))
+
+
+def clear_background(label):
+    """Removes whatever background `label` was showing."""
+    gif_engine().detach(label)
+    label.clear()
@@ -0,0 +1,264 @@
+import json
+import os
+import sys
+
+
+# The protocol is one JSON object per line. A client sends a batch of commands,
+# the running instance answers each one with a {"ok": ..., "result"/"error": ...}
+# line, in order. Commands:
+#   {"cmd": "run", "name": "Tea", "h": 0, "m": 5, "s": 0}    h/m/s override the preset
+#   {"cmd": "stop", "name": "Tea"}
+#   {"cmd": "show"}
+#   {"cmd": "list"}
+#   {"cmd": "schedule", "name": "Bell", "rule": "weekdays 08:00"}    see schedules.py for rules
+#   {"cmd": "stats"}                                         only with --instrument
+COMMANDS = ('run', 'stop', 'show', 'list', 'schedule', 'stats', 'batch')
+
+
+def server_name():
+    """Address of the running CountDowner (one per user).
+
+    On Unix this is a socket path, so a client can reach it with the plain
+    socket module without loading Qt at all; on Windows it is a pipe name.
+    The socket goes in the user's private runtime folder when there is one,
+    where no other user can create it first; shared /tmp is the fallback.
+    """
+    user = os.environ.get("USER") or os.environ.get("USERNAME") or "user"
+    name = f"CountDowner-{user}"
+    if os.name == "posix":
+        runtime = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime and os.path.isdir(runtime):
+            return os.path.join(runtime, "CountDowner")
+        return os.path.join(os.environ.get("TMPDIR", "/tmp"), name)
+    return name
+
+
+def build_parser():
+    import argparse
+    parser = argparse.ArgumentParser(prog="countdowner")
+    commands = parser.add_subparsers(dest="cmd", required=True)
+
+    run = commands.add_parser("run", help="start a timer (a saved preset if one has this name)")
+    run.add_argument("name")
+    run.add_argument("--h", type=int, help="hours")
+    run.add_argument("--m", type=int, help="minutes")
+    run.add_argument("--s", type=int, help="seconds")
+
+    stop = commands.add_parser("stop", help="stop every running timer with this name")
+    stop.add_argument("name")
+
+    commands.add_parser("show", help="bring the main window to the front")
+    commands.add_parser("list", help="list the running timers")
+
+    schedule = commands.add_parser("schedule", help="start a saved timer automatically (e.g. 'weekdays 08:00', 'every 45m')")
+    schedule.add_argument("name")
+    schedule.add_argument("rule")
+    schedule.add_argument("--alarm", help="sound to play when it finishes")
+
+    commands.add_parser("stats", help="print tick latency and GUI stall numbers (needs --instrument)")
+
+    batch = commands.add_parser("batch", help="send the JSON commands in FILE (one per line, - for stdin)")
+    batch.add_argument("file")
+    return parser
+
+
+def parse_commands(argv):
+    """Splits the command line into (commands, other_args).
+
+    Only a command line starting with one of COMMANDS is parsed here;
+    anything else (Qt's own -platform etc.) is handed back untouched.
+    """
+    if not argv or argv[0] not in COMMANDS:
+        return [], list(argv)
+    args = build_parser().parse_args(argv)
+    if args.cmd == "batch":
+        if args.file == "-":
+            # stdin stays open: it isn't ours to close
+            return _read_commands(sys.stdin), []
+        try:
+            lines = open(args.file)
+        except OSError as e:
+            build_parser().error(f"can't read {args.file}: {e.strerror}")
+        with lines:
+            return _read_commands(lines), []
+    command = {key: value for key, value in vars(args).items() if value is not None}
+    return [command], []
+
+
+def _read_commands(lines):
+    return [_read_command(line, number) for number, line in enumerate(lines, 1) if line.strip()]
+
+
+def _read_command(line, number):
+    # A line that isn't JSON becomes an "invalid" command, so it gets an error
+    # reply in its place and the rest of the batch still runs
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return {'cmd': 'invalid', 'error': f"line {number}: bad command: {e}"}
+
+
+def _read_reply(line):
+    try:
+        reply = json.loads(line)
+    except ValueError as e:
+        return {'ok': False, 'error': f"garbled reply from the running CountDowner: {e}"}
+    if not isinstance(reply, dict):
+        return {'ok': False, 'error': "garbled reply from the running CountDowner"}
+    return reply
+
+
+def encode(commands):
+    return b"".join(json.dumps(command, separators=(',', ':')).encode() + b"\n" for command in commands)
+
+
+def send(commands, name=None, timeout=2.0):
+    """Sends a batch of commands to the running instance.
+
+    Returns its replies, or None when no instance is listening.
+    """
+    name = name or server_name()
+    if os.name == "posix":
+        return _send_unix(commands, name, timeout)
+    return _send_qt(commands, name, timeout)
+
+
+def _send_unix(commands, name, timeout):
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(name)
+    except OSError:
+        sock.close()
+        return None
+    with sock:
+        sock.sendall(encode(commands))
+        replies = []
+        buffer = b""
+        while len(replies) < len(commands):
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                break
+            if not chunk:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            replies.extend(_read_reply(line) for line in lines if line.strip())
+    return replies
+
+
+def _send_qt(commands, name, timeout):
+    from PyQt6.QtNetwork import QLocalSocket
+    sock = QLocalSocket()
+    sock.connectToServer(name)
+    timeout_ms = int(timeout * 1000)
+    if not sock.waitForConnected(timeout_ms):
+        return None
+    sock.write(encode(commands))
+    sock.flush()
+    replies = []
+    while len(replies) < len(commands):
+        if not sock.canReadLine() and not sock.waitForReadyRead(timeout_ms):
+            break
+        while sock.canReadLine():
+            line = bytes(sock.readLine()).strip()
+            if line:
+                replies.append(_read_reply(line))
+    sock.disconnectFromServer()
+    return replies
+
+
+def handoff(commands):
+    """Passes the commands from parse_commands on to a running CountDowner, if there is one.
+
+    A plain launch (no commands) just brings the running instance's window
+    to the front. Returns the exit code for this process, or None when
+    nothing is running and this process should start the app itself with
+    the same commands - a batch from stdin can only be read once.
+    """
+    replies = send(commands or [{'cmd': 'show'}])
+    if replies is None:
+        return None
+    failed = False
+    for reply in replies:
+        if reply.get('ok'):
+            if reply.get('result') is not None:
+                print(json.dumps(reply['result']))
+        else:
+            failed = True
+            print(f"countdowner: {reply.get('error')}", file=sys.stderr)
+    return 1 if failed or len(replies) < len(commands) else 0
+
+
+class InstanceServer:
+    """Listens for commands from later `countdowner` invocations.
+
+    `handler(command)` carries out one command dict and returns something
+    JSON-able; an exception becomes an error reply. The commands of a batch
+    are run in the order they were sent.
+    """
+    def __init__(self, handler, name=None):
+        from PyQt6.QtNetwork import QLocalServer
+        self.handler = handler
+        self.name = name or server_name()
+        self.server = QLocalServer()
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._on_connection)
+        self.sockets = set()    # Open connections; without a reference their slots can be collected
+        self.handled = 0
+
+    def listen(self):
+        from PyQt6.QtNetwork import QLocalServer
+        if self.server.listen(self.name):
+            return True
+        # Nobody answered on this name (we only get here when send() failed),
+        # so it is a socket file left behind by an instance that crashed
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def close(self):
+        self.server.close()
+
+    def execute(self, command):
+        try:
+            if not isinstance(command, dict):
+                raise ValueError("a command must be a JSON object")
+            if command.get('cmd') == 'invalid':
+                raise ValueError(command.get('error', "invalid command"))
+            result = self.handler(command)
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+        self.handled += 1
+        return {'ok': True, 'result': result}
+
+    def _on_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self.sockets.add(sock)
+            sock.readyRead.connect(lambda sock=sock: self._read(sock))
+            sock.disconnected.connect(lambda sock=sock: self._disconnected(sock))
+            # The whole batch may have arrived before we connected to readyRead
+            if sock.bytesAvailable():
+                self._read(sock)
+
+    def _disconnected(self, sock):
+        self.sockets.discard(sock)
+        sock.deleteLater()
+
+    def _read(self, sock):
+        replies = []
+        while sock.canReadLine():
+            line = bytes(sock.readLine()).strip()
+            if not line:
+                continue
+            try:
+                command = json.loads(line)
+            except ValueError as e:
+                replies.append({'ok': False, 'error': f"bad command: {e}"})
+                continue
+            replies.append(self.execute(command))
+        if replies:
+            sock.write(encode(replies))
+            sock.flush()
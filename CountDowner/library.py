@@ -0,0 +1,249 @@
+import codecs
+import json
+import os
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator
+
+from presets import DIGITS, Preset
+
+
+# Preset libraries shared between machines. Both formats are read and written
+# one preset at a time, so a 100k-preset file never has to fit in memory.
+#
+# JSON:  {"format": "countdowner-presets", "version": 1, "presets": [
+#        {...one preset per line, same keys as the database...},
+#        ]}
+#        A .jsonl file (one preset object per line) is read as well.
+#
+# XML:   <countdowner-presets version="1">
+#          <preset name="Tea" h="0" m="5" s="0" width="900" height="800" background="...">
+#            <digit which="h" x="50" y="100" width="51" height="23" color="white"
+#                   family="Sans Serif" size="9.0" weight="400" italic="0"/>  (x3)
+#          </preset>
+#        </countdowner-presets>
+FORMAT = "countdowner-presets"
+VERSION = 1
+CHUNK_SIZE = 64 * 1024
+TRUNCATION_MARGIN = 12          # Longest token that can be cut short: a \uXXXX\uXXXX surrogate pair
+MAX_RECORD = 1024 * 1024        # A preset is a few hundred bytes; anything this long is not one
+
+
+def library_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xml":
+        return "xml"
+    if ext == ".jsonl":
+        return "jsonl"
+    return "json"
+
+
+class PresetReader:
+    """Streams Presets out of an exported library file.
+
+    Iterate over it for the presets; progress() says how far through the
+    file it has got (0.0 - 1.0), for progress bars.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.format = library_format(path)
+        self.size = max(1, os.path.getsize(path))
+        self.file = open(path, "rb")
+        self.count = 0
+
+    def __iter__(self):
+        if self.format == "xml":
+            records = _iter_xml(self.file)
+        elif self.format == "jsonl":
+            records = _iter_json_lines(self.file)
+        else:
+            records = _iter_json_array(self.file)
+        for index, record in enumerate(records):
+            try:
+                preset = Preset.from_record(record)
+            except (ValueError, TypeError) as e:
+                # Caught here, not when the bad row is first shown after it was saved
+                raise ValueError(f"preset {index}: {e}") from None
+            self.count += 1
+            yield preset
+
+    def progress(self):
+        if self.file.closed:
+            return 1.0
+        return min(1.0, self.file.tell() / self.size)
+
+    def close(self):
+        self.file.close()
+
+
+def _iter_json_lines(f):
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _iter_json_array(f):
+    """Yields the objects of the first JSON array in `f`, decoding a chunk at a time."""
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    offset = 0          # Byte offset of buffer[0] in the file, for error messages
+    started = False
+    pos = 0
+    index = 0
+    while True:
+        if not started:
+            start = buffer.find("[")
+            if start != -1:
+                started = True
+                pos = start + 1
+                continue
+        else:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer):
+                if buffer[pos] == "]":
+                    return
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # Only an object cut off by the end of the buffer continues in the next
+                    # chunk; anything else is a broken record, and reading on can't fix it
+                    if not _truncated(e, buffer) or len(buffer) - pos > MAX_RECORD:
+                        where = offset + len(buffer[:e.pos].encode("utf-8"))
+                        raise ValueError(f"preset {index} is not valid JSON (byte {where}): {e.msg}") from None
+                else:
+                    index += 1
+                    yield record
+                    continue
+
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            if started:
+                raise ValueError(f"the preset list ends before its closing ] (after preset {index})")
+            raise ValueError("no preset list found")
+        offset += len(buffer[:pos].encode("utf-8"))
+        buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+
+
+def _truncated(error, buffer):
+    # The decoder gives up at (or a few characters before, for a cut-off "true" or
+    # \uXXXX escape) the end of the text - except for a string with no closing quote,
+    # which it reports where the string starts
+    return error.pos >= len(buffer) - TRUNCATION_MARGIN or error.msg.startswith("Unterminated string")
+
+
+def _iter_xml(f):
+    root = None
+    for event, element in ET.iterparse(f, events=("start", "end")):
+        if root is None:
+            root = element
+        elif event == "end" and element.tag == "preset":
+            yield _record_from_xml(element)
+            # Drop the finished element so memory stays flat however long the file is
+            root.clear()
+
+
+def _record_from_xml(element):
+    record = {
+        'name': element.get("name", ""),
+        'h': int(element.get("h", 0)),
+        'm': int(element.get("m", 0)),
+        's': int(element.get("s", 0)),
+        'background': element.get("background"),
+        'size': (int(element.get("width", 900)), int(element.get("height", 800))),
+    }
+    for digit in element.iter("digit"):
+        which = digit.get("which")
+        if which not in DIGITS:
+            continue
+        record[f'pos_{which}'] = (int(digit.get("x", 0)), int(digit.get("y", 0)))
+        record[f'size_{which}'] = (int(digit.get("width", 51)), int(digit.get("height", 23)))
+        record[f'{which}_color'] = digit.get("color", "white")
+        if digit.get("family") is not None:
+            record[f'{which}_font'] = (digit.get("family"), float(digit.get("size", -1)),
+                                       int(digit.get("weight", 400)), digit.get("italic") == "1")
+    return record
+
+
+def export_json(path, rows, total, lines=False, step=500):
+    """Writes the (id, name, JSON text) rows to a JSON library, yielding progress every `step` presets.
+
+    The rows are written exactly as they are stored, without decoding them.
+    With lines=True it writes JSON lines instead (one preset per line, no header).
+    The file only appears under `path` once it is complete.
+    """
+    partial = path + ".part"
+    separator = "\n" if lines else ",\n"
+    done = 0
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            if not lines:
+                f.write(f'{{"format":"{FORMAT}","version":{VERSION},"presets":[\n')
+            for _, _, text in rows:
+                f.write(separator if done else "")
+                f.write(text)
+                done += 1
+                if done % step == 0:
+                    yield done / max(1, total)
+            f.write("\n" if lines else "\n]}\n")
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    yield 1.0
+
+
+def export_xml(path, rows, total):
+    """Writes the (id, name, JSON text) rows to an XML library, yielding progress after each preset.
+
+    Each preset has to be decoded to be written out, so this steps one
+    preset at a time to keep the slices short.
+    """
+    partial = path + ".part"
+    done = 0
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            xml = XMLGenerator(f, encoding="utf-8", short_empty_elements=True)
+            xml.startDocument()
+            xml.startElement(FORMAT, {"version": str(VERSION)})
+            for preset_id, _, text in rows:
+                _write_xml_preset(xml, Preset.from_json(text, preset_id))
+                done += 1
+                yield done / max(1, total)
+            xml.ignorableWhitespace("\n")
+            xml.endElement(FORMAT)
+            xml.endDocument()
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    yield 1.0
+
+
+def _write_xml_preset(xml, preset):
+    width, height = preset.size()
+    attrs = {"name": preset.name, "h": str(preset.h), "m": str(preset.m), "s": str(preset.s),
+             "width": str(width), "height": str(height)}
+    if preset.background is not None:
+        attrs["background"] = preset.background
+    xml.ignorableWhitespace("\n  ")
+    xml.startElement("preset", attrs)
+    for which, (x, y, w, h), font, color in zip(DIGITS, preset.rects(), preset.fonts, preset.colors):
+        digit = {"which": which, "x": str(x), "y": str(y), "width": str(w), "height": str(h), "color": color}
+        if font is not None:
+            family, size, weight, italic = font
+            digit.update(family=family, size=str(size), weight=str(weight), italic="1" if italic else "0")
+        xml.ignorableWhitespace("\n    ")
+        xml.startElement("digit", digit)
+        xml.endElement("digit")
+    xml.ignorableWhitespace("\n  ")
+    xml.endElement("preset")
+
+
+def export_presets(path, rows, total):
+    """Picks the writer for `path`'s extension (.xml, .jsonl, otherwise JSON)."""
+    kind = library_format(path)
+    if kind == "xml":
+        return export_xml(path, rows, total)
+    return export_json(path, rows, total, lines=kind == "jsonl")
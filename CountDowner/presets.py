@@ -0,0 +1,362 @@
+import functools
+import json
+import sqlite3
+import struct
+
+
+SCHEMA_VERSION = 3
+
+# On disk a preset is a JSON object with these keys (see Preset.to_json)
+DIGITS = ('h', 'm', 's')
+GEOMETRY = struct.Struct('<14h')     # x, y, w, h of each spin box, then window width, height
+
+# The layout of a fresh Creator window
+DEFAULT_GEOMETRY = GEOMETRY.pack(50, 100, 51, 23, 200, 100, 51, 23, 350, 100, 51, 23, 900, 800)
+DEFAULT_COLORS = ("white", "white", "white")
+DEFAULT_FONTS = (None, None, None)      # None is the application's default font
+
+_shared = {}
+
+def _share(value):
+    """Returns one shared copy of each distinct value, so a big library stores each font/colour set once."""
+    return _shared.setdefault(value, value)
+
+
+def _pack_geometry(values):
+    try:
+        return GEOMETRY.pack(*values)
+    except struct.error:
+        # Out of range or not whole numbers: clamp into what fits
+        return GEOMETRY.pack(*[max(-32768, min(32767, int(value))) for value in values])
+
+
+def _whole_number(record, key):
+    # Imported libraries are hand-edited now and then: "5" and 5.0 are fine, "five" and -1 are not
+    value = record.get(key, 0)
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    elif isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"'{key}' must be a whole number of 0 or more, not {value!r}")
+    return value
+
+
+def font_spec(font):
+    """A QFont as a compact (family, point size, weight, italic) tuple."""
+    return _share((font.family(), font.pointSizeF(), font.weight(), font.italic()))
+
+
+def _parse_font(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Older libraries stored QFont.toString(): family, size, pixel size, hint, weight, style, ...
+        parts = value.split(',')
+        return _share((parts[0], float(parts[1]), int(parts[4]), parts[5] != '0'))
+    family, size, weight, italic = value
+    return _share((family, float(size), int(weight), bool(italic)))
+
+
+@functools.lru_cache(maxsize=256)
+def qfont(spec):
+    """The QFont for a font_spec() tuple (shared - setFont copies it)."""
+    from PyQt6.QtGui import QFont
+    font = QFont()
+    if spec is not None:
+        family, size, weight, italic = spec
+        font.setFamily(family)
+        if size > 0:
+            font.setPointSizeF(size)
+        font.setWeight(QFont.Weight(weight))
+        font.setItalic(italic)
+    return font
+
+
+class Preset:
+    """One saved timer layout, kept small enough to hold a library of 100k in memory.
+
+    No Qt objects are kept: fonts are (family, size, weight, italic) tuples and
+    colours are strings, both shared between presets that use the same ones,
+    and the three spin box rectangles plus the window size are packed into a
+    single 28-byte `geometry` string.
+    """
+    __slots__ = ('id', 'name', 'h', 'm', 's', 'fonts', 'colors', 'geometry', 'background')
+
+    def __init__(self, name, h=0, m=0, s=0, fonts=DEFAULT_FONTS, colors=DEFAULT_COLORS,
+                 geometry=DEFAULT_GEOMETRY, background=None, id=None):
+        self.id = id
+        self.name = name
+        self.h = h
+        self.m = m
+        self.s = s
+        self.fonts = _share(tuple(fonts))
+        self.colors = _share(tuple(colors))
+        self.geometry = geometry
+        self.background = background
+
+    def __repr__(self):
+        return f"Preset({self.name!r}, {self.h}, {self.m}, {self.s}, id={self.id})"
+
+    def total_seconds(self):
+        return self.h * 3600 + self.m * 60 + self.s
+
+    def rects(self):
+        """(x, y, w, h) of the hour, minute and second widgets."""
+        values = GEOMETRY.unpack(self.geometry)
+        return [values[0:4], values[4:8], values[8:12]]
+
+    def size(self):
+        """(width, height) of the timer window."""
+        return GEOMETRY.unpack(self.geometry)[12:14]
+
+    @classmethod
+    def from_widgets(cls, name, widgets, background, size):
+        """Reads a preset off the hour/minute/second spin boxes of a Creator window."""
+        geometry = []
+        for widget in widgets:
+            rect = widget.geometry()
+            geometry += [rect.x(), rect.y(), rect.width(), rect.height()]
+        geometry += [size.width(), size.height()]
+        return cls(name, *[widget.value() for widget in widgets],
+                   fonts=[font_spec(widget.font()) for widget in widgets],
+                   colors=[widget.current_color for widget in widgets],
+                   geometry=_pack_geometry(geometry),
+                   background=background)
+
+    def apply_to(self, widgets):
+        """Lays out and fills the hour/minute/second widgets (spin boxes or digit displays)."""
+        values = (self.h, self.m, self.s)
+        for i, (widget, rect) in enumerate(zip(widgets, self.rects())):
+            widget.setValue(values[i])
+            widget.setGeometry(*rect)
+            widget.setFont(qfont(self.fonts[i]))
+            widget.setColor(self.colors[i])
+
+    def to_json(self):
+        """Compact JSON with the same keys older versions wrote (fonts are now [family, size, weight, italic])."""
+        return json.dumps(self.to_record(), separators=(',', ':'))
+
+    def to_record(self):
+        """The preset as a dict of plain values (the on-disk layout)."""
+        rects = self.rects()
+        record = {'name': self.name, 'h': self.h, 'm': self.m, 's': self.s}
+        for i, digit in enumerate(DIGITS):
+            x, y, w, h = rects[i]
+            record[f'pos_{digit}'] = (x, y)
+            record[f'size_{digit}'] = (w, h)
+            record[f'{digit}_font'] = self.fonts[i]
+            record[f'{digit}_color'] = self.colors[i]
+        record['background'] = self.background
+        record['size'] = self.size()
+        return record
+
+    @classmethod
+    def from_json(cls, text, id=None):
+        return cls.from_record(json.loads(text), id)
+
+    @classmethod
+    def from_record(cls, record, id=None):
+        """A Preset from a to_record() dict; ValueError if the name or h/m/s are the wrong type."""
+        if not isinstance(record, dict):
+            raise ValueError("a preset must be a JSON object")
+        name = record.get('name')
+        if not isinstance(name, str):
+            raise ValueError(f"'name' must be a string, not {name!r}")
+        # Anything missing falls back to the fresh Creator layout
+        default = GEOMETRY.unpack(DEFAULT_GEOMETRY)
+        geometry = []
+        for i, digit in enumerate(DIGITS):
+            geometry += record.get(f'pos_{digit}') or default[4 * i:4 * i + 2]
+            geometry += record.get(f'size_{digit}') or default[4 * i + 2:4 * i + 4]
+        geometry += record.get('size') or default[12:14]
+        return cls(name, *[_whole_number(record, digit) for digit in DIGITS],
+                   fonts=[_parse_font(record.get(f'{digit}_font')) for digit in DIGITS],
+                   colors=[record.get(f'{digit}_color', "white") for digit in DIGITS],
+                   geometry=_pack_geometry(geometry),
+                   background=record.get('background'), id=id)
+
+
+class PresetStore:
+    """SQLite-backed store for saved timer presets.
+
+    Every write touches only the affected row and runs in its own
+    transaction, so a crash can never leave a half-written library behind.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{self.path} was written by a newer CountDowner (schema {version})")
+        with self.conn:
+            if version < 1:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS presets ("
+                    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " name TEXT NOT NULL,"
+                    " data TEXT NOT NULL)"
+                )
+            if version < 2:
+                # Schedules find their preset by name, so they survive it being edited (and re-saved)
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS schedules ("
+                    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " name TEXT NOT NULL,"
+                    " rule TEXT NOT NULL,"
+                    " alarm TEXT,"
+                    " created REAL NOT NULL,"
+                    " last_fired REAL)"
+                )
+            if version < 3:
+                # find() (run by name, schedules) looks presets up by name
+                self.conn.execute("CREATE INDEX IF NOT EXISTS presets_name ON presets (name)")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def load_all(self):
+        """Returns every Preset in saved order."""
+        return [Preset.from_json(text, preset_id)
+                for preset_id, text in self.conn.execute("SELECT id, data FROM presets ORDER BY id")]
+
+    def load_index(self):
+        """Returns just {'id', 'name'} for every preset in saved order - cheap even for huge libraries."""
+        return [{'id': preset_id, 'name': name}
+                for preset_id, name in self.conn.execute("SELECT id, name FROM presets ORDER BY id")]
+
+    def get(self, preset_id):
+        """Loads one full Preset, or returns None if it no longer exists."""
+        row = self.conn.execute("SELECT data FROM presets WHERE id = ?", (preset_id,)).fetchone()
+        if row is None:
+            return None
+        return Preset.from_json(row[0], preset_id)
+
+    def find(self, name):
+        """The most recently saved Preset with this name, or None."""
+        row = self.conn.execute("SELECT id, data FROM presets WHERE name = ? ORDER BY id DESC LIMIT 1",
+                                (name,)).fetchone()
+        if row is None:
+            return None
+        return Preset.from_json(row[1], row[0])
+
+    def add(self, preset):
+        """Saves a new preset and gives it its new id."""
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO presets (name, data) VALUES (?, ?)",
+                                       (preset.name, preset.to_json()))
+        preset.id = cursor.lastrowid
+        return preset.id
+
+    def replace(self, old_ids, preset):
+        """Swaps the given presets for `preset` in one transaction; it goes to the end of the list."""
+        with self.conn:
+            self.conn.executemany("DELETE FROM presets WHERE id = ?", [(i,) for i in old_ids])
+            cursor = self.conn.execute("INSERT INTO presets (name, data) VALUES (?, ?)",
+                                       (preset.name, preset.to_json()))
+        preset.id = cursor.lastrowid
+        return preset.id
+
+    def replace_many(self, replacements):
+        """Like replace() for a whole batch of (old_ids, preset) pairs, in one transaction."""
+        with self.conn:
+            for old_ids, preset in replacements:
+                self.conn.executemany("DELETE FROM presets WHERE id = ?", [(i,) for i in old_ids])
+                cursor = self.conn.execute("INSERT INTO presets (name, data) VALUES (?, ?)",
+                                           (preset.name, preset.to_json()))
+                preset.id = cursor.lastrowid
+
+    def iter_rows(self):
+        """(id, name, JSON text) of every preset in saved order, streamed from the database."""
+        return self.conn.execute("SELECT id, name, data FROM presets ORDER BY id")
+
+    def delete(self, preset_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM presets WHERE id = ?", (preset_id,))
+
+    def load_schedules(self):
+        """(id, name, rule, alarm, created, last_fired) of every schedule."""
+        return self.conn.execute("SELECT id, name, rule, alarm, created, last_fired FROM schedules ORDER BY id").fetchall()
+
+    def add_schedule(self, name, rule, alarm, created):
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO schedules (name, rule, alarm, created) VALUES (?, ?, ?, ?)",
+                                       (name, rule, alarm, created))
+        return cursor.lastrowid
+
+    def delete_schedules(self, schedule_ids):
+        with self.conn:
+            self.conn.executemany("DELETE FROM schedules WHERE id = ?", [(i,) for i in schedule_ids])
+
+    def mark_fired(self, fired):
+        """Records the (schedule id, fire time) pairs of one wake-up in a single transaction."""
+        with self.conn:
+            self.conn.executemany("UPDATE schedules SET last_fired = ? WHERE id = ?",
+                                  [(fire_time, schedule_id) for schedule_id, fire_time in fired])
+
+    def close(self):
+        self.conn.close()
+
+
+class PresetRegistry:
+    """The saved presets, keyed by their stable store id with a secondary name index.
+
+    Lookups, upserts and deletes are all dict operations, so they stay O(1)
+    however big the library gets. Iteration follows the order presets were
+    saved in (an upserted preset moves to the end, like in the list view).
+    """
+    def __init__(self, presets=()):
+        self._by_id = {}
+        self._by_name = {}      # name -> {id: None}, ordered like _by_id
+        for data in presets:
+            self.add(data)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __contains__(self, preset_id):
+        return preset_id in self._by_id
+
+    def get(self, preset_id):
+        return self._by_id.get(preset_id)
+
+    def ids_named(self, name):
+        return list(self._by_name.get(name, ()))
+
+    def find(self, name):
+        """Returns the most recently saved preset with this name, or None."""
+        ids = self._by_name.get(name)
+        if not ids:
+            return None
+        return self._by_id[next(reversed(ids))]
+
+    def add(self, data):
+        preset_id = data['id']
+        self._by_id[preset_id] = data
+        self._by_name.setdefault(data['name'], {})[preset_id] = None
+
+    def remove(self, preset_id):
+        data = self._by_id.pop(preset_id, None)
+        if data is None:
+            return None
+        ids = self._by_name.get(data['name'])
+        if ids is not None:
+            ids.pop(preset_id, None)
+            if not ids:
+                del self._by_name[data['name']]
+        return data
+
+    def upsert(self, data):
+        """Adds `data`, replacing any preset with the same name; returns the replaced ids."""
+        replaced = [preset_id for preset_id in self.ids_named(data['name']) if preset_id != data['id']]
+        for preset_id in replaced:
+            self.remove(preset_id)
+        self.remove(data['id'])
+        self.add(data)
+        return replaced
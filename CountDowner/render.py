@@ -0,0 +1,309 @@
+"""Renders a preset's countdown to a GIF, a video or a folder of PNG frames, without a window.
+
+    python render.py Tea -o tea.gif
+    python render.py "Exam" --duration 10m -o exam.mp4 --workers 8
+    python render.py Tea -o frames/
+
+The preset is looked up by name in the saved library (or --db); a name that
+isn't saved gets the fresh Creator layout, and then --duration is needed.
+Frames look like the ActiveTimerWindow: the preset's background, fonts,
+colours and layout.
+
+Only the frames that differ are drawn - one per second, plus one per frame
+of an animated background - and each is shown for as long as it lasts, so
+a 10-minute countdown over a still image is 601 frames, not 18,000. They
+are painted with QPainter into a QImage, spread over a process pool. Each
+worker composes the background once and then only repaints the digit
+rectangles for each frame.
+
+GIF output needs Pillow and video output needs ffmpeg on the PATH; a folder
+gets numbered PNGs plus frames.ffconcat, which ffmpeg can turn into a video:
+    ffmpeg -f concat -i frames/frames.ffconcat -vf fps=30,format=yuv420p out.mp4
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QRect, QRectF, QSize, QStandardPaths
+from PyQt6.QtGui import QGuiApplication, QImage, QImageReader, QPainter
+
+from digits import GlyphAtlas
+from presets import Preset, PresetStore, qfont
+from timer_core import parse_duration
+
+
+FINAL_HOLD_MS = 1000            # How long 00:00:00 stays up at the end
+VIDEO_FORMATS = ('.mp4', '.mov', '.mkv', '.webm')
+
+
+def timeline(total_seconds, background_delays=(), final_hold_ms=FINAL_HOLD_MS):
+    """The distinct frames of a countdown, as (duration_ms, remaining_seconds, background_frame).
+
+    A new frame starts whenever the displayed time changes (every second, the
+    same rounding as Countdown.remaining_seconds) or an animated background
+    moves on to its next frame.
+    """
+    total_ms = int(total_seconds * 1000)
+    animated = len(background_delays) > 1
+    frames = []
+    t = 0
+    background = 0
+    background_ends = background_delays[0] if animated else None
+    while t < total_ms:
+        remaining = math.ceil((total_ms - t) / 1000)
+        end = total_ms - (remaining - 1) * 1000
+        if animated:
+            end = min(end, background_ends)
+        frames.append((end - t, remaining, background))
+        t = end
+        if animated and t >= background_ends:
+            background = (background + 1) % len(background_delays)
+            background_ends = t + background_delays[background]
+    frames.append((final_hold_ms, 0, background))
+    return frames
+
+
+def compose_backgrounds(path, size):
+    """The window background (window colour plus the image, stretched like the window does) for each image frame.
+
+    Returns (images, delays); a still image, or no image, is one frame.
+    """
+    base = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+    base.fill(QGuiApplication.palette().window().color())
+    if not path:
+        return [base], [0]
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    reader.setScaledSize(size)
+    images, delays = [], []
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+        # Same rule as the GIF engine: tiny delays mean "as fast as reasonable"
+        delay = reader.nextImageDelay()
+        composite = QImage(base)
+        painter = QPainter(composite)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        images.append(composite)
+        delays.append(100 if delay <= 10 else delay)
+    if not images:
+        print(f"Could not read background {path}: {reader.errorString()}", file=sys.stderr)
+        return [base], [0]
+    return images, delays
+
+
+class FrameRenderer:
+    """Paints countdown frames as the ActiveTimerWindow shows them, into one reused QImage.
+
+    Frames after the first only restore the three digit rectangles from the
+    composed background and draw the digits again from glyph atlases.
+    """
+    def __init__(self, preset):
+        self.size = QSize(*preset.size())
+        self.backgrounds, self.delays = compose_backgrounds(preset.background, self.size)
+        self.rects = [QRect(*rect) for rect in preset.rects()]
+        self.atlases = [GlyphAtlas(qfont(font), color) for font, color in zip(preset.fonts, preset.colors)]
+        self.canvas = QImage(self.backgrounds[0])
+        self.canvas_background = 0
+
+    def render(self, remaining, background=0):
+        painter = QPainter(self.canvas)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        if background != self.canvas_background:
+            painter.drawImage(0, 0, self.backgrounds[background])
+            self.canvas_background = background
+        else:
+            for rect in self.rects:
+                painter.drawImage(rect, self.backgrounds[background], rect)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+
+        values = (remaining // 3600, (remaining % 3600) // 60, remaining % 60)
+        for rect, atlas, value in zip(self.rects, self.atlases, values):
+            # Laid out like DigitDisplay: fixed-width cells from the left, centred vertically
+            painter.setClipRect(rect)
+            top = rect.y() + (rect.height() - atlas.cell_height) / 2
+            for i, char in enumerate(f"{value:02}"):
+                target = QRectF(rect.x() + i * atlas.cell_width, top, atlas.cell_width, atlas.cell_height)
+                painter.drawPixmap(target, atlas.pixmap, atlas.source(int(char)))
+        painter.end()
+        return self.canvas
+
+
+# Each pool worker keeps its own application and renderer for every chunk it is given
+_worker = {}
+
+def _init_worker(record, folder, palette):
+    _worker['app'] = QGuiApplication.instance() or QGuiApplication([])
+    _worker['renderer'] = FrameRenderer(Preset.from_record(record))
+    _worker['folder'] = folder
+    _worker['palette'] = palette
+
+
+def _render_chunk(chunk):
+    renderer = _worker['renderer']
+    for index, remaining, background in chunk:
+        _save_frame(renderer.render(remaining, background), frame_path(_worker['folder'], index), _worker['palette'])
+    return len(chunk)
+
+
+def frame_path(folder, index):
+    return os.path.join(folder, f"frame_{index:05d}.png")
+
+
+def _save_frame(image, path, palette=None):
+    if palette is None:
+        image.save(path)
+        return
+    # For GIF output the frame is reduced to the shared palette here, in the worker,
+    # so the main process only has to stitch ready-made frames together
+    _to_pil(image).quantize(palette=palette).save(path)
+
+
+def _to_pil(image):
+    from PIL import Image
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    return Image.frombuffer("RGB", (image.width(), image.height()), image.constBits().asstring(image.sizeInBytes()),
+                            "raw", "BGRX", image.bytesPerLine(), 1)
+
+
+def _gif_palette(renderer, total_seconds):
+    """One palette for every frame, taken from the first (the digits only change shape, not colour)."""
+    from PIL import Image
+    return _to_pil(renderer.render(total_seconds)).quantize(256, method=Image.Quantize.MEDIANCUT)
+
+
+def render_frames(preset, total_seconds, folder, workers=None, palette_for_gif=False):
+    """Renders every distinct frame into `folder`; returns [(path, duration_ms)] in order."""
+    renderer = FrameRenderer(preset)
+    frames = timeline(total_seconds, renderer.delays)
+    palette = _gif_palette(renderer, total_seconds) if palette_for_gif else None
+    work = [(index, remaining, background) for index, (_, remaining, background) in enumerate(frames)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(work) < 50:
+        for index, remaining, background in work:
+            _save_frame(renderer.render(remaining, background), frame_path(folder, index), palette)
+    else:
+        # Contiguous ranges, several per worker so a slow one doesn't hold up the end.
+        # Spawned (not forked) workers: forking a process that has Qt running isn't safe.
+        size = max(1, math.ceil(len(work) / (workers * 4)))
+        chunks = [work[i:i + size] for i in range(0, len(work), size)]
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(preset.to_record(), folder, palette)) as pool:
+            for _ in pool.map(_render_chunk, chunks):
+                pass
+    return [(frame_path(folder, index), duration) for index, (duration, _, _) in enumerate(frames)]
+
+
+def write_ffconcat(frames, path):
+    folder = os.path.dirname(path)
+    with open(path, "w") as f:
+        f.write("ffconcat version 1.0\n")
+        for frame, duration in frames:
+            f.write(f"file '{os.path.relpath(frame, folder)}'\nduration {duration / 1000:.3f}\n")
+        # The concat demuxer ignores the last duration unless the file is listed again
+        f.write(f"file '{os.path.relpath(frames[-1][0], folder)}'\n")
+
+
+def write_gif(frames, path):
+    from PIL import Image
+    images = [Image.open(frame) for frame, _ in frames]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=[duration for _, duration in frames])
+    for image in images:
+        image.close()
+
+
+def write_video(frames, path, fps=30):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("video output needs ffmpeg on the PATH (or render to a folder of frames)")
+    concat = os.path.join(os.path.dirname(frames[0][0]), "frames.ffconcat")
+    write_ffconcat(frames, concat)
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", concat,
+                    "-vf", f"fps={fps},scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p", path], check=True)
+
+
+def render(preset, total_seconds, out, workers=None, fps=30):
+    """Renders the countdown to `out`: a .gif, a video file or a folder. Returns the number of frames."""
+    ext = os.path.splitext(out)[1].lower()
+    if ext == ".gif":
+        try:
+            import PIL
+        except ImportError:
+            raise RuntimeError("GIF output needs Pillow (pip install pillow)") from None
+    elif ext in VIDEO_FORMATS and shutil.which("ffmpeg") is None:
+        raise RuntimeError("video output needs ffmpeg on the PATH (or render to a folder of frames)")
+
+    if ext == ".gif" or ext in VIDEO_FORMATS:
+        with tempfile.TemporaryDirectory(prefix="countdowner-render-") as folder:
+            frames = render_frames(preset, total_seconds, folder, workers, palette_for_gif=ext == ".gif")
+            if ext == ".gif":
+                write_gif(frames, out)
+            else:
+                write_video(frames, out, fps)
+    else:
+        os.makedirs(out, exist_ok=True)
+        frames = render_frames(preset, total_seconds, out, workers)
+        write_ffconcat(frames, os.path.join(out, "frames.ffconcat"))
+    return len(frames)
+
+
+def default_db_path():
+    # Same place the app keeps its library (see countdowner.preset_db_path)
+    folder = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    return os.path.join(folder, "presets.db")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="render.py", description="Render a preset's countdown to a GIF, video or PNG frames.")
+    parser.add_argument("name", help="saved preset to render")
+    parser.add_argument("-o", "--output", required=True, help="a .gif, a video (.mp4 .mov .mkv .webm) or a folder")
+    parser.add_argument("--duration", help="countdown length (90, 5m, 1h30m, 10:00); default the preset's own")
+    parser.add_argument("--db", help="preset library (default: the app's own)")
+    parser.add_argument("--workers", type=int, help="processes to render with (default: one per CPU)")
+    parser.add_argument("--fps", type=int, default=30, help="frame rate of video output")
+    args = parser.parse_args(argv)
+
+    app = QGuiApplication([sys.argv[0]])
+    app.setApplicationName("CountDowner")
+
+    preset = None
+    db = args.db or default_db_path()
+    if os.path.exists(db):
+        store = PresetStore(db)
+        preset = store.find(args.name)
+        store.close()
+    if preset is None:
+        if not args.duration:
+            parser.error(f"no saved preset called {args.name!r}; give --duration to render the default layout")
+        preset = Preset(args.name)
+    try:
+        total_seconds = parse_duration(args.duration) if args.duration else preset.total_seconds()
+    except ValueError as error:
+        parser.error(str(error))
+
+    started = time.perf_counter()
+    try:
+        count = render(preset, total_seconds, args.output, args.workers, args.fps)
+    except (RuntimeError, subprocess.CalledProcessError) as error:
+        print(f"render.py: {error}", file=sys.stderr)
+        return 1
+    print(f"{args.output}: {count} frames for {total_seconds} s in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Headless CountDowner: runs countdowns on an asyncio loop, without Qt.
+
+    python runner.py Tea=5m Eggs=3:30 Break=90
+    python runner.py --db ~/.local/share/CountDowner/presets.db Tea
+    python runner.py --count 10000 --seconds 5 --quiet --stats
+
+A spec is NAME=DURATION, where DURATION is seconds (90), h/m/s units
+(1h30m, 5m, 45s) or a clock (1:30:00, 5:00). A bare NAME is looked up in
+the preset library given with --db. Each timer prints a line when it
+finishes; --stats prints a JSON summary at the end.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from timer_core import TickScheduler, TimerEngine, parse_duration
+
+
+class AsyncRunner:
+    """Drives a TimerEngine from an asyncio loop.
+
+    The whole engine sits behind a single loop.call_later handle, re-armed for
+    whichever countdown is due next, so thousands of timers cost one pending
+    callback and a few hundred bytes each - not a task or coroutine apiece.
+    """
+    def __init__(self, alarm=None, on_finish=None, slack=0.05):
+        self.loop = asyncio.get_running_loop()
+        self.handle = None
+        self.idle = asyncio.Event()
+        self.max_late = 0.0
+        self.on_finish = on_finish
+        self.scheduler = TickScheduler(self._arm, clock=self.loop.time, slack=slack)
+        self.engine = TimerEngine(self.scheduler, alarm=alarm, on_finish=self._finished, on_idle=self.idle.set)
+
+    def start(self, name, total_seconds, alarm=None):
+        self.idle.clear()
+        return self.engine.start(name, total_seconds, alarm)
+
+    async def wait(self):
+        """Returns once every timer has finished (or been stopped)."""
+        if len(self.engine):
+            await self.idle.wait()
+
+    def _arm(self, delay_ms):
+        if self.handle is not None:
+            self.handle.cancel()
+            self.handle = None
+        if delay_ms is not None:
+            self.handle = self.loop.call_later(delay_ms / 1000, self._wake)
+
+    def _wake(self):
+        self.handle = None
+        self.scheduler.run_due()
+
+    def _finished(self, timer, now):
+        self.max_late = max(self.max_late, self.loop.time() - timer.countdown.deadline)
+        if self.on_finish is not None:
+            self.on_finish(timer, now)
+
+
+def parse_specs(specs, store=None):
+    """Turns NAME=DURATION / NAME specs into (name, seconds) pairs."""
+    timers = []
+    for spec in specs:
+        name, _, duration = spec.partition('=')
+        if duration:
+            timers.append((name, parse_duration(duration)))
+            continue
+        preset = store.find(name) if store is not None else None
+        if preset is None:
+            raise ValueError(f"no duration given for {name!r} and no preset by that name")
+        timers.append((name, preset.total_seconds()))
+    return timers
+
+
+def peak_memory_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def run(timers, alarm_path=None, quiet=False):
+    player = None
+    if alarm_path is not None:
+        from alarms import AlarmPlayer, ThreadedBackend
+        player = AlarmPlayer(ThreadedBackend())
+
+    def finished(timer, now):
+        if not quiet:
+            print(f"{timer.name} finished", flush=True)
+
+    runner = AsyncRunner(alarm=player.play if player else None, on_finish=finished)
+    started = time.perf_counter()
+    for name, seconds in timers:
+        runner.start(name, seconds, alarm_path)
+    await runner.wait()
+    if player is not None:
+        # Let the last alarm finish ringing before the process exits
+        player.backend.queue.join()
+
+    return {
+        'timers': runner.engine.started,
+        'finished': runner.engine.finished,
+        'elapsed_s': round(time.perf_counter() - started, 3),
+        'max_late_ms': round(runner.max_late * 1000, 2),
+        'wakeups': runner.scheduler.total_wakeups,
+        'peak_rss_kb': peak_memory_kb(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="runner.py", description="Run CountDowner timers without a GUI.")
+    parser.add_argument("specs", nargs="*", metavar="NAME[=DURATION]")
+    parser.add_argument("--db", help="preset library to look bare names up in (presets.db)")
+    parser.add_argument("--alarm", help="sound to play when a timer finishes")
+    parser.add_argument("--count", type=int, default=0, help="also start this many generated timers")
+    parser.add_argument("--seconds", type=float, default=5, help="duration of the generated timers")
+    parser.add_argument("--quiet", action="store_true", help="don't print a line per finished timer")
+    parser.add_argument("--stats", action="store_true", help="print a JSON summary at the end")
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.db:
+        from presets import PresetStore
+        store = PresetStore(args.db)
+    try:
+        timers = parse_specs(args.specs, store)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        if store is not None:
+            store.close()
+    timers += [(f"timer-{i}", args.seconds) for i in range(args.count)]
+    if not timers:
+        parser.error("nothing to run")
+
+    summary = asyncio.run(run(timers, args.alarm, args.quiet))
+    if args.stats:
+        print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime, timedelta
+
+from timer_core import parse_duration
+
+
+# A schedule starts a preset's countdown by itself. Its rule is kept as text:
+#   daily 08:00               every day
+#   weekdays 08:15            Monday to Friday (weekends = Saturday and Sunday)
+#   mon,wed,fri 14:30         the listed days
+#   every 45m                 every 45 minutes from when the schedule was made
+#   at 2026-10-20 14:00       once
+# Clock times are local wall-clock times, worked out afresh for each day,
+# so a daily bell stays at 08:00 across daylight saving changes.
+DAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+DAY_SETS = {'daily': range(7), 'weekdays': range(5), 'weekends': (5, 6)}
+
+RULE_HELP = "daily 08:00, weekdays 08:15, mon,wed,fri 14:30, every 45m or at 2026-10-20 14:00"
+
+
+def _parse_clock(text):
+    try:
+        return datetime.strptime(text, "%H:%M:%S" if text.count(':') == 2 else "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"can't read time of day {text!r} (use HH:MM)") from None
+
+
+def local_timestamp(when):
+    """The instant a naive local datetime happens.
+
+    A time in the hour repeated when the clocks go back is its first
+    occurrence. A time in the hour skipped when they go forward doesn't
+    happen at all, so it is the moment of the change (a 02:30 bell rings
+    when 02:00 becomes 03:00, not an hour later at 03:30).
+    """
+    stamp = when.timestamp()
+    if datetime.fromtimestamp(stamp) == when:
+        return stamp
+    # In the gap: the change is between the two readings of the missing time
+    low, high = when.replace(fold=1).timestamp(), stamp
+    while high - low > 0.5:
+        middle = (low + high) / 2
+        if datetime.fromtimestamp(middle) >= when:
+            high = middle
+        else:
+            low = middle
+    return float(math.ceil(high))
+
+
+class DailyRule:
+    """At a local clock time on some days of the week."""
+    def __init__(self, clock, days):
+        self.clock = clock
+        self.days = frozenset(days)
+
+    def next_after(self, t):
+        day = datetime.fromtimestamp(t).date()
+        for _ in range(8):
+            if day.weekday() in self.days:
+                fire = local_timestamp(datetime.combine(day, self.clock))
+                if fire > t:
+                    return fire
+            day += timedelta(days=1)
+        return None
+
+
+class EveryRule:
+    """Every `seconds` of real time, counted from `anchor` (so clock changes don't shift it)."""
+    def __init__(self, seconds, anchor):
+        if seconds <= 0:
+            raise ValueError("the interval must be longer than zero")
+        self.seconds = seconds
+        self.anchor = anchor
+
+    def next_after(self, t):
+        return self.anchor + (math.floor((t - self.anchor) / self.seconds) + 1) * self.seconds
+
+
+class OnceRule:
+    def __init__(self, at):
+        self.at = at
+
+    def next_after(self, t):
+        return self.at if self.at > t else None
+
+
+def parse_rule(text, created=None):
+    """Reads a rule (see above); `created` anchors "every" rules (default: now)."""
+    words = text.strip().lower().split()
+    if len(words) == 2 and words[0] == 'every':
+        return EveryRule(parse_duration(words[1]), time.time() if created is None else created)
+    if len(words) == 3 and words[0] == 'at':
+        try:
+            return OnceRule(local_timestamp(datetime.strptime(f"{words[1]} {words[2]}", "%Y-%m-%d %H:%M")))
+        except ValueError:
+            raise ValueError(f"can't read date {words[1]} {words[2]!r} (use YYYY-MM-DD HH:MM)") from None
+    if len(words) == 2:
+        days = DAY_SETS.get(words[0])
+        if days is None:
+            try:
+                days = [DAYS.index(day[:3]) for day in words[0].split(',')]
+            except ValueError:
+                raise ValueError(f"can't read days {words[0]!r}") from None
+        return DailyRule(_parse_clock(words[1]), days)
+    raise ValueError(f"can't read schedule {text!r}; try {RULE_HELP}")
+
+
+class Schedule:
+    __slots__ = ('id', 'name', 'rule_text', 'rule', 'alarm', 'created', 'last_fired', 'next_fire', 'seq')
+
+    def __init__(self, id, name, rule_text, alarm=None, created=None, last_fired=None):
+        self.id = id
+        self.name = name            # The preset it starts, looked up by name when it fires
+        self.rule_text = rule_text
+        self.created = time.time() if created is None else created
+        self.rule = parse_rule(rule_text, self.created)
+        self.alarm = alarm
+        self.last_fired = last_fired
+        self.next_fire = None
+        self.seq = None
+
+    def __repr__(self):
+        return f"Schedule({self.id}, {self.name!r}, {self.rule_text!r})"
+
+
+class ScheduleIndex:
+    """Every schedule's next fire time in one heap, served by a single timer.
+
+    Like TickScheduler it owns no timer itself: `arm(delay_ms)` is called when
+    the earliest fire time changes (None when there is nothing left), and the
+    owner of the real timer calls `run_due()` when it fires. `fire(schedule, now)`
+    starts the schedule's countdown, and `expire(schedule)` hears about one
+    that will never fire again (a one-off that has rung or was missed), which
+    is dropped from the index.
+
+    Fire times are wall-clock (`clock`), but timers count elapsed time, so
+    each wake-up compares the two: if the wall clock has jumped (it was
+    changed, or the machine slept), every fire time is worked out again.
+    A sleep is never armed for longer than `max_sleep`, which bounds how long
+    a jump can go unnoticed. A fire more than `late_grace` seconds overdue is
+    skipped rather than rung late, and a repeating schedule that missed
+    several fires rings once, not once for each.
+    """
+    def __init__(self, arm, fire, expire=None, clock=time.time, monotonic=time.monotonic,
+                 late_grace=300, max_sleep=60, slack=0.05, jump_tolerance=2.0):
+        self.arm = arm
+        self.fire = fire
+        self.expire = expire
+        self.clock = clock
+        self.monotonic = monotonic
+        self.late_grace = late_grace
+        self.max_sleep = max_sleep
+        self.slack = slack
+        self.jump_tolerance = jump_tolerance
+        self._heap = []             # (next_fire, seq, schedule id) - stale items are skipped lazily
+        self._schedules = {}        # id -> Schedule
+        self._seq = itertools.count()
+        self._armed_at = None       # (wall, monotonic) when the timer was last armed
+        self.wakeups = 0
+        self.fired = 0
+        self.skipped = 0
+        self.jumps = 0
+
+    def __len__(self):
+        return len(self._schedules)
+
+    def __iter__(self):
+        return iter(self._schedules.values())
+
+    def add(self, schedule, rearm=True):
+        """Indexes a schedule. One loaded from disk still rings a fire it missed within late_grace."""
+        now = self.clock()
+        next_fire = self._next_fire(schedule, now)
+        if next_fire is None:
+            self._expired(schedule)
+            return
+        self._schedules[schedule.id] = schedule
+        self._push(schedule, next_fire)
+        if rearm:
+            self._rearm(now)
+
+    def add_many(self, schedules):
+        for schedule in schedules:
+            self.add(schedule, rearm=False)
+        self._rearm(self.clock())
+
+    def remove(self, schedule_id):
+        # The heap entry goes stale and is dropped when it reaches the top
+        return self._schedules.pop(schedule_id, None)
+
+    def named(self, name):
+        return [schedule for schedule in self._schedules.values() if schedule.name == name]
+
+    def rebuild(self):
+        """Works out every fire time again from the current wall clock."""
+        now = self.clock()
+        self._reindex(now)
+        self._rearm(now)
+
+    def run_due(self):
+        """Fires everything that is due; returns the schedules that fired."""
+        now = self.clock()
+        self.wakeups += 1
+        if self._clock_jumped(now):
+            self.jumps += 1
+            self._reindex(now)
+
+        due = []
+        while self._heap and self._heap[0][0] <= now + self.slack:
+            fire_at, seq, key = heapq.heappop(self._heap)
+            schedule = self._schedules.get(key)
+            if schedule is not None and schedule.seq == seq:
+                due.append((fire_at, schedule))
+
+        fired = []
+        for fire_at, schedule in due:
+            schedule.last_fired = fire_at
+            if now - fire_at <= self.late_grace:
+                self.fired += 1
+                fired.append(schedule)
+                self.fire(schedule, now)
+            else:
+                self.skipped += 1
+            # Repeats missed meanwhile are folded into this one
+            next_fire = schedule.rule.next_after(max(now, fire_at))
+            if next_fire is None:
+                self._schedules.pop(schedule.id, None)
+                self._expired(schedule)
+            else:
+                self._push(schedule, next_fire)
+
+        self._armed_at = None
+        self._rearm(now)
+        return fired
+
+    def _reindex(self, now):
+        self._heap = []
+        for schedule in list(self._schedules.values()):
+            next_fire = self._next_fire(schedule, now)
+            if next_fire is None:
+                del self._schedules[schedule.id]
+                self._expired(schedule)
+            else:
+                self._push(schedule, next_fire)
+
+    def _expired(self, schedule):
+        schedule.next_fire = None
+        if self.expire is not None:
+            self.expire(schedule)
+
+    def _next_fire(self, schedule, now):
+        # Fires missed by up to late_grace still count, but never one from before the
+        # schedule was made or already rung (so setting the clock back can't ring a bell twice)
+        after = max(now - self.late_grace, schedule.created)
+        if schedule.last_fired is not None:
+            after = max(after, schedule.last_fired)
+        return schedule.rule.next_after(after)
+
+    def _push(self, schedule, fire_at):
+        schedule.next_fire = fire_at
+        if fire_at is None:
+            return
+        schedule.seq = next(self._seq)
+        heapq.heappush(self._heap, (fire_at, schedule.seq, schedule.id))
+
+    def _clock_jumped(self, now):
+        if self._armed_at is None:
+            return False
+        wall, mono = self._armed_at
+        return abs((now - wall) - (self.monotonic() - mono)) > self.jump_tolerance
+
+    def _rearm(self, now):
+        while self._heap:
+            fire_at, seq, key = self._heap[0]
+            schedule = self._schedules.get(key)
+            if schedule is not None and schedule.seq == seq:
+                break
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._armed_at = None
+            self.arm(None)
+            return
+        delay = min(self._heap[0][0] - now, self.max_sleep)
+        self._armed_at = (now, self.monotonic())
+        self.arm(max(0, math.ceil(delay * 1000)))
@@ -0,0 +1,67 @@
+from functools import lru_cache
+
+from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWidgets import QApplication
+
+
+# The look of a coloured MovableSpinBox. It is installed once on the application,
+# so Qt parses it a single time; the colour itself comes from the widget palette.
+SPINBOX_STYLE = """
+MovableSpinBox[colored="true"] {
+    background-color: rgba(255, 255, 255, 150);
+    border: 1px solid #888;
+    border-radius: 5px;
+    padding: 0px;
+}
+MovableSpinBox[colored="true"] QLineEdit {
+    background: transparent;
+    padding: 0px;
+    margin: 0px;
+}
+MovableSpinBox[colored="true"]::up-button, MovableSpinBox[colored="true"]::down-button {
+    width: 0px;
+}
+"""
+
+_styles_installed = False
+
+def install_styles():
+    global _styles_installed
+    if _styles_installed:
+        return
+    app = QApplication.instance()
+    app.setStyleSheet(app.styleSheet() + SPINBOX_STYLE)
+    _styles_installed = True
+
+
+@lru_cache(maxsize=256)
+def text_palette(color):
+    """A palette that only sets the text colour, shared by every widget using that colour."""
+    palette = QPalette()
+    qcolor = QColor(color)
+    palette.setColor(QPalette.ColorRole.Text, qcolor)
+    palette.setColor(QPalette.ColorRole.WindowText, qcolor)
+    return palette
+
+
+def apply_text_color(widget, color):
+    """Colours a MovableSpinBox through its palette instead of a per-widget stylesheet."""
+    install_styles()
+    if widget.property("colored") is not True:
+        widget.setProperty("colored", True)
+        # The property selector only matches after the widget is re-polished
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
+    # The text is drawn by the inner line edit, which the style sheet re-polishes on its own
+    palette = text_palette(color)
+    widget.setPalette(palette)
+    widget.lineEdit().setPalette(palette)
+
+
+def restore_text_color(widget, color):
+    """Puts the colour back after a (first) polish; the style sheet style resets the palette then."""
+    palette = text_palette(color)
+    if widget.palette().color(QPalette.ColorRole.Text) != palette.color(QPalette.ColorRole.Text):
+        widget.setPalette(palette)
+    if widget.lineEdit().palette().color(QPalette.ColorRole.Text) != palette.color(QPalette.ColorRole.Text):
+        widget.lineEdit().setPalette(palette)
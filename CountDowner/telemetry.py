@@ -0,0 +1,203 @@
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+
+# Opt-in instrumentation for --instrument: how late each tick ran, and what
+# the GUI thread was doing when it stopped answering. Nothing in here is
+# imported or running unless it was asked for; with it off the scheduler
+# only checks one attribute per wake-up.
+
+# Histogram buckets in milliseconds: 0 (on time or early), then doubling
+# upper bounds from 0.25 ms to 8 s, and one more for anything later.
+BUCKET_BOUNDS = [0.0] + [2.0 ** exponent for exponent in range(-2, 14)] + [math.inf]
+
+
+class Histogram:
+    """Counts of latencies (in seconds) in fixed power-of-two millisecond buckets."""
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKET_BOUNDS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        if ms <= 0:
+            # Served early (within the scheduler's slack) is on time: it shows its own boundary
+            ms = 0.0
+            bucket = 0
+        else:
+            # frexp gives the power of two just above ms; the smallest bucket is 2**-2
+            bucket = min(len(BUCKET_BOUNDS) - 1, max(1, math.frexp(ms)[1] + 3))
+            if ms == BUCKET_BOUNDS[bucket - 1]:
+                bucket -= 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding that fraction of the samples."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.5), 3),
+            'p99_ms': round(self.percentile(0.99), 3),
+            'max_ms': round(self.max, 3),
+            # Bucket upper bound (ms) -> count; "inf" is anything over 8 s
+            'buckets': {str(bound) if bound != math.inf else "inf": count
+                        for bound, count in zip(BUCKET_BOUNDS, self.counts) if count},
+        }
+
+
+class _TimerLatency:
+    __slots__ = ('label', 'started', 'stopped', 'histogram')
+
+    def __init__(self, label, started):
+        self.label = label
+        self.started = started
+        self.stopped = None
+        self.histogram = Histogram()
+
+
+class TickLatency:
+    """Observer for a TickScheduler: how long after it was due each tick ran.
+
+    Set it as the scheduler's `observer`. The lateness counts everything that
+    held the tick up - a late wake-up, a slow event loop, or the timers served
+    ahead of it in the same pass - so it is measured just before each callback.
+    Every timer gets its own histogram, and all of them feed a global one.
+    The last `keep_stopped` finished or stopped timers are kept for the report.
+    """
+    def __init__(self, clock=time.time, keep_stopped=50):
+        self.clock = clock
+        self.all = Histogram()
+        self.running = {}           # key -> _TimerLatency
+        self.stopped = deque(maxlen=keep_stopped)
+
+    def timer_started(self, key, label):
+        self.timer_stopped(key)     # A new countdown can have the id of a dead one
+        self.running[key] = _TimerLatency(label, self.clock())
+
+    def timer_stopped(self, key):
+        timer = self.running.pop(key, None)
+        if timer is not None:
+            timer.stopped = self.clock()
+            self.stopped.append(timer)
+
+    def tick(self, key, lateness):
+        self.all.add(lateness)
+        timer = self.running.get(key)
+        if timer is not None:
+            timer.histogram.add(lateness)
+
+    def report(self):
+        def describe(timer):
+            return dict(label=timer.label, started=timer.started, stopped=timer.stopped,
+                        **timer.histogram.to_dict())
+        return {
+            'all': self.all.to_dict(),
+            'running': [describe(timer) for timer in self.running.values()],
+            'stopped': [describe(timer) for timer in self.stopped],
+        }
+
+
+class StallWatchdog:
+    """Notices when the GUI thread stops running its event loop, and samples its stack.
+
+    The GUI thread calls `beat()` from a repeating timer every `period`
+    seconds. A background thread checks the last beat, and while it is
+    overdue by more than `threshold` it takes a sample of the GUI thread's
+    Python stack (up to `max_samples`, one per threshold). When the beats
+    come back the stall is logged with how long it lasted.
+
+    A stall shorter than the poll interval may have no sample, and a stall
+    inside C++ code that holds the GIL is only sampled once it lets go.
+    """
+    def __init__(self, threshold=0.1, period=0.02, clock=time.monotonic, thread_id=None,
+                 max_samples=5, keep=100, log=print):
+        self.threshold = threshold
+        self.period = period
+        self.clock = clock
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.max_samples = max_samples
+        self.log = log
+        self.stalls = deque(maxlen=keep)
+        self.count = 0
+        self.worst = 0.0
+        self._lock = threading.Lock()
+        self._last_beat = clock()
+        self._samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._last_beat = self.clock()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def beat(self):
+        now = self.clock()
+        with self._lock:
+            stalled = now - self._last_beat - self.period
+            samples, self._samples = self._samples, []
+            self._last_beat = now
+        if stalled > self.threshold:
+            self._record(stalled, samples)
+
+    def report(self):
+        return {
+            'threshold_ms': self.threshold * 1000,
+            'count': self.count,
+            'worst_ms': round(self.worst * 1000, 1),
+            'recent': list(self.stalls),
+        }
+
+    def _record(self, stalled, samples):
+        self.count += 1
+        self.worst = max(self.worst, stalled)
+        stall = {'at': time.time() - stalled, 'ms': round(stalled * 1000, 1), 'samples': samples}
+        self.stalls.append(stall)
+        where = samples[0]['stack'][-1] if samples else "no stack sample"
+        self.log(f"GUI thread stalled for {stall['ms']:.0f} ms ({where})")
+
+    def _watch(self):
+        poll = min(self.period, self.threshold / 4)
+        while not self._stop.wait(poll):
+            with self._lock:
+                overdue = self.clock() - self._last_beat - self.period
+                due = self.threshold * (len(self._samples) + 1)
+                if overdue > due and len(self._samples) < self.max_samples:
+                    self._samples.append({'after_ms': round(overdue * 1000, 1), 'stack': self._sample()})
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return []
+        return [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in traceback.extract_stack(frame)]
+
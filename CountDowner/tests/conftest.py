@@ -0,0 +1,23 @@
+import os
+import sys
+
+# The tests import the app's modules straight from the CountDowner folder, and
+# the Qt ones draw offscreen so they run without a display
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def app_data(tmp_path, monkeypatch):
+    """Points the per-user app data folder (presets, checkpoint) at a temporary one."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    return tmp_path
@@ -0,0 +1,65 @@
+from alarms import AlarmPlayer, SoundCache
+
+
+class FakeBackend:
+    def __init__(self):
+        self.played = []
+
+    def submit(self, path):
+        self.played.append(path)
+        return True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_same_file_within_window_rings_once():
+    backend, clock = FakeBackend(), Clock()
+    player = AlarmPlayer(backend, coalesce_window=1.0, clock=clock)
+    assert player.play("a.wav")
+    assert not player.play("a.wav")
+    assert player.play("b.wav")
+    clock.now += 1.0
+    assert player.play("a.wav")
+    assert backend.played == ["a.wav", "b.wav", "a.wav"]
+    assert player.coalesced == 1
+
+
+def test_last_played_forgets_old_paths():
+    backend, clock = FakeBackend(), Clock()
+    player = AlarmPlayer(backend, coalesce_window=1.0, clock=clock, max_paths=4)
+    for i in range(100):
+        player.play(f"{i}.wav")
+        clock.now += 0.5
+    # Only what was played inside the window is still remembered
+    assert list(player._last_played) == ["98.wav", "99.wav"]
+
+
+def test_last_played_is_capped_within_the_window():
+    backend, clock = FakeBackend(), Clock()
+    player = AlarmPlayer(backend, coalesce_window=60.0, clock=clock, max_paths=4)
+    for i in range(10):
+        player.play(f"{i}.wav")
+    assert list(player._last_played) == ["6.wav", "7.wav", "8.wav", "9.wav"]
+    assert not player.play("9.wav")
+
+
+def test_sound_cache_reuses_and_evicts(tmp_path):
+    loaded = []
+    cache = SoundCache(lambda path: loaded.append(path) or object(), capacity=2)
+    paths = [str(tmp_path / f"{name}.wav") for name in "abc"]
+    for path in paths:
+        open(path, "wb").close()
+    first = cache.get(paths[0])
+    assert cache.get(paths[0]) is first
+    cache.get(paths[1])
+    cache.get(paths[2])
+    assert len(cache) == 2
+    assert cache.hits == 1 and cache.misses == 3
+    cache.get(paths[0])
+    assert loaded == [paths[0], paths[1], paths[2], paths[0]]
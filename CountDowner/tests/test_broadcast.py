@@ -0,0 +1,55 @@
+import json
+import socket
+import threading
+import time
+
+
+def fetch(qapp, port, path, until=None):
+    """GETs `path` from a thread while the event loop runs; reads to the end, or until `until` arrives."""
+    result = {}
+
+    def get():
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            data = b""
+            while until is None or until not in data:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+            result['data'] = data
+
+    thread = threading.Thread(target=get)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while thread.is_alive() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    thread.join()
+    head, _, body = result['data'].partition(b"\r\n\r\n")
+    return head.decode("latin-1"), body
+
+
+def test_no_cors_and_stats_only_when_instrumented(qapp):
+    from broadcast import BroadcastServer
+    server = BroadcastServer(port=0)
+    assert server.listen()
+    server.publish(1, {'id': 1, 'name': "Tea", 'state': "running", 'deadline': 0, 'total': 60})
+    server.flush()
+
+    head, body = fetch(qapp, server.port, "/timers")
+    assert head.startswith("HTTP/1.1 200")
+    assert "access-control" not in head.lower()
+    assert json.loads(body)['timers'][0]['name'] == "Tea"
+
+    head, _ = fetch(qapp, server.port, "/stats")
+    assert head.startswith("HTTP/1.1 404")
+
+    server.stats = lambda: {'ticks': {}}
+    head, body = fetch(qapp, server.port, "/stats")
+    assert head.startswith("HTTP/1.1 200") and "access-control" not in head.lower()
+    assert json.loads(body) == {'ticks': {}}
+
+    head, body = fetch(qapp, server.port, "/events", until=b"event: snapshot")
+    assert "text/event-stream" in head and "access-control" not in head.lower()
+    server.close()
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+
+def send_drag(qapp, box, local, offsets, pause=0.002):
+    from PyQt6.QtCore import QEvent, QPointF, Qt
+    from PyQt6.QtGui import QMouseEvent
+    left = Qt.MouseButton.LeftButton
+    origin = QPointF(box.mapToGlobal(local.toPoint()))
+
+    def send(kind, offset, button):
+        qapp.sendEvent(box, QMouseEvent(kind, local + offset, origin + offset, button, left,
+                                        Qt.KeyboardModifier.NoModifier))
+
+    send(QEvent.Type.MouseButtonPress, QPointF(), left)
+    for x, y in offsets:
+        send(QEvent.Type.MouseMove, QPointF(x, y), Qt.MouseButton.NoButton)
+        qapp.processEvents()
+        time.sleep(pause)
+    send(QEvent.Type.MouseButtonRelease, QPointF(*offsets[-1]), left)
+
+
+@pytest.fixture
+def spin_box(qapp):
+    from PyQt6.QtWidgets import QWidget
+    import countdowner
+    canvas = QWidget()
+    canvas.resize(900, 600)
+    box = countdowner.MovableSpinBox(canvas)
+    box.setGeometry(50, 100, 120, 40)
+    canvas.show()
+    qapp.processEvents()
+    yield box
+    canvas.close()
+
+
+def test_fast_drag_moves_once_per_frame(qapp, spin_box):
+    from PyQt6.QtCore import QPointF
+    offsets = [(i, i // 2) for i in range(1, 301)]
+    send_drag(qapp, spin_box, QPointF(60, 20), offsets)
+
+    # Lands exactly where the mouse was let go
+    assert (spin_box.x(), spin_box.y()) == (350, 250)
+    stats = spin_box.frame_stats()
+    # 300 moves 2 ms apart are about 40 frames of 16 ms, not 300 moves
+    assert 2 <= stats['frames'] < len(offsets) // 3
+    assert stats['fps'] < 70
+    assert stats['avg_cost_ms'] < 16
+
+
+def test_fast_resize_settles_font_on_release(qapp, spin_box):
+    from PyQt6.QtCore import QPointF
+    offsets = [(i * 3, i) for i in range(1, 101)]
+    send_drag(qapp, spin_box, QPointF(118, 38), offsets)
+
+    assert (spin_box.width(), spin_box.height()) == (500, 140)
+    assert spin_box.font().pointSize() == int(140 * 0.6)
+    assert spin_box.frame_stats()['frames'] < len(offsets) // 3
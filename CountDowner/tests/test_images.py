@@ -0,0 +1,47 @@
+import pytest
+
+
+def make_gif(path, frames, size=(900, 800), duration=40):
+    Image = pytest.importorskip("PIL.Image")
+    ImageDraw = pytest.importorskip("PIL.ImageDraw")
+    images = []
+    for i in range(frames):
+        frame = Image.new("RGB", size, (20, 20, 60))
+        ImageDraw.Draw(frame).rectangle((i * 5, 10, i * 5 + 20, 40), fill=(255, 140, 0))
+        images.append(frame)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=duration, loop=0)
+    return str(path)
+
+
+def decode(path, size, max_bytes):
+    from PyQt6.QtCore import QSize
+    from images import _GifDecodeJob, _GifDecodeSignals
+    signals = _GifDecodeSignals()
+    result = {}
+    signals.decoded.connect(lambda key, images, delays: result.update(images=images, delays=delays))
+    _GifDecodeJob("key", path, QSize(*size), max_bytes, signals).run()
+    return result['images'], result['delays']
+
+
+def test_small_gif_keeps_every_frame_at_full_size(qapp, tmp_path):
+    images, delays = decode(make_gif(tmp_path / "a.gif", 10, size=(200, 100)), (200, 100), 32 << 20)
+    assert len(images) == 10 and delays == [40] * 10
+    assert (images[0].width(), images[0].height()) == (200, 100)
+
+
+def test_gif_a_little_over_the_cap_is_scaled_not_thinned(qapp, tmp_path):
+    # 24 frames of 900x800 are 69 MB at full size
+    images, delays = decode(make_gif(tmp_path / "b.gif", 24), (900, 800), 32 << 20)
+    assert len(images) == 24
+    assert sum(image.width() * image.height() * 4 for image in images) <= 32 << 20
+    assert images[0].width() >= 450 and delays == [40] * 24
+
+
+def test_long_gif_is_thinned_just_enough(qapp, tmp_path):
+    # Even at half size only 10 frames fit, so 25 become 10, spread evenly and still one loop long
+    max_bytes = 10 * 450 * 400 * 4
+    images, delays = decode(make_gif(tmp_path / "c.gif", 25), (900, 800), max_bytes)
+    assert len(images) == 10
+    assert (images[0].width(), images[0].height()) == (450, 400)
+    assert sum(delays) == 25 * 40
+    assert max(delays) - min(delays) <= 40
@@ -0,0 +1,74 @@
+import io
+import os
+import socket
+import sys
+import threading
+
+import pytest
+
+import instance
+
+
+def test_batch_bad_line_gets_its_own_error(tmp_path):
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text('{"cmd": "list"}\n{"cmd": "run", "name": \n\n{"cmd": "show"}\n')
+    commands, rest = instance.parse_commands(["batch", str(batch)])
+    assert rest == []
+    assert [command['cmd'] for command in commands] == ['list', 'invalid', 'show']
+    assert commands[1]['error'].startswith("line 2: bad command")
+
+
+def test_batch_missing_file_is_a_usage_error(tmp_path):
+    with pytest.raises(SystemExit):
+        instance.parse_commands(["batch", str(tmp_path / "nope.jsonl")])
+
+
+def test_server_name_prefers_runtime_dir(tmp_path, monkeypatch):
+    if os.name != "posix":
+        pytest.skip("socket paths are a Unix thing")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert instance.server_name() == str(tmp_path / "CountDowner")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setenv("TMPDIR", str(tmp_path / "tmp"))
+    assert instance.server_name().startswith(str(tmp_path / "tmp"))
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_garbled_reply_is_an_error_not_a_traceback(tmp_path):
+    path = str(tmp_path / "sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def answer():
+        conn, _ = server.accept()
+        with conn:
+            conn.recv(65536)
+            conn.sendall(b'{"ok": true, "result": 1}\nnot json\n')
+
+    thread = threading.Thread(target=answer)
+    thread.start()
+    replies = instance.send([{'cmd': 'list'}, {'cmd': 'show'}], name=path)
+    thread.join()
+    server.close()
+    assert replies[0] == {'ok': True, 'result': 1}
+    assert replies[1]['ok'] is False and "garbled reply" in replies[1]['error']
+
+
+def test_server_rejects_invalid_command(qapp):
+    server = instance.InstanceServer(lambda command: "done", name="unused")
+    assert server.execute({'cmd': 'invalid', 'error': "line 2: bad"}) == {'ok': False, 'error': "line 2: bad"}
+    assert server.execute([1]) == {'ok': False, 'error': "a command must be a JSON object"}
+    assert server.execute({'cmd': 'list'}) == {'ok': True, 'result': "done"}
+
+
+def test_batch_from_stdin_without_running_instance(tmp_path, monkeypatch):
+    stdin = io.StringIO('{"cmd": "list"}\n{"cmd": "show"}\n')
+    monkeypatch.setattr(sys, "stdin", stdin)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    commands, rest = instance.parse_commands(["batch", "-"])
+    # Nothing is listening, so the same commands are left for the app to run itself
+    assert instance.handoff(commands) is None
+    assert not stdin.closed
+    assert [command['cmd'] for command in commands] == ['list', 'show']
+    assert rest == []
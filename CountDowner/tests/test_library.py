@@ -0,0 +1,108 @@
+import io
+import json
+
+import pytest
+
+import library
+from library import _iter_json_array, _iter_json_lines, _iter_xml
+
+
+def records(count):
+    return [{'name': f"Timer {i}", 'h': i % 24, 'm': 5, 's': 0, 'note': "x" * (i % 50), 'flag': i % 2 == 0}
+            for i in range(count)]
+
+
+def json_library(items):
+    return json.dumps({'format': library.FORMAT, 'version': 1, 'presets': items}).encode()
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 65536])
+def test_json_array_any_chunk_size(monkeypatch, chunk):
+    # Every way of cutting the file into chunks (strings, numbers, true/false) gives the same records
+    monkeypatch.setattr(library, "CHUNK_SIZE", chunk)
+    items = records(60)
+    assert list(_iter_json_array(io.BytesIO(json_library(items)))) == items
+
+
+def test_json_array_multibyte_split(monkeypatch):
+    monkeypatch.setattr(library, "CHUNK_SIZE", 3)
+    items = [{'name': "Tée ☕ 計時"}] * 5
+    assert list(_iter_json_array(io.BytesIO(json_library(items)))) == items
+
+
+def test_json_array_bad_record_fails_at_once(monkeypatch):
+    monkeypatch.setattr(library, "CHUNK_SIZE", 1024)
+    good = json_library(records(3000))
+    broken = good.replace(b'"Timer 10"', b'"Timer 10" oops', 1)
+    f = io.BytesIO(broken)
+    with pytest.raises(ValueError, match=r"preset 10 is not valid JSON \(byte (\d+)\)") as error:
+        list(_iter_json_array(f))
+    # It stopped where the record is, not after buffering the rest of the file
+    assert f.tell() < 8192
+    byte = int(error.value.args[0].split("byte ")[1].split(")")[0])
+    assert broken[byte:byte + 4] == b"oops"
+
+
+def test_json_array_truncated_file():
+    with pytest.raises(ValueError, match="ends before its closing"):
+        list(_iter_json_array(io.BytesIO(json_library(records(3))[:-10])))
+
+
+def test_json_array_missing():
+    with pytest.raises(ValueError, match="no preset list"):
+        list(_iter_json_array(io.BytesIO(b'{"format": "x"}')))
+
+
+def test_json_lines():
+    items = records(5)
+    data = b"\n".join(json.dumps(item).encode() for item in items) + b"\n\n"
+    assert list(_iter_json_lines(io.BytesIO(data))) == items
+
+
+def test_xml_round_trip(tmp_path):
+    from presets import Preset
+    presets = [Preset(f"Timer {i}", i, 2, 3, colors=("red", "white", "#00ff00"), background=None)
+               for i in range(20)]
+    rows = [(i, preset.name, preset.to_json()) for i, preset in enumerate(presets)]
+    path = str(tmp_path / "library.xml")
+    for _ in library.export_xml(path, rows, len(rows)):
+        pass
+    with open(path, "rb") as f:
+        loaded = [Preset.from_record(record) for record in _iter_xml(f)]
+    assert [(p.name, p.h, p.m, p.s, tuple(p.colors), p.rects()) for p in loaded] == \
+           [(p.name, p.h, p.m, p.s, tuple(p.colors), p.rects()) for p in presets]
+
+
+def test_json_export_reads_back(tmp_path):
+    from presets import Preset
+    presets = [Preset(f"Timer {i}", i, 2, 3) for i in range(1200)]
+    rows = [(i, preset.name, preset.to_json()) for i, preset in enumerate(presets)]
+    path = str(tmp_path / "library.json")
+    for _ in library.export_json(path, rows, len(rows)):
+        pass
+    reader = library.PresetReader(path)
+    names = [preset.name for preset in reader]
+    reader.close()
+    assert names == [preset.name for preset in presets]
+
+
+def test_reader_coerces_numeric_strings(tmp_path):
+    path = tmp_path / "library.json"
+    path.write_bytes(json_library([{'name': "Tea", 'h': "0", 'm': "5", 's': 30.0}]))
+    reader = library.PresetReader(str(path))
+    presets = list(reader)
+    reader.close()
+    assert (presets[0].h, presets[0].m, presets[0].s) == (0, 5, 30)
+    assert presets[0].total_seconds() == 330
+
+
+@pytest.mark.parametrize("bad", [{'name': "Tea", 'm': "five"}, {'name': "Tea", 's': -1},
+                                 {'name': "Tea", 'h': [1]}, {'name': "Tea", 'h': True},
+                                 {'name': 5, 'm': 5}, {'m': 5}, ["Tea", 5]])
+def test_reader_rejects_wrong_types_with_index(tmp_path, bad):
+    path = tmp_path / "library.json"
+    path.write_bytes(json_library([{'name': "Fine", 'm': 1}, bad]))
+    reader = library.PresetReader(str(path))
+    with pytest.raises(ValueError, match=r"^preset 1: "):
+        list(reader)
+    reader.close()
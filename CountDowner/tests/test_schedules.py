@@ -0,0 +1,162 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from schedules import DailyRule, EveryRule, OnceRule, Schedule, ScheduleIndex, local_timestamp, parse_rule
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset to change the local time zone")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def utc(text):
+    return datetime.fromisoformat(text + "+00:00").timestamp()
+
+
+class Clock:
+    def __init__(self, wall):
+        self.wall = wall
+        self.mono = 1000.0
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+
+def make_index(clock, **kwargs):
+    fired, expired, armed = [], [], []
+    index = ScheduleIndex(armed.append, lambda schedule, now: fired.append((schedule.id, now)),
+                          lambda schedule: expired.append(schedule.id),
+                          clock=clock.time, monotonic=clock.monotonic, **kwargs)
+    return index, fired, expired, armed
+
+
+def test_parse_rules():
+    assert isinstance(parse_rule("daily 08:00"), DailyRule)
+    assert parse_rule("weekdays 08:15").days == frozenset(range(5))
+    assert parse_rule("mon,wed,fri 14:30").days == frozenset({0, 2, 4})
+    assert parse_rule("every 45m", created=100).seconds == 2700
+    assert isinstance(parse_rule("at 2026-10-20 14:00"), OnceRule)
+    for bad in ("daily 25:00", "someday 08:00", "every 0s", "at tomorrow noon", "whenever"):
+        with pytest.raises(ValueError):
+            parse_rule(bad)
+
+
+def test_every_rule_counts_from_anchor():
+    rule = EveryRule(60, anchor=1000)
+    assert rule.next_after(1000) == 1060
+    assert rule.next_after(1059.9) == 1060
+    assert rule.next_after(5000) == 5020
+
+
+def test_daily_rule_keeps_local_time_across_dst(new_york):
+    rule = parse_rule("daily 08:00")
+    before = rule.next_after(utc("2026-03-07T14:00:00"))     # Saturday 09:00 EST
+    after = rule.next_after(before)
+    assert before == utc("2026-03-08T12:00:00")              # Sunday 08:00 EDT
+    assert after == utc("2026-03-09T12:00:00")
+
+
+def test_time_in_spring_forward_gap_fires_at_the_change(new_york):
+    # 02:00 EST becomes 03:00 EDT at 07:00 UTC; 02:30 doesn't exist that night
+    rule = parse_rule("daily 02:30")
+    assert rule.next_after(utc("2026-03-08T05:00:00")) == utc("2026-03-08T07:00:00")
+    assert rule.next_after(utc("2026-03-08T07:00:00")) == utc("2026-03-09T06:30:00")
+    assert local_timestamp(datetime(2026, 3, 8, 2, 30)) == utc("2026-03-08T07:00:00")
+
+
+def test_time_in_fall_back_hour_fires_once_at_first_occurrence(new_york):
+    rule = parse_rule("daily 01:30")
+    first = rule.next_after(utc("2026-11-01T04:00:00"))
+    assert first == utc("2026-11-01T05:30:00")               # 01:30 EDT
+    assert rule.next_after(first) == utc("2026-11-02T06:30:00")
+
+
+def test_index_fires_due_schedules_in_one_pass():
+    clock = Clock(10_000.0)
+    index, fired, expired, armed = make_index(clock)
+    index.add_many(Schedule(i, f"T{i}", "every 1m", created=10_000.0) for i in range(100))
+    assert armed[-1] == 60_000
+    clock.advance(60)
+    assert len(index.run_due()) == 100
+    assert len(fired) == 100 and index.wakeups == 1
+    assert armed[-1] == 60_000
+
+
+def test_once_schedule_expires_after_firing():
+    clock = Clock(10_000.0)
+    index, fired, expired, armed = make_index(clock)
+    index.add(Schedule(1, "Tea", "every 1m", created=clock.wall))
+    once = Schedule(2, "Bell", "at 2026-01-01 00:00", created=clock.wall)
+    once.rule = OnceRule(10_030.0)
+    index.add(once)
+    clock.advance(30)
+    index.run_due()
+    assert fired == [(2, 10_030.0)]
+    assert expired == [2]
+    assert [schedule.id for schedule in index] == [1]
+    assert index.named("Bell") == []
+
+
+def test_once_schedule_that_already_rang_is_not_indexed():
+    clock = Clock(10_000.0)
+    index, fired, expired, armed = make_index(clock)
+    once = Schedule(2, "Bell", "at 2026-01-01 00:00", created=9_000.0, last_fired=9_990.0)
+    once.rule = OnceRule(9_990.0)
+    index.add(once)
+    assert expired == [2] and len(index) == 0 and armed == []
+
+
+def test_missed_fires_ring_once_and_stale_ones_are_skipped():
+    clock = Clock(10_000.0)
+    index, fired, expired, armed = make_index(clock, late_grace=300)
+    index.add(Schedule(1, "Tea", "every 1m", created=clock.wall))
+    clock.advance(60 * 3 + 1)           # Three fires missed while the loop was stuck
+    index.run_due()
+    assert len(fired) == 1 and index.skipped == 0
+    clock.advance(3600)
+    index.run_due()
+    assert len(fired) == 1 and index.skipped == 1
+
+
+def test_clock_set_back_does_not_ring_twice():
+    clock = Clock(10_000.0)
+    index, fired, expired, armed = make_index(clock)
+    index.add(Schedule(1, "Tea", "every 1m", created=clock.wall))
+    clock.advance(60)
+    index.run_due()
+    clock.wall -= 30                    # Someone sets the clock back
+    clock.mono += 30
+    index.run_due()
+    assert index.jumps == 1
+    assert len(fired) == 1
+
+
+def test_main_window_drops_expired_one_off_schedules(qapp, app_data):
+    import countdowner
+    from presets import Preset
+    window = countdowner.MainWindow()
+    window.load_presets()
+    window.save_timer(Preset("Bell", 0, 0, 5))
+    window.store.add_schedule("Bell", "at 2020-01-01 08:00", None, created=1.0)
+    window.load_schedules()
+    assert window.store.load_schedules() == []
+    with pytest.raises(ValueError, match="already passed"):
+        window.add_schedule("Bell", "at 2020-01-01 08:00")
+    window.add_schedule("Bell", "every 1h")
+    assert len(window.schedules.named("Bell")) == 1
+    window.store.close()
@@ -0,0 +1,35 @@
+import pytest
+
+from presets import Preset
+
+
+def text_pixels(widget):
+    """How many pixels of a grab are the red text and how many are black text."""
+    image = widget.grab().toImage()
+    red = black = 0
+    for x in range(image.width()):
+        for y in range(image.height()):
+            color = image.pixelColor(x, y)
+            if color.red() > 180 and color.green() < 80 and color.blue() < 80:
+                red += 1
+            elif max(color.red(), color.green(), color.blue()) < 60:
+                black += 1
+    return red, black
+
+
+@pytest.mark.parametrize("reused", [False, True])
+def test_editor_shows_saved_colour(qapp, app_data, reused):
+    import countdowner
+    preset = Preset("Tea", 8, 8, 8, fonts=[("DejaVu Sans", 30.0, 700, False)] * 3,
+                    colors=["#ff0000"] * 3)
+    editor = countdowner.editor_windows.acquire(None, "Tea", preset)
+    if reused:
+        editor.close()
+        editor = countdowner.editor_windows.acquire(None, "Tea", preset)
+    editor.show()
+    qapp.processEvents()
+
+    red, black = text_pixels(editor.hour_input)
+    assert red > 20
+    assert red > black
+    editor.close()
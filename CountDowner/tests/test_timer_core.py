@@ -0,0 +1,256 @@
+from timer_core import Countdown, TickScheduler, TimerEngine, parse_duration
+
+
+class Clock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(slack=0.05):
+    clock = Clock()
+    armed = []
+    return TickScheduler(armed.append, clock=clock, slack=slack), clock, armed
+
+
+# Countdown
+
+def test_countdown_shows_total_until_first_boundary():
+    clock = Clock()
+    countdown = Countdown(90, clock)
+    assert countdown.remaining_seconds() == 90
+    assert countdown.hms() == (0, 1, 30)
+    clock.now += 0.5
+    assert countdown.remaining_seconds() == 90
+    assert countdown.next_boundary() == 101.0
+
+
+def test_countdown_reaches_zero_exactly_at_deadline():
+    clock = Clock()
+    countdown = Countdown(3, clock)
+    assert not countdown.is_done(102.999)
+    assert countdown.remaining_seconds(102.9995) == 0    # within the boundary epsilon
+    assert countdown.is_done(103.0)
+    assert countdown.remaining(200.0) == 0.0
+
+
+def test_zero_length_countdown_is_done_straight_away():
+    countdown = Countdown(0, Clock())
+    assert countdown.is_done()
+    assert countdown.hms() == (0, 0, 0)
+
+
+def test_hms_over_an_hour():
+    assert Countdown(3725, Clock()).hms() == (1, 2, 5)
+
+
+def test_ms_until_next_boundary_and_drift():
+    clock = Clock()
+    countdown = Countdown(10, clock)
+    clock.now += 0.25
+    assert countdown.ms_until_next_boundary() == 750
+    countdown.mark_wakeup(101.01)
+    assert abs(countdown.drift()['last'] - 0.01) < 1e-9
+    assert countdown.drift()['wakeups'] == 1
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("1h30m") == 5400
+    assert parse_duration("5:00") == 300
+    assert parse_duration("1:30:00") == 5400
+
+
+# TickScheduler
+
+def test_scheduler_batches_countdowns_due_together():
+    scheduler, clock, armed = make_scheduler()
+    seen = []
+    for offset in (0.0, 0.01, 0.03):
+        countdown = Countdown(5 - offset, clock)
+        scheduler.register(countdown, lambda now, c=countdown: seen.append(c) or True)
+    assert armed[-1] == 970
+
+    clock.now += 0.97
+    assert scheduler.run_due() == 3
+    assert scheduler.last_batch_size == 3
+    assert len(seen) == 3
+    # All three go back in the heap for their next boundary
+    assert len(scheduler) == 3
+    assert armed[-1] == 1000
+
+
+def test_scheduler_arms_for_the_earliest_due():
+    scheduler, clock, armed = make_scheduler()
+    scheduler.register(Countdown(5.5, clock), lambda now: True)
+    assert armed[-1] == 500
+    scheduler.register(Countdown(5.25, clock), lambda now: True)
+    assert armed[-1] == 250
+
+
+def test_scheduler_skips_unregistered_countdowns():
+    scheduler, clock, armed = make_scheduler()
+    calls = []
+    gone = Countdown(5, clock)
+    kept = Countdown(5.5, clock)
+    scheduler.register(gone, lambda now: calls.append('gone') or True)
+    scheduler.register(kept, lambda now: calls.append('kept') or True)
+    scheduler.unregister(gone)
+    assert gone not in scheduler
+
+    assert armed[-1] == 500
+    clock.now += 0.5
+    scheduler.run_due()
+    assert calls == ['kept']
+    # The stale entry was dropped on the way; only the kept countdown is left in the heap
+    assert all(key == id(kept) for due, seq, key in scheduler._heap)
+
+
+def test_scheduler_drops_countdown_when_callback_is_done():
+    scheduler, clock, armed = make_scheduler()
+    scheduler.register(Countdown(1, clock), lambda now: False)
+    clock.now += 1.0
+    scheduler.run_due()
+    assert len(scheduler) == 0
+    assert armed[-1] is None
+
+
+def test_deadline_only_countdown_wakes_once():
+    scheduler, clock, armed = make_scheduler()
+    calls = []
+    scheduler.register(Countdown(30, clock), lambda now: calls.append(now) or False, every_second=False)
+    assert armed[-1] == 30000
+    clock.now += 30
+    scheduler.run_due()
+    assert calls == [130.0]
+
+
+def test_raising_callback_does_not_stop_other_timers(capsys):
+    scheduler, clock, armed = make_scheduler()
+    ticks = []
+
+    def broken(now):
+        raise RuntimeError("window went away")
+
+    scheduler.register(Countdown(5, clock), broken, label="broken")
+    scheduler.register(Countdown(5, clock), lambda now: ticks.append(now) or True)
+
+    clock.now += 1.0
+    assert scheduler.run_due() == 2
+    assert ticks == [101.0]
+    assert "broken" in capsys.readouterr().err
+    # Re-armed for the next boundary, with both still registered
+    assert armed[-1] == 1000
+    assert len(scheduler) == 2
+
+    clock.now += 1.0
+    scheduler.run_due()
+    assert ticks == [101.0, 102.0]
+
+
+def test_raising_callback_at_deadline_is_dropped():
+    scheduler, clock, armed = make_scheduler()
+
+    def broken(now):
+        raise RuntimeError("alarm failed")
+
+    scheduler.register(Countdown(1, clock), broken)
+    clock.now += 1.0
+    scheduler.run_due()
+    assert len(scheduler) == 0
+    assert armed[-1] is None
+
+
+def test_interrupted_pass_keeps_the_rest_of_the_batch():
+    scheduler, clock, armed = make_scheduler()
+    ticks = []
+
+    def interrupted(now):
+        raise KeyboardInterrupt
+
+    scheduler.register(Countdown(5, clock), interrupted)
+    scheduler.register(Countdown(5, clock), lambda now: ticks.append(now) or True)
+    clock.now += 1.0
+    try:
+        scheduler.run_due()
+    except KeyboardInterrupt:
+        pass
+    assert ticks == []
+    assert armed[-1] == 0
+    scheduler.run_due()
+    assert ticks == [101.0]
+
+
+# TimerEngine
+
+def make_engine():
+    scheduler, clock, armed = make_scheduler()
+    events = []
+    engine = TimerEngine(scheduler, alarm=lambda path: events.append(('alarm', path)),
+                         on_finish=lambda timer, now: events.append(('finish', timer.name, now)),
+                         on_idle=lambda: events.append(('idle',)))
+    return engine, scheduler, clock, events
+
+
+def run_until(scheduler, clock, until):
+    while scheduler._heap and scheduler._heap[0][0] <= until:
+        clock.now = max(clock.now, scheduler._heap[0][0])
+        scheduler.run_due()
+
+
+def test_engine_finishes_on_deadline_and_rings_alarm():
+    engine, scheduler, clock, events = make_engine()
+    ticks = []
+    timer = engine.start("tea", 3, alarm="bell.wav", on_tick=ticks.append)
+    run_until(scheduler, clock, 200)
+    assert ticks == [101.0, 102.0]
+    assert timer.state == timer.FINISHED
+    assert events == [('finish', "tea", 103.0), ('alarm', "bell.wav"), ('idle',)]
+    assert len(engine) == 0 and engine.finished == 1
+
+
+def test_engine_stop_goes_idle_without_alarm():
+    engine, scheduler, clock, events = make_engine()
+    timer = engine.start("eggs", 60, alarm="bell.wav")
+    engine.stop(timer)
+    assert timer.state == timer.STOPPED
+    assert events == [('idle',)]
+    assert len(scheduler) == 0
+    engine.stop(timer)
+    assert events == [('idle',)]
+
+
+def test_engine_zero_length_timer_finishes_on_first_pass():
+    engine, scheduler, clock, events = make_engine()
+    engine.start("now", 0)
+    scheduler.run_due()
+    assert events == [('finish', "now", 100.0), ('idle',)]
+
+
+def test_engine_is_idle_only_after_last_timer():
+    engine, scheduler, clock, events = make_engine()
+    engine.start("short", 1)
+    engine.start("long", 2)
+    run_until(scheduler, clock, 101)
+    assert ('idle',) not in events
+    run_until(scheduler, clock, 102)
+    assert events[-1] == ('idle',)
+
+
+def test_engine_rings_and_goes_idle_when_finish_hooks_raise(capsys):
+    scheduler, clock, armed = make_scheduler()
+    events = []
+
+    def broken(*args):
+        raise BrokenPipeError("stdout went away")
+
+    engine = TimerEngine(scheduler, alarm=lambda path: events.append(('alarm', path)),
+                         on_finish=broken, on_idle=lambda: events.append(('idle',)))
+    timer = engine.start("tea", 1, alarm="bell.wav", on_finish=broken)
+    run_until(scheduler, clock, 200)
+    assert timer.state == timer.FINISHED
+    assert events == [('alarm', "bell.wav"), ('idle',)]
+    assert capsys.readouterr().err.count("tea raised while finishing") == 2
+    assert len(scheduler) == 0
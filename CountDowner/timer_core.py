@@ -0,0 +1,361 @@
+import heapq
+import itertools
+import math
+import re
+import sys
+import time
+import traceback
+from collections import deque
+
+
+# Small tolerance so a wake-up that lands a hair before a second boundary
+# (timer granularity, float rounding) still shows the new value.
+BOUNDARY_EPSILON = 0.001
+
+
+class Countdown:
+    """A countdown measured against an absolute monotonic deadline.
+
+    Nothing here counts ticks: the remaining time is always worked out from
+    the clock, so a late or missed wake-up never makes the countdown late.
+    """
+    __slots__ = ('clock', 'total_seconds', 'deadline', 'next_due', 'last_drift', 'max_drift', 'wakeups')
+
+    def __init__(self, total_seconds, clock=time.monotonic):
+        self.clock = clock
+        self.total_seconds = total_seconds
+        self.deadline = clock() + total_seconds
+
+        # Drift bookkeeping: how late each wake-up was versus the boundary it was aimed at
+        self.next_due = None
+        self.last_drift = 0.0
+        self.max_drift = 0.0
+        self.wakeups = 0
+
+    def remaining(self, now=None):
+        """Seconds left (float), never negative."""
+        if now is None:
+            now = self.clock()
+        return max(0.0, self.deadline - now)
+
+    def remaining_seconds(self, now=None):
+        """Whole seconds to display: counts down from total_seconds and reaches 0 at the deadline."""
+        return max(0, math.ceil(self.remaining(now) - BOUNDARY_EPSILON))
+
+    def hms(self, now=None):
+        remaining = self.remaining_seconds(now)
+        return remaining // 3600, (remaining % 3600) // 60, remaining % 60
+
+    def is_done(self, now=None):
+        return self.remaining_seconds(now) == 0
+
+    def next_boundary(self, now=None):
+        """Absolute clock time at which the displayed value next changes."""
+        return self.deadline - (self.remaining_seconds(now) - 1)
+
+    def ms_until_next_boundary(self, now=None):
+        """Delay in ms to re-arm a single-shot timer so it fires on the next second boundary."""
+        if now is None:
+            now = self.clock()
+        self.next_due = self.next_boundary(now)
+        return max(0, math.ceil((self.next_due - now) * 1000))
+
+    def mark_wakeup(self, now=None):
+        """Record how far a wake-up landed from the boundary it was scheduled for."""
+        if now is None:
+            now = self.clock()
+        self.wakeups += 1
+        if self.next_due is not None:
+            self.last_drift = now - self.next_due
+            self.max_drift = max(self.max_drift, abs(self.last_drift))
+        return self.last_drift
+
+    def drift(self):
+        """Drift stats in seconds: last and worst wake-up error, plus wake-up count."""
+        return {'last': self.last_drift, 'max': self.max_drift, 'wakeups': self.wakeups}
+
+
+class _Registration:
+    __slots__ = ('countdown', 'callback', 'seq', 'every_second', 'label')
+
+    def __init__(self, countdown, callback, seq, every_second=True, label=None):
+        self.countdown = countdown
+        self.callback = callback
+        self.seq = seq
+        self.every_second = every_second
+        self.label = label
+
+    def next_due(self, now):
+        if self.every_second:
+            # A countdown that is already at zero is due straight away, not a second later
+            return min(self.countdown.next_boundary(now), self.countdown.deadline)
+        return self.countdown.deadline
+
+
+class TickScheduler:
+    """One priority queue of countdowns, woken together in batched passes.
+
+    The scheduler never owns a timer itself: `arm(delay_ms)` is called whenever
+    the earliest due time changes (with None when there is nothing left to run),
+    and whoever owns the real timer calls `run_due()` when it fires. Every
+    countdown due within `slack` seconds of a wake-up is served in the same
+    pass, so the number of wake-ups per second is bounded by the slack rather
+    than by the number of registered countdowns.
+
+    `observer` is off (None) unless something wants to watch the ticks, like
+    telemetry.TickLatency: it hears `timer_started(key, label)`,
+    `tick(key, lateness)` just before each callback and `timer_stopped(key)`.
+    """
+    def __init__(self, arm, clock=time.monotonic, slack=0.05, stats_window=5.0):
+        self.arm = arm
+        self.clock = clock
+        self.slack = slack
+        self.stats_window = stats_window
+        self._heap = []             # (due, seq, key) - stale items are skipped lazily
+        self._registrations = {}    # key -> _Registration
+        self._seq = itertools.count()
+        self._armed_for = None
+        self._wakeups = deque()     # clock times of recent wake-ups
+        self.total_wakeups = 0
+        self.last_batch_size = 0
+        self.observer = None
+
+    def __len__(self):
+        return len(self._registrations)
+
+    def __contains__(self, countdown):
+        return id(countdown) in self._registrations
+
+    def register(self, countdown, callback, every_second=True, label=None):
+        """Wake `callback(now)` on each of the countdown's second boundaries.
+
+        The callback returns True to keep ticking and False once it is done.
+        With every_second=False it is only woken at the deadline, which is all
+        a countdown that nobody is watching needs. `label` names it for the observer.
+        """
+        now = self.clock()
+        registration = _Registration(countdown, callback, next(self._seq), every_second, label)
+        self._registrations[id(countdown)] = registration
+        if self.observer is not None:
+            self.observer.timer_started(id(countdown), label)
+        self._push(registration, registration.next_due(now))
+        self._rearm(now)
+
+    def unregister(self, countdown):
+        # The heap entry goes stale and is dropped when it reaches the top
+        if self._registrations.pop(id(countdown), None) is not None and self.observer is not None:
+            self.observer.timer_stopped(id(countdown))
+
+    def run_due(self):
+        """Serve every countdown due now (or within the slack) in one pass."""
+        now = self.clock()
+        self._record_wakeup(now)
+        horizon = now + self.slack
+
+        batch = []
+        while self._heap and self._heap[0][0] <= horizon:
+            due, seq, key = heapq.heappop(self._heap)
+            registration = self._registrations.get(key)
+            if registration is not None and registration.seq == seq:
+                batch.append((due, registration))
+
+        observer = self.observer
+        served = 0
+        try:
+            for due, registration in batch:
+                served += 1
+                countdown = registration.countdown
+                countdown.mark_wakeup(now)
+                key = id(countdown)
+                if observer is not None:
+                    # Read the clock again: the callbacks ahead of this one in the batch held it up too
+                    observer.tick(key, self.clock() - due)
+                # Countdowns served a little early are shown as of their own boundary
+                at = max(now, due)
+                try:
+                    keep = registration.callback(at)
+                except Exception:
+                    # One broken window must not stop every other timer: log it, and keep
+                    # waking the countdown until it is done so it can still finish
+                    print(f"Timer {registration.label or key} raised in its tick:", file=sys.stderr)
+                    traceback.print_exc()
+                    keep = not countdown.is_done(at)
+                if not keep:
+                    if self._registrations.get(key) is registration:
+                        del self._registrations[key]
+                        if observer is not None:
+                            observer.timer_stopped(key)
+                elif self._registrations.get(key) is registration:
+                    self._push(registration, registration.next_due(at))
+        finally:
+            # Anything that escaped (KeyboardInterrupt...) leaves the rest of the batch queued, not lost
+            for due, registration in batch[served:]:
+                if self._registrations.get(id(registration.countdown)) is registration:
+                    self._push(registration, due)
+            self.last_batch_size = served
+            self._armed_for = None
+            self._rearm(now)
+        return len(batch)
+
+    def wakeups_per_second(self, now=None):
+        """Average wake-ups per second over the last `stats_window` seconds."""
+        if now is None:
+            now = self.clock()
+        self._trim_wakeups(now)
+        return len(self._wakeups) / self.stats_window
+
+    def stats(self):
+        return {
+            'timers': len(self._registrations),
+            'wakeups_per_second': self.wakeups_per_second(),
+            'last_batch_size': self.last_batch_size,
+        }
+
+    def _push(self, registration, due):
+        registration.seq = next(self._seq)
+        registration.countdown.next_due = due
+        heapq.heappush(self._heap, (due, registration.seq, id(registration.countdown)))
+
+    def _rearm(self, now):
+        # Drop stale entries so the timer is armed for a countdown that still exists
+        while self._heap:
+            due, seq, key = self._heap[0]
+            registration = self._registrations.get(key)
+            if registration is not None and registration.seq == seq:
+                break
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            self._armed_for = None
+            self.arm(None)
+            return
+
+        due = self._heap[0][0]
+        if self._armed_for is not None and self._armed_for <= due:
+            return
+        self._armed_for = due
+        self.arm(max(0, math.ceil((due - now) * 1000)))
+
+    def _record_wakeup(self, now):
+        self.total_wakeups += 1
+        self._wakeups.append(now)
+        self._trim_wakeups(now)
+
+    def _trim_wakeups(self, now):
+        cutoff = now - self.stats_window
+        while self._wakeups and self._wakeups[0] < cutoff:
+            self._wakeups.popleft()
+
+
+class Timer:
+    """One named countdown run by a TimerEngine, plus what to do when it ends.
+
+    `on_tick(now)` and `on_finish(now)` are optional hooks for whatever is
+    showing the timer (a window, a line of terminal output...).
+    """
+    __slots__ = ('engine', 'name', 'countdown', 'alarm', 'state', 'on_tick', 'on_finish')
+
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    STOPPED = 'stopped'
+
+    def __init__(self, engine, name, countdown, alarm=None, on_tick=None, on_finish=None):
+        self.engine = engine
+        self.name = name
+        self.countdown = countdown
+        self.alarm = alarm
+        self.state = Timer.RUNNING
+        self.on_tick = on_tick
+        self.on_finish = on_finish
+
+    def tick(self, now):
+        # Called by the scheduler; returns False once the countdown is finished
+        if self.countdown.remaining_seconds(now) > 0:
+            if self.on_tick is not None:
+                self.on_tick(now)
+            return True
+        self.engine._finished(self, now)
+        return False
+
+
+class TimerEngine:
+    """Runs named countdowns on a TickScheduler and rings their alarms.
+
+    This is everything a timer does apart from drawing it, so the same engine
+    sits behind the Qt windows and the headless runner (runner.py).
+    `alarm(path)` plays an alarm sound; leave it out for silent timers.
+    `on_finish(timer, now)` hears about every timer that finishes, and
+    `on_idle()` is called whenever the last running timer finishes or stops.
+    """
+    def __init__(self, scheduler, alarm=None, on_finish=None, on_idle=None):
+        self.scheduler = scheduler
+        self.alarm = alarm
+        self.on_finish = on_finish
+        self.on_idle = on_idle
+        self._running = {}          # id(timer) -> timer
+        self.started = 0
+        self.finished = 0
+
+    def __len__(self):
+        return len(self._running)
+
+    def running(self):
+        return list(self._running.values())
+
+    def start(self, name, total_seconds, alarm=None, on_tick=None, on_finish=None):
+        """Starts a countdown; it is only woken every second if something wants on_tick."""
+        timer = Timer(self, name, Countdown(total_seconds, self.scheduler.clock), alarm, on_tick, on_finish)
+        self._running[id(timer)] = timer
+        self.started += 1
+        self.scheduler.register(timer.countdown, timer.tick, every_second=on_tick is not None, label=name)
+        return timer
+
+    def stop(self, timer):
+        if self._running.pop(id(timer), None) is None:
+            return
+        self.scheduler.unregister(timer.countdown)
+        timer.state = Timer.STOPPED
+        self._went_idle()
+
+    def _finished(self, timer, now):
+        self._running.pop(id(timer), None)
+        timer.state = Timer.FINISHED
+        self.finished += 1
+        # Each hook on its own: a view that fails to show the end must not
+        # cost the alarm, or leave whoever waits for on_idle waiting forever
+        if timer.on_finish is not None:
+            self._call(timer, timer.on_finish, now)
+        if self.on_finish is not None:
+            self._call(timer, self.on_finish, timer, now)
+        if timer.alarm is not None and self.alarm is not None:
+            self._call(timer, self.alarm, timer.alarm)
+        self._went_idle()
+
+    def _call(self, timer, hook, *args):
+        try:
+            hook(*args)
+        except Exception:
+            print(f"Timer {timer.name} raised while finishing:", file=sys.stderr)
+            traceback.print_exc()
+
+    def _went_idle(self):
+        if not self._running and self.on_idle is not None:
+            self.on_idle()
+
+
+_UNITS = {'h': 3600, 'm': 60, 's': 1}
+
+def parse_duration(text):
+    """Seconds in '90', '1h30m', '5m', '1:30:00' or '5:00'."""
+    text = text.strip().lower()
+    if text.isdigit():
+        return int(text)
+    if ':' in text:
+        seconds = 0
+        for part in text.split(':'):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    parts = re.findall(r'(\d+)([hms])', text)
+    if not parts or ''.join(number + unit for number, unit in parts) != text:
+        raise ValueError(f"can't read duration {text!r}")
+    return sum(int(number) * _UNITS[unit] for number, unit in parts)
@@ -0,0 +1,120 @@
+import heapq
+
+from PyQt6.QtWidgets import QApplication, QMenu, QStyle, QSystemTrayIcon
+
+
+class TrayManager:
+    """One system tray icon shared by every running ActiveTimerWindow.
+
+    The menu is rebuilt only when it is about to be shown, and the tooltip
+    follows the soonest-expiring timer only, so the shell gets at most one
+    tooltip update per second no matter how many timers are running.
+    """
+    max_menu_entries = 25
+
+    def __init__(self):
+        self.tray_icon = None
+        self.menu = None
+        self._windows = {}          # id(window) -> window
+        self._deadlines = []        # (deadline, id(window)) - stale items are skipped lazily
+        self._notified = set()
+        self._tooltip = None
+
+    def __len__(self):
+        return len(self._windows)
+
+    def add(self, window):
+        self._ensure_icon()
+        key = id(window)
+        self._windows[key] = window
+        heapq.heappush(self._deadlines, (window.countdown.deadline, key))
+        self._notified.discard(key)
+        self.tray_icon.show()
+
+    def remove(self, window):
+        key = id(window)
+        self._windows.pop(key, None)
+        self._notified.discard(key)
+        if not self._windows and self.tray_icon is not None:
+            self.tray_icon.hide()
+            self._tooltip = None
+
+    def windows(self):
+        """Every running timer window, in no particular order."""
+        return list(self._windows.values())
+
+    def soonest(self):
+        """The running window whose countdown ends first, or None."""
+        while self._deadlines:
+            deadline, key = self._deadlines[0]
+            window = self._windows.get(key)
+            if window is not None and key not in self._notified and window.countdown.deadline == deadline:
+                return window
+            heapq.heappop(self._deadlines)
+        return None
+
+    def timer_ticked(self, window, now=None):
+        # Only the soonest-expiring timer drives the tooltip
+        if window is self.soonest():
+            self._refresh_tooltip(window, now)
+
+    def timer_finished(self, window, now=None):
+        """Shows the "Timer Done" notification once per countdown."""
+        key = id(window)
+        if key in self._notified or key not in self._windows:
+            return
+        self._notified.add(key)
+        self.tray_icon.showMessage("Timer Done", f"{window.name} has finished!", QSystemTrayIcon.MessageIcon.Information)
+        self._refresh_tooltip(self.soonest(), now)
+
+    def _refresh_tooltip(self, window, now=None):
+        if window is None:
+            text = "CountDowner: all timers done"
+        else:
+            h, m, s = window.countdown.hms(now)
+            text = f"{window.name}: {h:02}:{m:02}:{s:02}"
+            others = len(self._windows) - len(self._notified) - 1
+            if others > 0:
+                text += f" (+{others} more)"
+        if text != self._tooltip:
+            self._tooltip = text
+            self.tray_icon.setToolTip(text)
+
+    def _ensure_icon(self):
+        if self.tray_icon is not None:
+            return
+        app = QApplication.instance()
+        self.tray_icon = QSystemTrayIcon(app)
+        # Note: You'll need a real .png or .ico file for this to show up clearly
+        self.tray_icon.setIcon(app.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon))
+        self.menu = QMenu()
+        self.menu.aboutToShow.connect(self._rebuild_menu)
+        self.tray_icon.setContextMenu(self.menu)
+
+    def _rebuild_menu(self):
+        self.menu.clear()
+        windows = heapq.nsmallest(self.max_menu_entries, self._windows.values(), key=lambda w: w.countdown.deadline)
+        for window in windows:
+            if id(window) in self._notified:
+                status = "Done"
+            else:
+                h, m, s = window.countdown.hms()
+                status = f"{h:02}:{m:02}:{s:02}"
+            submenu = self.menu.addMenu(f"{window.name} - {status}")
+            submenu.addAction("Show Timer", window.show)
+            submenu.addAction("Stop Timer", window.stop)
+
+        hidden = len(self._windows) - len(windows)
+        if hidden > 0:
+            self.menu.addSeparator()
+            self.menu.addAction(f"... and {hidden} more").setEnabled(False)
+
+
+_tray_manager = None
+
+def tray_manager():
+    """Returns the application-wide TrayManager."""
+    global _tray_manager
+    if _tray_manager is None:
+        _tray_manager = TrayManager()
+    return _tray_manager